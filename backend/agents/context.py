@@ -0,0 +1,83 @@
+"""
+Bounded interviewer context — recent turns verbatim, older turns summarized.
+
+The interviewer sees: its system prompt, the opening question (always pinned),
+a rolling summary of older turns, and the most recent turns verbatim. When new
+turns fall out of the window they are folded into `session.context_summary`
+with one small LLM call; nothing is recomputed while the window still fits.
+"""
+
+import logging
+
+import config
+from metrics import log_event, span
+from models import Message, SessionState
+from prompts.summary_prompt import build_summary_prompt
+from .llm_client import chat_completion
+
+# Messages at the start of the conversation that are always sent verbatim
+# (the interviewer's introduction and problem statement).
+PINNED_MESSAGES = 1
+
+SUMMARY_MAX_WORDS = 200
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English text)."""
+    return len(text) // 4 + 1
+
+
+def _window_start(conversation: list[Message]) -> int:
+    """Index of the first message that still fits the verbatim window."""
+    start = max(PINNED_MESSAGES, len(conversation) - config.INTERVIEWER_CONTEXT_MESSAGES)
+    tokens = sum(estimate_tokens(m.content) for m in conversation[start:])
+
+    # Always keep the latest message, even if it alone exceeds the budget
+    while tokens > config.INTERVIEWER_CONTEXT_TOKENS and start < len(conversation) - 1:
+        tokens -= estimate_tokens(conversation[start].content)
+        start += 1
+    return start
+
+
+def _format_turns(messages: list[Message]) -> str:
+    lines = []
+    for msg in messages:
+        label = "Interviewer" if msg.role == "assistant" else "Candidate"
+        lines.append(f"[{label}]: {msg.content}")
+    return "\n".join(lines)
+
+
+async def compact_context(session: SessionState) -> None:
+    """Fold messages that have fallen out of the window into the session summary."""
+    start = _window_start(session.conversation)
+    folded_until = PINNED_MESSAGES + session.summarized_messages
+    if start <= folded_until:
+        return
+
+    prompt = build_summary_prompt(
+        previous_summary=session.context_summary,
+        new_turns=_format_turns(session.conversation[folded_until:start]),
+        max_words=SUMMARY_MAX_WORDS,
+    )
+    try:
+        with span("context_summary_llm", folded_messages=start - folded_until):
+            response = await chat_completion(
+                site="summary",
+                model=config.LLM_MODEL,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0.2,
+            )
+    except Exception as e:
+        # Not fatal: this turn just sends a shorter verbatim window
+        log_event("context_summary_failed", level=logging.WARNING, error=str(e))
+        return
+
+    session.context_summary = response.choices[0].message.content.strip()
+    session.summarized_messages = start - PINNED_MESSAGES
+
+
+def context_messages(session: SessionState) -> list[Message]:
+    """Messages to send verbatim: the pinned opening plus the recent window."""
+    conversation = session.conversation
+    start = max(_window_start(conversation), PINNED_MESSAGES + session.summarized_messages)
+    return conversation[:PINNED_MESSAGES] + conversation[start:]
@@ -1,15 +1,25 @@
 """Evaluator LLM agent — scores interview performance."""
 
-import json
-from openai import OpenAI
+from metrics import span
+from models import Message, CodeRun, PhaseScore, Scorecard, ScoreCategory
+from prompts.evaluator_prompt import build_evaluator_prompt, build_phase_evaluator_prompt
+from sandbox.complexity import describe
+from .structured import StructuredOutputError, output_model, structured_completion
 
-import config
-from models import Message, CodeRun, Scorecard, ScoreCategory
-from prompts.evaluator_prompt import build_evaluator_prompt
+# Rubric dimensions, in scorecard order
+DIMENSIONS = [
+    "problem_understanding",
+    "logical_correctness",
+    "code_quality",
+    "optimization",
+    "communication",
+]
 
+# PhaseScore fields filled in by the server, not the phase evaluator
+PHASE_SLICE_FIELDS = ("phase", "start", "end", "code_start", "code_end")
 
-def _get_client() -> OpenAI:
-    return OpenAI(api_key=config.LLM_API_KEY, base_url=config.LLM_BASE_URL)
+# Verdict of the placeholder scorecard returned when the evaluator's answer can't be used
+EVALUATION_FAILED = "Evaluation Failed"
 
 
 def _format_transcript(conversation: list[Message]) -> str:
@@ -28,13 +38,28 @@ def _format_code_results(submissions: list[CodeRun]) -> str:
 
     parts = []
     for i, run in enumerate(submissions, 1):
+        outcome = (
+            "Not run against the tests (complexity analysis only)"
+            if run.profile_only
+            else f"Tests passed: {run.passed}/{run.total} | Timed out: {run.timed_out}"
+        )
         parts.append(
             f"── Submission {i} ──\n"
             f"Code:\n{run.code}\n"
             f"Stdout: {run.stdout}\n"
             f"Stderr: {run.stderr}\n"
-            f"Tests passed: {run.passed}/{run.total} | Timed out: {run.timed_out}"
+            f"{outcome}"
         )
+        if run.cpu_time_ms is not None:
+            parts[-1] += (
+                f"\nResources: CPU {run.cpu_time_ms} ms | Peak memory {run.peak_memory_kb} KB"
+                f" | Exit: {run.exit_reason}"
+            )
+        if run.profile is not None:
+            parts[-1] += f"\nMeasured scaling: {describe(run.profile.model_dump())}"
+        for test in run.tests:
+            if test.status != "passed":
+                parts[-1] += f"\n  Test {test.index + 1} {test.status}: {test.error}"
     return "\n\n".join(parts)
 
 
@@ -45,10 +70,13 @@ async def evaluate_interview(
     round_type: str,
     conversation: list[Message],
     code_submissions: list[CodeRun],
+    fallback: bool = True,
 ) -> Scorecard:
-    """Run the evaluator LLM and return a structured Scorecard."""
-    client = _get_client()
-
+    """
+    Run the evaluator LLM and return a structured Scorecard. If no valid one
+    comes back, returns a placeholder scorecard (verdict EVALUATION_FAILED),
+    or raises StructuredOutputError when `fallback` is False.
+    """
     transcript = _format_transcript(conversation)
     code_results = _format_code_results(code_submissions)
 
@@ -61,32 +89,23 @@ async def evaluate_interview(
         code_results=code_results,
     )
 
-    response = client.chat.completions.create(
-        model=config.LLM_MODEL,
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": "Evaluate this interview now."},
-        ],
-        temperature=0.3,
-    )
-
-    raw = response.choices[0].message.content.strip()
-
-    # Try to extract JSON using regex in case there's preamble/postamble text
-    import re
-    json_match = re.search(r'\{.*\}', raw, re.DOTALL)
-    if json_match:
-        raw_json = json_match.group(0)
-    else:
-        raw_json = raw
-
     try:
-        data = json.loads(raw_json)
-    except json.JSONDecodeError as e:
-        # Fallback scorecard if LLM failed to return valid JSON
-        print(f"Failed to parse Evaluator JSON: {raw}")
+        with span("evaluator_llm"):
+            return await structured_completion(
+                Scorecard,
+                site="evaluator",
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": "Evaluate this interview now."},
+                ],
+                temperature=0.3,
+            )
+    except StructuredOutputError as e:
+        if not fallback:
+            raise
+        # Fallback scorecard if the LLM failed to return a valid one, even after repair
         return Scorecard(
-            overall="Evaluation Failed",
+            overall=EVALUATION_FAILED,
             scores={
                 "error": ScoreCategory(
                     score=1, max=5, feedback="The AI evaluator failed to return a valid JSON response."
@@ -97,19 +116,84 @@ async def evaluate_interview(
             summary=f"Parsing error: {str(e)}",
         )
 
-    # Parse scores
-    scores = {}
-    for key, val in data.get("scores", {}).items():
-        scores[key] = ScoreCategory(
-            score=val["score"],
-            max=val.get("max", 5),
-            feedback=val["feedback"],
+
+# ── Incremental (per-phase) evaluation ──────────────────────
+
+async def score_phase(
+    company: str,
+    role: str,
+    level: str,
+    round_type: str,
+    phase: str,
+    conversation: list[Message],
+    code_submissions: list[CodeRun],
+) -> tuple[dict[str, ScoreCategory], str]:
+    """
+    Score one phase's slice of the interview.
+    Returns (scores for the dimensions it evidenced, one-line notes).
+    """
+    system_prompt = build_phase_evaluator_prompt(
+        company=company,
+        role=role,
+        level=level,
+        round_type=round_type,
+        phase=phase,
+        transcript=_format_transcript(conversation),
+        code_results=_format_code_results(code_submissions),
+    )
+
+    with span("phase_evaluator_llm", phase=phase):
+        result = await structured_completion(
+            output_model(PhaseScore, exclude=PHASE_SLICE_FIELDS),
+            site="evaluator",
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": "Score this phase now."},
+            ],
+            temperature=0.3,
         )
 
+    scores = {key: val for key, val in result.scores.items() if key in DIMENSIONS}
+    return scores, result.notes
+
+
+def _verdict(total: int) -> str:
+    """Overall verdict from the 25-point total (same bands as the evaluator prompt)."""
+    if total >= 20:
+        return "Strong Hire"
+    if total >= 15:
+        return "Hire"
+    if total >= 10:
+        return "Lean Hire"
+    return "No Hire"
+
+
+def merge_phase_scores(partials: list[PhaseScore]) -> Scorecard:
+    """
+    Deterministically combine per-phase scores into the final Scorecard.
+
+    Each dimension is the rounded mean of the phases that scored it, with the
+    latest phase's feedback; dimensions no phase evidenced score 1 ("Missing").
+    """
+    scores = {}
+    for dim in DIMENSIONS:
+        evidence = [p.scores[dim] for p in partials if dim in p.scores]
+        if evidence:
+            mean = sum(s.score for s in evidence) / len(evidence)
+            scores[dim] = ScoreCategory(
+                score=min(5, max(1, int(mean + 0.5))),
+                max=5,
+                feedback=evidence[-1].feedback,
+            )
+        else:
+            scores[dim] = ScoreCategory(score=1, max=5, feedback="Not demonstrated during the interview.")
+
+    total = sum(s.score for s in scores.values())
+    notes = [f"{p.phase.replace('_', ' ').capitalize()}: {p.notes}" for p in partials if p.notes]
     return Scorecard(
-        overall=data.get("overall", "No Hire"),
+        overall=_verdict(total),
         scores=scores,
-        total=data.get("total", sum(s.score for s in scores.values())),
-        max_total=data.get("max_total", 25),
-        summary=data.get("summary", ""),
+        total=total,
+        max_total=5 * len(DIMENSIONS),
+        summary=" ".join(notes) or "No phase of the interview produced enough evidence to assess.",
     )
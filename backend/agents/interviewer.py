@@ -1,28 +1,37 @@
 """Interviewer LLM agent — simulates a technical interviewer."""
 
 import json
-from openai import OpenAI
+import time
+from typing import AsyncIterator
 
 import config
+from metrics import observe_stage, span
 from models import Message
 from prompts.interviewer_prompt import build_interviewer_prompt, INTERVIEWER_FIRST_MESSAGE
-
-
-def _get_client() -> OpenAI:
-    return OpenAI(api_key=config.LLM_API_KEY, base_url=config.LLM_BASE_URL)
+from .llm_client import chat_completion, stream_chat_completion
 
 
 def _build_openai_messages(
     system_prompt: str,
     conversation: list[Message],
     user_message: str | None = None,
+    context_summary: str = "",
 ) -> list[dict]:
     """Convert session conversation into OpenAI message format."""
     messages = [{"role": "system", "content": system_prompt}]
 
-    for msg in conversation:
-        if msg.role in ("user", "assistant"):
-            messages.append({"role": msg.role, "content": msg.content})
+    turns = [
+        {"role": msg.role, "content": msg.content}
+        for msg in conversation
+        if msg.role in ("user", "assistant")
+    ]
+    if context_summary:
+        # Keep the opening question first, then the summary of omitted older turns
+        turns.insert(min(1, len(turns)), {
+            "role": "system",
+            "content": f"Summary of earlier interview turns (omitted for brevity):\n{context_summary}",
+        })
+    messages.extend(turns)
 
     if user_message is not None:
         messages.append({"role": "user", "content": user_message})
@@ -30,7 +39,7 @@ def _build_openai_messages(
     return messages
 
 
-async def get_interviewer_reply(
+def _prepare_messages(
     company: str,
     role: str,
     level: str,
@@ -43,13 +52,10 @@ async def get_interviewer_reply(
     ai_policy: str,
     conversation: list[Message],
     user_message: str | None = None,
-) -> dict:
-    """
-    Send conversation + new user message to the interviewer LLM.
-    Returns {"reply": str, "phase": str}.
-    """
-    client = _get_client()
-
+    context_summary: str = "",
+    measured_scaling: str = "",
+) -> list[dict]:
+    """Build the full message list for an interviewer turn."""
     system_prompt = build_interviewer_prompt(
         company=company,
         role=role,
@@ -61,21 +67,19 @@ async def get_interviewer_reply(
         question_topic_hint=question_topic_hint,
         coding_expectations=coding_expectations,
         ai_policy=ai_policy,
+        measured_scaling=measured_scaling,
     )
 
     # If this is the very first message (no conversation yet), use the start prompt
     if not conversation and user_message is None:
         user_message = INTERVIEWER_FIRST_MESSAGE
 
-    messages = _build_openai_messages(system_prompt, conversation, user_message)
+    return _build_openai_messages(system_prompt, conversation, user_message, context_summary)
 
-    response = client.chat.completions.create(
-        model=config.LLM_MODEL,
-        messages=messages,
-        temperature=0.7,
-    )
 
-    raw = response.choices[0].message.content.strip()
+def _parse_reply(raw: str) -> dict:
+    """Parse the interviewer's JSON envelope into {"reply", "phase"}."""
+    raw = raw.strip()
 
     # Strip markdown code fences if present
     if raw.startswith("```"):
@@ -92,3 +96,222 @@ async def get_interviewer_reply(
     except json.JSONDecodeError:
         # Fallback: return the raw text as the reply
         return {"reply": raw, "phase": "question"}
+
+
+async def get_interviewer_reply(
+    company: str,
+    role: str,
+    level: str,
+    round_type: str,
+    persona: str,
+    duration_minutes: int,
+    difficulty: str,
+    question_topic_hint: str,
+    coding_expectations: str,
+    ai_policy: str,
+    conversation: list[Message],
+    user_message: str | None = None,
+    context_summary: str = "",
+    measured_scaling: str = "",
+) -> dict:
+    """
+    Send conversation + new user message to the interviewer LLM.
+    `context_summary` stands in for older turns omitted from `conversation`;
+    `measured_scaling` summarises the profiler's result for the latest code.
+    Returns {"reply": str, "phase": str}.
+    """
+    messages = _prepare_messages(
+        company, role, level, round_type, persona, duration_minutes, difficulty,
+        question_topic_hint, coding_expectations, ai_policy, conversation, user_message,
+        context_summary, measured_scaling,
+    )
+
+    with span("interviewer_llm"):
+        response = await chat_completion(
+            site="interviewer",
+            model=config.LLM_MODEL,
+            messages=messages,
+            temperature=0.7,
+        )
+
+    return _parse_reply(response.choices[0].message.content)
+
+
+# ── Streaming ───────────────────────────────────────────────
+
+class ReplyStreamParser:
+    """
+    Incrementally pull the "reply" and "phase" fields out of the interviewer's
+    JSON envelope while it is still being generated.
+
+    Reply text is surfaced character-by-character as soon as it is decoded, and
+    the phase as soon as its string closes (whichever order the model uses).
+    If the output turns out not to be a JSON object, the raw text is passed
+    through unchanged.
+    """
+
+    def __init__(self) -> None:
+        self.raw = ""
+        self.phase: str | None = None
+        self._mode: str | None = None   # None (undecided) | "json" | "text"
+        self._pos = 0                   # next unread index into self.raw
+        self._depth = 0
+        self._expect = "key"            # at depth 1: "key" or "value"
+        self._key: str | None = None    # last key seen at depth 1
+        self._in_string = False
+        self._target: str | None = None # "key" | "reply" | "phase" | None
+        self._buf: list[str] = []
+        self._escape = ""               # pending escape sequence, e.g. "\\u00"
+        self._high_surrogate = ""
+
+    def feed(self, chunk: str) -> list[dict]:
+        """Consume a chunk and return the events it produced."""
+        self.raw += chunk
+        events: list[dict] = []
+        text: list[str] = []
+
+        if self._mode is None:
+            self._detect_mode()
+        if self._mode == "text":
+            text.append(self.raw[self._pos:])
+            self._pos = len(self.raw)
+        elif self._mode == "json":
+            self._scan(text, events)
+
+        if any(text):
+            events.insert(0, {"type": "token", "text": "".join(text)})
+        return events
+
+    def finish(self) -> dict:
+        """Return the authoritative {"reply", "phase"} for the whole output."""
+        return _parse_reply(self.raw)
+
+    def _detect_mode(self) -> None:
+        """Skip leading whitespace / code fences and decide JSON vs. plain text."""
+        while self._pos < len(self.raw):
+            ch = self.raw[self._pos]
+            if ch.isspace():
+                self._pos += 1
+            elif ch == "`":
+                newline = self.raw.find("\n", self._pos)
+                if newline == -1:
+                    return  # fence line not complete yet
+                self._pos = newline + 1
+            else:
+                self._mode = "json" if ch == "{" else "text"
+                return
+
+    def _scan(self, text: list[str], events: list[dict]) -> None:
+        while self._pos < len(self.raw):
+            ch = self.raw[self._pos]
+            self._pos += 1
+
+            if self._in_string:
+                self._scan_string_char(ch, text, events)
+                continue
+
+            if ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+            elif ch == '"':
+                self._in_string = True
+                self._buf = []
+                if self._depth != 1:
+                    self._target = None
+                elif self._expect == "key":
+                    self._target = "key"
+                elif self._key in ("reply", "phase"):
+                    self._target = self._key
+                else:
+                    self._target = None
+            elif self._depth == 1 and ch == ":":
+                self._expect = "value"
+            elif self._depth == 1 and ch == ",":
+                self._expect = "key"
+
+    def _scan_string_char(self, ch: str, text: list[str], events: list[dict]) -> None:
+        if self._escape:
+            self._escape += ch
+            if self._escape.startswith("\\u") and len(self._escape) < 6:
+                return
+            decoded = json.loads(f'"{self._escape}"')
+            self._escape = ""
+            # Join UTF-16 surrogate pairs that arrive as two \\u escapes
+            if "\ud800" <= decoded <= "\udbff":
+                self._high_surrogate = decoded
+                return
+            if self._high_surrogate:
+                decoded = (self._high_surrogate + decoded).encode(
+                    "utf-16", "surrogatepass"
+                ).decode("utf-16")
+                self._high_surrogate = ""
+            self._emit_char(decoded, text)
+        elif ch == "\\":
+            self._escape = ch
+        elif ch == '"':
+            self._in_string = False
+            value = "".join(self._buf)
+            if self._target == "key":
+                self._key = value
+            elif self._target == "phase":
+                self.phase = value
+                events.append({"type": "phase", "phase": value})
+        else:
+            self._emit_char(ch, text)
+
+    def _emit_char(self, ch: str, text: list[str]) -> None:
+        self._buf.append(ch)
+        if self._target == "reply":
+            text.append(ch)
+
+
+async def stream_interviewer_reply(
+    company: str,
+    role: str,
+    level: str,
+    round_type: str,
+    persona: str,
+    duration_minutes: int,
+    difficulty: str,
+    question_topic_hint: str,
+    coding_expectations: str,
+    ai_policy: str,
+    conversation: list[Message],
+    user_message: str | None = None,
+    context_summary: str = "",
+    measured_scaling: str = "",
+) -> AsyncIterator[dict]:
+    """
+    Streaming variant of `get_interviewer_reply`.
+
+    Yields {"type": "token", "text"} as reply text is generated, a single
+    {"type": "phase", "phase"} once the phase is known, and finally
+    {"type": "done", "reply", "phase"} with the fully parsed result.
+    """
+    messages = _prepare_messages(
+        company, role, level, round_type, persona, duration_minutes, difficulty,
+        question_topic_hint, coding_expectations, ai_policy, conversation, user_message,
+        context_summary, measured_scaling,
+    )
+
+    parser = ReplyStreamParser()
+    start = time.perf_counter()
+    first_token = True
+    with span("interviewer_stream"):
+        async for chunk in stream_chat_completion(
+            site="interviewer",
+            model=config.LLM_MODEL,
+            messages=messages,
+            temperature=0.7,
+        ):
+            if first_token:
+                observe_stage("interviewer_first_token", time.perf_counter() - start)
+                first_token = False
+            for event in parser.feed(chunk):
+                yield event
+
+    result = parser.finish()
+    if parser.phase is None:
+        yield {"type": "phase", "phase": result["phase"]}
+    yield {"type": "done", **result}
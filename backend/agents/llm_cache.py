@@ -0,0 +1,192 @@
+"""
+LLM response cache — answers repeated deterministic chat completions locally.
+
+Entries are keyed on a hash of the whole request (model, messages,
+temperature, stop, tools, ...), so only byte-identical requests hit. Caching
+is opt-in per call site: callers name their site and only sites listed in
+`LLM_CACHE_SITES` (by default the temperature-0 research agent and the
+evaluator, whose retries re-send identical transcripts) are cached.
+
+Responses live in an in-memory LRU in front of an optional SQLite table, so
+they survive restarts; both tiers expire entries after `LLM_CACHE_TTL`. The
+table is swept of expired rows every `PRUNE_INTERVAL` seconds and capped at
+`LLM_CACHE_MAX_ROWS`. Lookups and stores are async: memory hits are answered
+inline, while SQLite reads and writes run in a worker thread, off the event loop.
+"""
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import config
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key        TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    data       TEXT NOT NULL
+)
+"""
+_INDEX = "CREATE INDEX IF NOT EXISTS responses_created_at ON responses (created_at)"
+
+# Seconds between sweeps of expired (and over-cap) rows from the SQLite table
+PRUNE_INTERVAL = 300.0
+
+
+def llm_cache_key(request: dict) -> str:
+    """Hash of every request parameter that can change the response."""
+    material = json.dumps(request, sort_keys=True, default=str)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def cache_enabled_for(site: str | None) -> bool:
+    return bool(site) and config.LLM_CACHE_ENABLED and site in config.LLM_CACHE_SITES
+
+
+class LLMResponseCache:
+    """LRU + TTL cache of serialized responses, optionally backed by SQLite."""
+
+    def __init__(self, max_entries: int, ttl: float, path: str = "", max_rows: int = 0) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self.max_rows = max_rows
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        # Memory tier and counters; the SQLite connection has its own lock so a slow
+        # disk read in a worker thread never holds up memory hits on the event loop
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._pruned_at = 0.0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(_SCHEMA)
+            self._conn.execute(_INDEX)
+            self._prune()
+
+    async def get(self, key: str) -> str | None:
+        """Return the cached response JSON, or None on a miss / expired entry."""
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] >= cutoff:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self._entries.pop(key, None)
+
+        row = await asyncio.to_thread(self._read, key, cutoff) if self._conn is not None else None
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self._remember(key, row[0], row[1])
+            self.hits += 1
+            self.disk_hits += 1
+            return row[1]
+
+    async def put(self, key: str, data: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, data)
+            self.stores += 1
+        if self._conn is not None:
+            await asyncio.to_thread(self._write, key, now, data)
+
+    # ── SQLite tier (called in worker threads) ──
+
+    def _read(self, key: str, cutoff: float) -> tuple[float, str] | None:
+        with self._db_lock:
+            if self._conn is None:
+                return None
+            return self._conn.execute(
+                "SELECT created_at, data FROM responses WHERE key = ? AND created_at >= ?", (key, cutoff)
+            ).fetchone()
+
+    def _write(self, key: str, created: float, data: str) -> None:
+        with self._db_lock:
+            if self._conn is None:
+                return
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, created_at, data) VALUES (?, ?, ?)", (key, created, data)
+            )
+            if time.monotonic() - self._pruned_at >= PRUNE_INTERVAL:
+                self._prune()
+
+    def _prune(self) -> None:
+        """Drop expired rows, then the oldest ones beyond `max_rows` (caller holds the db lock)."""
+        self._conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl,))
+        if self.max_rows > 0:
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_rows,),
+            )
+        self._pruned_at = time.monotonic()
+
+    def _remember(self, key: str, created: float, data: str) -> None:
+        self._entries[key] = (created, data)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = len(self._entries)
+            hits, disk_hits, misses, stores = self.hits, self.disk_hits, self.misses, self.stores
+        stored = None
+        with self._db_lock:
+            if self._conn is not None:
+                stored = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        lookups = hits + misses
+        return {
+            "entries": entries,
+            "stored_entries": stored,
+            "hits": hits,
+            "disk_hits": disk_hits,
+            "misses": misses,
+            "stores": stores,
+            "hit_rate": round(hits / lookups, 3) if lookups else None,
+        }
+
+    def close(self) -> None:
+        with self._db_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_cache: LLMResponseCache | None = None
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Return the process-wide LLM response cache."""
+    global _cache
+    if _cache is None:
+        _cache = LLMResponseCache(
+            max_entries=config.LLM_CACHE_MAX_ENTRIES,
+            ttl=config.LLM_CACHE_TTL,
+            path=config.LLM_CACHE_PATH,
+            max_rows=config.LLM_CACHE_MAX_ROWS,
+        )
+    return _cache
+
+
+def close_llm_cache() -> None:
+    """Close the SQLite backing (called on application shutdown)."""
+    global _cache
+    if _cache is not None:
+        _cache.close()
+    _cache = None
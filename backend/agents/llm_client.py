@@ -0,0 +1,152 @@
+"""Shared async LLM client — one pooled, rate-limited client for every agent."""
+
+import asyncio
+
+import httpx
+from openai import AsyncOpenAI
+from openai.types.chat import ChatCompletion
+
+import config
+from metrics import LLM_CACHE_LOOKUPS
+from .llm_cache import cache_enabled_for, close_llm_cache, get_llm_cache, llm_cache_key
+from .llm_policy import call_with_policy, policy_for
+
+# Process-wide singletons, bound to the event loop that first used them.
+_client: AsyncOpenAI | None = None
+_semaphore: asyncio.Semaphore | None = None
+_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _bind_to_running_loop() -> None:
+    """(Re)create the client and semaphore if the running event loop changed."""
+    global _client, _semaphore, _loop
+
+    loop = asyncio.get_running_loop()
+    if _client is not None and _loop is loop:
+        return
+
+    # httpx connection pools cannot be shared across event loops, so a new
+    # loop (e.g. a second `asyncio.run` in a script) gets a fresh client.
+    http_client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=config.LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=config.LLM_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=config.LLM_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(config.LLM_TIMEOUT, connect=10.0),
+    )
+    _client = AsyncOpenAI(
+        api_key=config.LLM_API_KEY,
+        base_url=config.LLM_BASE_URL,
+        http_client=http_client,
+        timeout=config.LLM_TIMEOUT,
+        # Retries, deadlines and fallbacks are handled by the call policy
+        max_retries=0,
+    )
+    _semaphore = asyncio.Semaphore(config.LLM_MAX_CONCURRENCY)
+    _loop = loop
+
+
+def get_client() -> AsyncOpenAI:
+    """Return the shared AsyncOpenAI client (must be called inside a running loop)."""
+    _bind_to_running_loop()
+    return _client
+
+
+async def chat_completion(site: str | None = None, **kwargs):
+    """
+    Create a chat completion through the shared client.
+
+    At most `LLM_MAX_CONCURRENCY` requests are in flight at once; extra callers
+    wait on the semaphore instead of opening more upstream connections.
+
+    `site` names the calling site. It picks the call policy (deadlines,
+    retries, hedging, fallback models; see `llm_policy`) and, if that site is
+    cached (see `llm_cache`), an identical earlier request is answered from
+    the cache.
+    """
+    key = None
+    if cache_enabled_for(site):
+        key = llm_cache_key(kwargs)
+        cached = await get_llm_cache().get(key)
+        LLM_CACHE_LOOKUPS.inc(site=site, result="hit" if cached else "miss")
+        if cached:
+            return ChatCompletion.model_validate_json(cached)
+
+    _bind_to_running_loop()
+    answered_by = None
+
+    async def attempt(model: str) -> ChatCompletion:
+        nonlocal answered_by
+        async with _semaphore:
+            response = await _client.chat.completions.create(**{**kwargs, "model": model})
+        answered_by = model
+        return response
+
+    requested = kwargs.get("model", config.LLM_MODEL)
+    response = await call_with_policy(site, requested, attempt)
+
+    # Truncated or filtered answers are worth retrying, so only complete ones are kept,
+    # and a fallback model's answer isn't stored as the requested model's
+    if (
+        key
+        and answered_by == requested
+        and response.choices
+        and response.choices[0].finish_reason in ("stop", "tool_calls")
+    ):
+        await get_llm_cache().put(key, response.model_dump_json())
+    return response
+
+
+async def stream_chat_completion(site: str | None = None, **kwargs):
+    """
+    Stream a chat completion, yielding content deltas as they arrive.
+
+    Opening the stream and receiving its first content runs under the site's
+    call policy (retries and fallback models, but no hedging). Once text has
+    been yielded the call can't be retried, so after that each chunk must
+    arrive within the policy's per-attempt deadline.
+
+    The concurrency slot is held until the stream is exhausted or closed.
+    """
+    _bind_to_running_loop()
+    deadline = policy_for(site).deadline
+
+    async def attempt(model: str):
+        stream = await _client.chat.completions.create(stream=True, **{**kwargs, "model": model})
+        chunks = stream.__aiter__()
+        try:
+            return stream, chunks, await _next_content(chunks)
+        except BaseException:
+            await stream.close()
+            raise
+
+    async with _semaphore:
+        stream, chunks, text = await call_with_policy(
+            site, kwargs.get("model", config.LLM_MODEL), attempt, hedge=False
+        )
+        try:
+            while text is not None:
+                yield text
+                text = await asyncio.wait_for(_next_content(chunks), timeout=deadline)
+        finally:
+            await stream.close()
+
+
+async def _next_content(chunks) -> str | None:
+    """The next non-empty content delta from a chunk iterator, or None at its end."""
+    async for chunk in chunks:
+        if chunk.choices and chunk.choices[0].delta.content:
+            return chunk.choices[0].delta.content
+    return None
+
+
+async def close_client() -> None:
+    """Close pooled connections and the response cache (called on application shutdown)."""
+    global _client, _semaphore, _loop
+    close_llm_cache()
+    if _client is not None:
+        await _client.close()
+    _client = None
+    _semaphore = None
+    _loop = None
@@ -0,0 +1,271 @@
+"""
+LLM call policy — bounds how long any one upstream chat completion can take.
+
+Every call site (planner, react, interviewer, evaluator, summary, and the
+structured-output repair step) runs its requests under a `CallPolicy`:
+
+    deadline     seconds allowed per attempt
+    retries      extra attempts per model after the first, spaced by
+                 full-jitter exponential backoff starting at `backoff` seconds
+    hedge        send a duplicate request when an attempt outlives the site's
+                 observed p95 latency (`hedge_after` until there are enough
+                 samples) and keep whichever answers first
+    budget       wall-clock cap for the whole call, across retries and models
+
+Models are tried in order: the requested one, then `LLM_FALLBACK_MODELS`.
+A model that keeps failing trips its circuit breaker and is skipped until
+its cooldown passes, so a dead upstream costs one fast failure instead of a
+deadline per request. Only timeouts, connection errors, rate limits and 5xx
+responses are retried; anything else (a bad request) is raised at once.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from typing import Awaitable, Callable, NamedTuple, TypeVar
+
+import openai
+
+import config
+from metrics import LLM_ATTEMPTS, LLM_CALL_SECONDS, LLM_POLICY_EVENTS, log_event
+
+T = TypeVar("T")
+
+RETRYABLE = (
+    TimeoutError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+# Hedge delays come from this many recent successful attempts per site
+LATENCY_WINDOW = 200
+MIN_LATENCY_SAMPLES = 20
+MIN_HEDGE_DELAY = 0.25
+
+
+class CallPolicy(NamedTuple):
+    deadline: float = 30.0
+    retries: int = 1
+    backoff: float = 0.5
+    hedge: bool = False
+    hedge_after: float = 5.0
+    budget: float = 90.0
+
+
+DEFAULT_POLICY = CallPolicy()
+DEFAULT_POLICIES: dict[str, CallPolicy] = {
+    "planner": CallPolicy(deadline=30, retries=1, budget=75),
+    "react": CallPolicy(deadline=20, retries=2, budget=60),
+    # A candidate is waiting on every turn: hedge slow replies, keep the tail short
+    "interviewer": CallPolicy(deadline=20, retries=1, hedge=True, hedge_after=6, budget=45),
+    "evaluator": CallPolicy(deadline=45, retries=2, budget=120),
+    "summary": CallPolicy(deadline=15, retries=1, budget=30),
+    # Fixing an invalid JSON answer is a short prompt: fail fast rather than stack up latency
+    "repair": CallPolicy(deadline=20, retries=1, budget=40),
+}
+
+
+class LLMUnavailable(Exception):
+    """No model answered within the call policy."""
+
+
+def _parse_overrides(spec: str) -> dict[str, dict]:
+    """Parse "site:key=value,key=value;site:..." into {site: {field: value}}."""
+    overrides: dict[str, dict] = {}
+    for part in filter(None, (p.strip() for p in spec.split(";"))):
+        site, _, fields = part.partition(":")
+        values = overrides.setdefault(site.strip(), {})
+        for item in filter(None, (f.strip() for f in fields.split(","))):
+            key, _, raw = item.partition("=")
+            key = key.strip()
+            if key not in CallPolicy._fields:
+                raise ValueError(f"LLM_POLICY: unknown field {key!r} for site {site!r}")
+            kind = CallPolicy.__annotations__[key]
+            values[key] = raw.strip().lower() in ("1", "true", "yes") if kind is bool else kind(raw)
+    return overrides
+
+
+_overrides = _parse_overrides(config.LLM_POLICY)
+
+
+def policy_for(site: str | None) -> CallPolicy:
+    base = DEFAULT_POLICIES.get(site or "", DEFAULT_POLICY)
+    return base._replace(**_overrides.get(site or "", {}))
+
+
+# ── Circuit breakers & latency tracking ─────────────────────
+
+class CircuitBreaker:
+    """
+    Per-model breaker: opens after `threshold` consecutive failures. Once
+    `cooldown` has passed a single trial call is let through; its success
+    closes the circuit, its failure keeps it open for another cooldown.
+    """
+
+    def __init__(self, threshold: int, cooldown: float) -> None:
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: float | None = None
+
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            self.opened_at = time.monotonic()  # admit one trial, hold back the rest
+            return True
+        return False
+
+    def success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+
+    def failure(self) -> None:
+        self.failures += 1
+        if self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_latencies: dict[str, deque[float]] = {}
+
+
+def _breaker(model: str) -> CircuitBreaker:
+    breaker = _breakers.get(model)
+    if breaker is None:
+        breaker = _breakers[model] = CircuitBreaker(config.LLM_CIRCUIT_FAILURES, config.LLM_CIRCUIT_COOLDOWN)
+    return breaker
+
+
+def _hedge_delay(site: str, policy: CallPolicy) -> float:
+    """The site's recent p95 attempt latency, or `hedge_after` until enough samples exist."""
+    samples = _latencies.get(site)
+    if not samples or len(samples) < MIN_LATENCY_SAMPLES:
+        return policy.hedge_after
+    ordered = sorted(samples)
+    return max(MIN_HEDGE_DELAY, ordered[int(0.95 * (len(ordered) - 1))])
+
+
+def policy_stats() -> dict:
+    """Circuit state per model and hedge thresholds per site."""
+    return {
+        "circuits": {
+            model: {"open": b.is_open, "consecutive_failures": b.failures} for model, b in _breakers.items()
+        },
+        "hedge_delays": {
+            site: round(_hedge_delay(site, policy_for(site)), 3)
+            for site in DEFAULT_POLICIES
+            if policy_for(site).hedge
+        },
+    }
+
+
+# ── Execution ───────────────────────────────────────────────
+
+async def _hedged(site: str, policy: CallPolicy, attempt: Callable[[str], Awaitable[T]], model: str) -> T:
+    """One attempt, plus a duplicate if it is slower than the hedge delay; first success wins."""
+    started = time.monotonic()
+    first = asyncio.ensure_future(attempt(model))
+    tasks = {first}
+    try:
+        if policy.hedge:
+            done, _ = await asyncio.wait(tasks, timeout=_hedge_delay(site, policy))
+            if not done:
+                LLM_POLICY_EVENTS.inc(site=site, path="hedge")
+                tasks.add(asyncio.ensure_future(attempt(model)))
+
+        error: BaseException | None = None
+        while tasks:
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is not first:
+                        LLM_POLICY_EVENTS.inc(site=site, path="hedge_won")
+                    _latencies.setdefault(site, deque(maxlen=LATENCY_WINDOW)).append(time.monotonic() - started)
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def call_with_policy(
+    site: str | None,
+    model: str,
+    attempt: Callable[[str], Awaitable[T]],
+    hedge: bool = True,
+) -> T:
+    """
+    Run `attempt(model)` under the site's policy and return the first success.
+
+    `attempt` is called with each model to try (and may run twice at once
+    when hedging; pass `hedge=False` for calls that can't be duplicated).
+    Raises the first non-retryable error, or LLMUnavailable once every model
+    and retry is used up or the budget runs out.
+    """
+    label = site or "other"
+    policy = policy_for(site)
+    if not hedge:
+        policy = policy._replace(hedge=False)
+    start = time.monotonic()
+    budget_end = start + policy.budget
+    last_error: BaseException | None = None
+
+    try:
+        chain = [model] + [m for m in config.LLM_FALLBACK_MODELS if m != model]
+        for index, candidate in enumerate(chain):
+            breaker = _breaker(candidate)
+            if not breaker.allow():
+                LLM_POLICY_EVENTS.inc(site=label, path="circuit_open")
+                continue
+            if index > 0:
+                LLM_POLICY_EVENTS.inc(site=label, path="fallback")
+
+            for retry in range(policy.retries + 1):
+                remaining = budget_end - time.monotonic()
+                if retry > 0:
+                    pause = random.uniform(0, policy.backoff * 2 ** (retry - 1))
+                    if pause >= remaining:
+                        break
+                    LLM_POLICY_EVENTS.inc(site=label, path="retry")
+                    await asyncio.sleep(pause)
+                    remaining -= pause
+                if remaining <= 0:
+                    break
+                try:
+                    result = await asyncio.wait_for(
+                        _hedged(label, policy, attempt, candidate),
+                        timeout=min(policy.deadline, remaining),
+                    )
+                except RETRYABLE as e:
+                    timed_out = isinstance(e, (TimeoutError, openai.APITimeoutError))
+                    LLM_ATTEMPTS.inc(site=label, model=candidate, outcome="timeout" if timed_out else "error")
+                    breaker.failure()
+                    last_error = e
+                    if breaker.is_open:
+                        break  # don't spend the rest of the budget on a model that just tripped
+                    continue
+                except Exception:
+                    LLM_ATTEMPTS.inc(site=label, model=candidate, outcome="fatal")
+                    raise
+                LLM_ATTEMPTS.inc(site=label, model=candidate, outcome="ok")
+                breaker.success()
+                return result
+
+        LLM_POLICY_EVENTS.inc(site=label, path="exhausted")
+        log_event("llm_call_exhausted", level=logging.WARNING, site=label, error=repr(last_error))
+        raise LLMUnavailable(
+            f"no model answered the {label} call within its policy"
+            + (f" (last error: {type(last_error).__name__})" if last_error else " (all circuits open)")
+        ) from last_error
+    finally:
+        LLM_CALL_SECONDS.observe(time.monotonic() - start, site=label)
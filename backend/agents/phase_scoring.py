@@ -0,0 +1,186 @@
+"""
+Incremental evaluation — score each interview phase as soon as it ends.
+
+When the interview moves on from a scored phase, that phase's slice of the
+transcript (and any code run during it) is scored in a background task and
+stored on `session.partial_scores`. At the end, `finalize_scorecard` only has
+to score whatever no phase covered yet (normally just the final phase) and
+merge the partial results deterministically.
+"""
+
+import asyncio
+import logging
+
+import config
+from metrics import log_event, span
+from models import InterviewPhase, PhaseScore, Scorecard, SessionState
+from state import get_session, save_session, session_lock
+from store.base import SessionConflict
+from .evaluator import evaluate_interview, merge_phase_scores, score_phase
+
+SCORED_PHASES = {
+    InterviewPhase.CLARIFICATION,
+    InterviewPhase.COMPLEXITY,
+    InterviewPhase.EDGE_CASES,
+    InterviewPhase.CODING,
+}
+
+# In-flight scoring tasks per session (kept referenced until done)
+_pending: dict[str, set[asyncio.Task]] = {}
+
+
+def on_phase_change(session: SessionState, previous: InterviewPhase, end: int, code_end: int) -> None:
+    """
+    Schedule background scoring of the phase that just ended.
+
+    `end` / `code_end` are where the finished phase stops in the conversation
+    and code submissions; everything from the session's scoring cursors up to
+    there belongs to it. The opening "question" phase isn't scored on its own
+    and is folded into the phase after it.
+    """
+    if not config.INCREMENTAL_EVAL or session.phase == previous or previous not in SCORED_PHASES:
+        return
+    if end <= session.scoring_cursor and code_end <= session.code_scoring_cursor:
+        return
+
+    partial = PhaseScore(
+        phase=previous.value,
+        start=session.scoring_cursor,
+        end=end,
+        code_start=session.code_scoring_cursor,
+        code_end=code_end,
+    )
+    session.scoring_cursor = end
+    session.code_scoring_cursor = code_end
+
+    tasks = _pending.setdefault(session.session_id, set())
+    task = asyncio.create_task(_score_in_background(session, partial))
+    tasks.add(task)
+    task.add_done_callback(tasks.discard)
+
+
+async def _fill(session: SessionState, partial: PhaseScore) -> bool:
+    """Score one slice of the session into `partial`. Returns False on failure."""
+    try:
+        partial.scores, partial.notes = await score_phase(
+            company=session.config.company,
+            role=session.config.role.value,
+            level=session.config.level.value,
+            round_type=session.config.round_type.value,
+            phase=partial.phase,
+            conversation=session.conversation[partial.start:partial.end],
+            code_submissions=session.code_submissions[partial.code_start:partial.code_end],
+        )
+    except Exception as e:
+        # The slice stays uncovered, so finalize_scorecard rescores it
+        log_event("phase_scoring_failed", level=logging.WARNING, phase=partial.phase, error=str(e))
+        return False
+    return True
+
+
+def _record(session: SessionState, partial: PhaseScore) -> None:
+    session.partial_scores.append(partial)
+    session.partial_scores.sort(key=lambda p: p.start)
+    save_session(session)
+
+
+def _too_late(session: SessionState, partial: PhaseScore) -> bool:
+    """
+    Whether a background result arrived after evaluation took over its slice.
+
+    Once evaluation starts, `finalize_scorecard` rescores every slice without a
+    recorded score, including ones still being scored on another worker
+    (`wait_for_phase_scoring` only sees this worker's tasks), so a late result
+    would duplicate the tail's coverage of a finished session.
+    """
+    if session.phase in (InterviewPhase.EVALUATING, InterviewPhase.COMPLETED):
+        return True
+    return any(p.start < partial.end and partial.start < p.end for p in session.partial_scores)
+
+
+async def _score_in_background(session: SessionState, partial: PhaseScore) -> None:
+    """
+    Score a finished phase, then record it on the latest copy of the session.
+
+    Only the (append-only) slice is read from `session`; the result is saved
+    under the session lock, since the interview has moved on meanwhile.
+    """
+    if not await _fill(session, partial):
+        return
+    try:
+        async with session_lock(session.session_id):
+            current = get_session(session.session_id)
+            if current is None:
+                return
+            if _too_late(current, partial):
+                log_event(
+                    "phase_scoring_dropped", level=logging.INFO,
+                    phase=partial.phase, session_phase=current.phase.value,
+                )
+                return
+            _record(current, partial)
+    except SessionConflict as e:
+        # The slice stays uncovered, so finalize_scorecard rescores it
+        log_event("phase_scoring_failed", level=logging.WARNING, phase=partial.phase, error=str(e))
+
+
+async def wait_for_phase_scoring(session_id: str) -> None:
+    """
+    Give in-flight phase scoring up to PHASE_SCORING_WAIT seconds to finish.
+
+    Call before taking the session lock to evaluate: the tasks need the lock
+    to record their results. Late ones are cancelled, leaving their slice
+    uncovered for `finalize_scorecard` to rescore. Tasks are per process, so
+    with a shared store, scoring started on another worker isn't waited for;
+    its slice is rescored the same way and its result dropped when it lands.
+    """
+    tasks = _pending.pop(session_id, set())
+    if tasks:
+        _, late = await asyncio.wait(tasks, timeout=config.PHASE_SCORING_WAIT)
+        for task in late:
+            task.cancel()
+
+
+def _uncovered(session: SessionState) -> PhaseScore | None:
+    """Span every message / code run no recorded phase covers, or None if nothing is left."""
+    covered = {i for p in session.partial_scores for i in range(p.start, p.end)}
+    covered_code = {i for p in session.partial_scores for i in range(p.code_start, p.code_end)}
+    messages = [i for i, m in enumerate(session.conversation) if i not in covered and m.role == "user"]
+    code_runs = [i for i in range(len(session.code_submissions)) if i not in covered_code]
+    if not messages and not code_runs:
+        return None
+    first = min(messages + [len(session.conversation)])
+    return PhaseScore(
+        phase="",
+        start=max(0, first - 1),  # include the interviewer prompt the candidate answered
+        end=len(session.conversation),
+        code_start=min(code_runs + [len(session.code_submissions)]),
+        code_end=len(session.code_submissions),
+    )
+
+
+async def finalize_scorecard(session: SessionState, final_phase: InterviewPhase) -> Scorecard:
+    """
+    Build the final Scorecard from the per-phase scores.
+
+    Scores the remaining tail (labelled `final_phase`), then merges. Falls back
+    to the one-shot evaluator if no phase could be scored at all. Run under the
+    session lock, after `wait_for_phase_scoring`.
+    """
+    with span("evaluation_finalize", phases=len(session.partial_scores)):
+        tail = _uncovered(session)
+        if tail is not None:
+            tail.phase = final_phase.value
+            if await _fill(session, tail):
+                _record(session, tail)
+
+        if not session.partial_scores:
+            return await evaluate_interview(
+                company=session.config.company,
+                role=session.config.role.value,
+                level=session.config.level.value,
+                round_type=session.config.round_type.value,
+                conversation=session.conversation,
+                code_submissions=session.code_submissions,
+            )
+        return merge_phase_scores(session.partial_scores)
@@ -0,0 +1,157 @@
+"""
+Interview plan cache — skips the ReAct + planner LLM calls for popular configs.
+
+Plans are keyed on (company, role, level, round_type). Each key holds a small
+pool of distinct plans and a random one is served per hit, so candidates on
+the same config still see variety. Keys are evicted LRU, plans expire after a
+TTL, and the cache can optionally be persisted to a JSON file so it survives
+restarts.
+"""
+
+import json
+import logging
+import os
+import random
+import time
+from collections import OrderedDict
+
+import config
+from metrics import log_event
+from models import InterviewPlan
+
+CacheKey = tuple[str, str, str, str]
+
+
+def plan_cache_key(company: str, role: str, level: str, round_type: str) -> CacheKey:
+    return (company.strip().lower(), role, level, round_type)
+
+
+class PlanCache:
+    """LRU + TTL cache holding a pool of plans per interview config."""
+
+    def __init__(self, max_keys: int, pool_size: int, ttl: float, path: str = "") -> None:
+        self.max_keys = max_keys
+        self.pool_size = pool_size
+        self.ttl = ttl
+        self.path = path
+        self._entries: OrderedDict[CacheKey, list[tuple[float, dict]]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if path:
+            self._load()
+
+    def _live_pool(self, key: CacheKey) -> list[tuple[float, dict]]:
+        """Return the key's pool with expired plans dropped."""
+        pool = self._entries.get(key)
+        if pool is None:
+            return []
+        cutoff = time.time() - self.ttl
+        pool[:] = [(created, plan) for created, plan in pool if created >= cutoff]
+        if not pool:
+            del self._entries[key]
+        return pool
+
+    def get(self, key: CacheKey) -> InterviewPlan | None:
+        """Return a random cached plan for the key, or None on a miss."""
+        pool = self._live_pool(key)
+        if not pool:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return InterviewPlan(**random.choice(pool)[1])
+
+    def needs_more(self, key: CacheKey) -> bool:
+        """True if the key's pool has fewer plans than the target pool size."""
+        return len(self._live_pool(key)) < self.pool_size
+
+    def put(self, key: CacheKey, plan: InterviewPlan) -> None:
+        pool = self._live_pool(key)
+        pool.append((time.time(), plan.model_dump()))
+        del pool[:-self.pool_size]
+        self._entries[key] = pool
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_keys:
+            self._entries.popitem(last=False)
+        if self.path:
+            self._save()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "keys": len(self._entries),
+            "plans": sum(len(pool) for pool in self._entries.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else None,
+        }
+
+    # ── Disk backing ────────────────────────────────────────
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        for entry in data:
+            self._entries[tuple(entry["key"])] = [tuple(p) for p in entry["plans"]]
+        for key in list(self._entries):
+            self._live_pool(key)
+
+    def _save(self) -> None:
+        data = [{"key": list(key), "plans": pool} for key, pool in self._entries.items()]
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+
+_cache: PlanCache | None = None
+
+
+def get_plan_cache() -> PlanCache:
+    """Return the process-wide plan cache."""
+    global _cache
+    if _cache is None:
+        _cache = PlanCache(
+            max_keys=config.PLAN_CACHE_MAX_KEYS,
+            pool_size=config.PLAN_CACHE_POOL_SIZE,
+            ttl=config.PLAN_CACHE_TTL,
+            path=config.PLAN_CACHE_PATH,
+        )
+    return _cache
+
+
+def parse_prewarm_configs(spec: str) -> list[tuple[str, str, str, str]]:
+    """Parse "Google/SDE/SDE1/DSA, Amazon/SDE/SDE2/DSA" into config tuples."""
+    configs = []
+    for item in spec.split(","):
+        parts = [p.strip() for p in item.split("/")]
+        if len(parts) == 4 and all(parts):
+            configs.append(tuple(parts))
+        elif item.strip():
+            log_event("plan_cache_prewarm_invalid", level=logging.WARNING, entry=item)
+    return configs
+
+
+async def prewarm(generate) -> None:
+    """
+    Fill the pool of every configured popular config at startup.
+
+    `generate` is the uncached plan generator, called as
+    `await generate(company, role, level, round_type)`.
+    """
+    if not config.PLAN_CACHE_ENABLED or config.QUICK_TEST_MODE:
+        return
+
+    cache = get_plan_cache()
+    for company, role, level, round_type in parse_prewarm_configs(config.PLAN_CACHE_PREWARM):
+        key = plan_cache_key(company, role, level, round_type)
+        while cache.needs_more(key):
+            try:
+                plan = await generate(company, role, level, round_type)
+            except Exception as e:
+                log_event("plan_cache_prewarm_failed", level=logging.WARNING, key=key, error=str(e))
+                break
+            cache.put(key, plan)
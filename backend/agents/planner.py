@@ -1,16 +1,20 @@
 """Planner LLM agent — generates an interview plan from user config."""
 
-import json
-from openai import OpenAI
+import asyncio
+import logging
 
 import config
+from metrics import log_event, span
 from models import InterviewPlan
 from prompts.planner_prompt import build_planner_prompt
+from .plan_cache import get_plan_cache, plan_cache_key
+from .problem_catalog import get_catalog
 from .react_agent import run_react_agent
+from .structured import output_model, structured_completion
+from .tool_agent import run_tool_agent
 
-
-def _get_client() -> OpenAI:
-    return OpenAI(api_key=config.LLM_API_KEY, base_url=config.LLM_BASE_URL)
+# Background pool refills in flight, keyed by cache key (also keeps task refs alive)
+_refills: dict[tuple, asyncio.Task] = {}
 
 
 async def generate_plan(
@@ -19,7 +23,12 @@ async def generate_plan(
     level: str,
     round_type: str,
 ) -> InterviewPlan:
-    """Call the LLM to produce a structured interview plan."""
+    """
+    Return an interview plan, served from the plan cache when possible.
+
+    On a hit the plan is returned immediately; if the config's pool is not yet
+    full, one more plan is generated in the background for variety.
+    """
     if config.QUICK_TEST_MODE:
         return InterviewPlan(
             duration_minutes=1,
@@ -33,8 +42,38 @@ async def generate_plan(
             ),
         )
 
-    client = _get_client()
+    if not config.PLAN_CACHE_ENABLED:
+        return await generate_fresh_plan(company, role, level, round_type)
+
+    cache = get_plan_cache()
+    key = plan_cache_key(company, role, level, round_type)
+    plan = cache.get(key)
+    if plan is None:
+        plan = await generate_fresh_plan(company, role, level, round_type)
+        cache.put(key, plan)
+    elif cache.needs_more(key) and key not in _refills:
+        _refills[key] = asyncio.create_task(_refill(key, company, role, level, round_type))
+    return plan
+
+
+async def _refill(key: tuple, company: str, role: str, level: str, round_type: str) -> None:
+    """Generate one more plan for a cached config without blocking the caller."""
+    try:
+        plan = await generate_fresh_plan(company, role, level, round_type)
+        get_plan_cache().put(key, plan)
+    except Exception as e:
+        log_event("plan_cache_refill_failed", level=logging.WARNING, key=key, error=str(e))
+    finally:
+        _refills.pop(key, None)
+
 
+async def generate_fresh_plan(
+    company: str,
+    role: str,
+    level: str,
+    round_type: str,
+) -> InterviewPlan:
+    """Call the LLM to produce a structured interview plan (bypasses the cache)."""
     # --- EDUCATIONAL COMMENT ---
     # Instead of letting the LLM hallucinate a problem in one shot, we delegate this
     # very specific task (finding a problem) to our mini autonomous ReAct agent.
@@ -45,7 +84,11 @@ async def generate_plan(
     print("*"*60 + "\n")
     
     try:
-        problem_hint = run_react_agent(goal)
+        with span("react_agent", engine=config.REACT_ENGINE):
+            if config.REACT_ENGINE == "tools":
+                problem_hint, _ = await run_tool_agent(goal)
+            else:
+                problem_hint = await run_react_agent(goal)
     except Exception as e:
         print(f"ReAct Agent Failed. Using fallback. Error: {e}")
         problem_hint = "Make up a coding problem."
@@ -55,22 +98,22 @@ async def generate_plan(
     # We now inject the ReAct agent's finding back into the Planner's prompt
     system_prompt += f"\n\n[Agent Research Results]\nYou MUST format your plan to include this specific coding problem:\n{problem_hint}"
 
-    response = client.chat.completions.create(
-        model=config.LLM_MODEL,
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": "Generate the interview plan now."},
-        ],
-        temperature=0.7,
-    )
-
-    raw = response.choices[0].message.content.strip()
-
-    # Strip markdown code fences if present
-    if raw.startswith("```"):
-        lines = raw.split("\n")
-        lines = [l for l in lines if not l.strip().startswith("```")]
-        raw = "\n".join(lines)
+    with span("planner_llm"):
+        draft = await structured_completion(
+            output_model(InterviewPlan, exclude=("problem_id",)),
+            site="planner",
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": "Generate the interview plan now."},
+            ],
+            temperature=0.7,
+        )
+    plan = InterviewPlan(**draft.model_dump())
 
-    data = json.loads(raw)
-    return InterviewPlan(**data)
+    # Tie the plan to the catalog problem it is about, so its hidden tests can run
+    problem = get_catalog().match_title(f"{plan.question_topic_hint}\n{problem_hint}")
+    if problem is not None:
+        plan.problem_id = problem["id"]
+        if problem.get("signature"):
+            plan.coding_expectations += f" The solution must be implemented as `{problem['signature']}`."
+    return plan
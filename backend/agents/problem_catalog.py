@@ -0,0 +1,174 @@
+"""
+Problem catalog — loads `data/problems.json` once and serves ranked search
+from an in-memory inverted index.
+
+Each problem is indexed over its tags, difficulty, title and description, with
+per-field weights. A query only touches the posting lists of its own tokens,
+so lookups stay fast no matter how large the bank grows; titles are indexed
+by their word sequence for the same reason. The file is re-read only when
+its mtime or size changes.
+"""
+
+import heapq
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "problems.json")
+
+# How much a token match in each field contributes to a problem's score
+FIELD_WEIGHTS = {
+    "tags": 3.0,
+    "difficulty": 2.5,
+    "title": 2.0,
+    "description": 1.0,
+}
+
+# Minimum seconds between stat() calls when checking for an updated file
+RELOAD_CHECK_INTERVAL = 1.0
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from given in into is it of on or return "
+    "such that the their then this to with".split()
+)
+
+
+def _stem(token: str) -> str:
+    """Very light plural stemming so "arrays" matches "array" and "queries" matches "query"."""
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase, split on non-alphanumerics, drop stopwords and stem."""
+    return [_stem(t) for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+
+
+def _words(text: str) -> tuple[str, ...]:
+    """Like `tokenize`, but keeping stopwords, for matching titles as phrases."""
+    return tuple(_stem(t) for t in _TOKEN_RE.findall(text.lower()))
+
+
+class ProblemCatalog:
+    """Load-once problem bank with a weighted inverted index."""
+
+    def __init__(self, path: str = DEFAULT_DB_PATH) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        # (problems, by_id, postings, idf, titles) — swapped as one tuple so
+        # readers never see a half-rebuilt index during a reload
+        self._index: tuple[list[dict], dict, dict, dict, dict] = ([], {}, {}, {}, {})
+        self._file_key: tuple[int, int] | None = None
+        self._last_check = 0.0
+
+    # ── Loading ─────────────────────────────────────────────
+
+    def _maybe_reload(self) -> None:
+        now = time.monotonic()
+        if self._file_key is not None and now - self._last_check < RELOAD_CHECK_INTERVAL:
+            return
+
+        with self._lock:
+            self._last_check = now
+            try:
+                st = os.stat(self.path)
+            except FileNotFoundError:
+                if self._file_key is None:
+                    raise
+                return  # keep serving the last good index
+            key = (st.st_mtime_ns, st.st_size)
+            if key != self._file_key:
+                self._load()
+                self._file_key = key
+
+    def _load(self) -> None:
+        with open(self.path, "r", encoding="utf-8") as f:
+            problems = json.load(f)
+
+        postings: dict[str, dict[int, float]] = defaultdict(lambda: defaultdict(float))
+        # word count → title words → problem (the first problem keeps a shared title)
+        titles: dict[int, dict[tuple[str, ...], dict]] = defaultdict(dict)
+        for idx, p in enumerate(problems):
+            words = _words(p.get("title", ""))
+            if words:
+                titles[len(words)].setdefault(words, p)
+            fields = {
+                "tags": " ".join(p.get("tags", [])),
+                "difficulty": p.get("difficulty", ""),
+                "title": p.get("title", ""),
+                "description": p.get("description", ""),
+            }
+            for field, text in fields.items():
+                weight = FIELD_WEIGHTS[field]
+                for token in tokenize(text):
+                    postings[token][idx] += weight
+
+        n = len(problems)
+        self._index = (
+            problems,
+            {p["id"]: p for p in problems if "id" in p},
+            {t: dict(docs) for t, docs in postings.items()},
+            {t: math.log(1 + n / len(docs)) for t, docs in postings.items()},
+            dict(sorted(titles.items(), reverse=True)),  # longest titles first
+        )
+
+    # ── Queries ─────────────────────────────────────────────
+
+    def search(self, query: str, k: int = 5) -> list[tuple[float, dict]]:
+        """Return up to `k` (score, problem) pairs, best match first."""
+        self._maybe_reload()
+        problems, _, postings, idf, _ = self._index
+
+        scores: dict[int, float] = defaultdict(float)
+        for token in set(tokenize(query)):
+            weight = idf.get(token)
+            if weight is None:
+                continue
+            for idx, tf in postings[token].items():
+                scores[idx] += tf * weight
+
+        best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [(round(score, 3), problems[idx]) for idx, score in best]
+
+    def get(self, problem_id: int) -> dict | None:
+        """Look up a problem by its `id`."""
+        self._maybe_reload()
+        return self._index[1].get(problem_id)
+
+    def match_title(self, text: str) -> dict | None:
+        """
+        Return the problem whose title appears in `text` as a run of words
+        (longest title wins), if any. Only the text's own word runs are looked
+        up, one per distinct title length, whatever the catalog's size.
+        """
+        self._maybe_reload()
+        words = _words(text)
+        for size, by_words in self._index[4].items():
+            for start in range(len(words) - size + 1):
+                problem = by_words.get(words[start:start + size])
+                if problem is not None:
+                    return problem
+        return None
+
+    def __len__(self) -> int:
+        self._maybe_reload()
+        return len(self._index[0])
+
+
+_catalog: ProblemCatalog | None = None
+
+
+def get_catalog() -> ProblemCatalog:
+    """Return the process-wide catalog instance."""
+    global _catalog
+    if _catalog is None:
+        _catalog = ProblemCatalog()
+    return _catalog
@@ -9,13 +9,12 @@ Instead of relying on hidden abstractions, we explicitly define:
 """
 
 import re
-from openai import OpenAI
+import time
 import config
+from metrics import record_agent_run, span
+from .llm_client import chat_completion
 from .tools import TOOLS, TOOL_DESCRIPTIONS
 
-def _get_client() -> OpenAI:
-    return OpenAI(api_key=config.LLM_API_KEY, base_url=config.LLM_BASE_URL)
-
 # ---------------------------------------------------------------------------
 # 1. THE AGENT PROMPT
 # ---------------------------------------------------------------------------
@@ -74,15 +73,16 @@ def parse_llm_output(text: str) -> tuple[str, str] | str:
 # ---------------------------------------------------------------------------
 # In LangChain, this is `AgentExecutor.invoke()`. 
 # It's literally just a while loop that orchestrates the Prompt -> LLM -> Parser -> Tool -> Prompt cycle.
-def run_react_agent(goal: str, max_iterations: int = 5) -> str:
+async def run_react_agent(goal: str, max_iterations: int = 5) -> str:
     """
     Runs the ReAct loop to achieve a specific goal.
     """
-    client = _get_client()
-    
     # We maintain a running scratchpad of everything that has happened so far.
     # In LangChain, this is the `agent_scratchpad` variable.
     prompt = REACT_SYSTEM_PROMPT + f"\nQuestion: {goal}\n"
+    # Per-run stats, so this engine can be compared with the tool-calling one
+    start = time.perf_counter()
+    stats = {"iterations": 0, "tool_calls": 0, "prompt_tokens": 0, "completion_tokens": 0}
     
     print("\n" + "="*50)
     print(f"🤖 STARTING AGENT LOOP FOR GOAL: {goal}")
@@ -92,13 +92,20 @@ def run_react_agent(goal: str, max_iterations: int = 5) -> str:
         print(f"\n--- Iteration {i+1} ---")
         
         # Step 1: Query the LLM
-        response = client.chat.completions.create(
-            model=config.LLM_MODEL,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.0, # 0.0 is crucial for agents so they stick strictly to the formatting rules
-            stop=["Observation:"] # LangChain TRICK: We force the LLM to stop generating text as soon as it types "Observation:". That way, it doesn't hallucinate the tool's result! Our Python code will supply the true Observation.
-        )
+        with span("react_iteration", iteration=i + 1):
+            response = await chat_completion(
+                site="react",
+                model=config.LLM_MODEL,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0.0, # 0.0 is crucial for agents so they stick strictly to the formatting rules
+                stop=["Observation:"] # LangChain TRICK: We force the LLM to stop generating text as soon as it types "Observation:". That way, it doesn't hallucinate the tool's result! Our Python code will supply the true Observation.
+            )
         
+        stats["iterations"] += 1
+        if response.usage:
+            stats["prompt_tokens"] += response.usage.prompt_tokens
+            stats["completion_tokens"] += response.usage.completion_tokens
+
         llm_response = response.choices[0].message.content.strip()
         print(f"LLM Response:\n{llm_response}\n")
         
@@ -116,6 +123,8 @@ def run_react_agent(goal: str, max_iterations: int = 5) -> str:
         # Step 3A: If it's a string, it's the Final Answer! We break the loop.
         if isinstance(parsed, str):
             print("🏁 AGENT FINISHED!")
+            stats["wall_time_ms"] = round((time.perf_counter() - start) * 1000, 1)
+            record_agent_run("text", stats)
             return parsed
             
         # Step 3B: If it's a tuple, it wants to use a tool.
@@ -125,8 +134,10 @@ def run_react_agent(goal: str, max_iterations: int = 5) -> str:
         if action in TOOLS:
             # Actually execute the Python function
             tool_func = TOOLS[action]
+            stats["tool_calls"] += 1
             try:
-                observation = tool_func(action_input)
+                with span("tool_call", tool=action):
+                    observation = tool_func(action_input)
             except Exception as e:
                 observation = f"Error executing tool: {e}"
         else:
@@ -137,4 +148,6 @@ def run_react_agent(goal: str, max_iterations: int = 5) -> str:
         # Add the true observation back into the prompt so the LLM sees it on the next iteration.
         prompt += f"Observation: {observation}\n"
         
+    stats["wall_time_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    record_agent_run("text", stats)
     return "Agent failed to finish within max iterations."
@@ -0,0 +1,240 @@
+"""
+Structured LLM output — JSON answers validated against a pydantic model.
+
+The planner and evaluators ask for one JSON object of a known shape. The
+schema is derived from the target model (minus fields the server fills in)
+and, depending on `LLM_STRUCTURED_OUTPUT`, sent as a `response_format`:
+
+    json_schema   schema-constrained decoding, where the provider supports it
+    json_object   any JSON object; the shape comes from the prompt
+    off           prompt only
+
+If the provider rejects the response format itself (a 400 naming
+`response_format` or the schema), requests for that output model drop to the
+next mode down and stay there; any other 400 (context length, unknown
+model, ...) is raised unchanged. Answers are parsed and validated in a
+single pass (`model_validate_json` on the first balanced `{...}` in the
+text), so code fences and stray prose around the object don't matter.
+
+An answer that still doesn't validate gets up to `LLM_REPAIR_ATTEMPTS`
+repair requests: a short call carrying only the schema, the broken output
+and the validation errors, instead of rerunning the original prompt with its
+transcript or research. Outcomes per site (ok / repaired / failed) are
+counted in `STRUCTURED_OUTPUTS`, which gives the parse-failure rate.
+"""
+
+import json
+import logging
+from functools import lru_cache
+from typing import TypeVar
+
+import openai
+from pydantic import BaseModel, ValidationError, create_model
+
+import config
+from metrics import STRUCTURED_OUTPUTS, log_event
+from .llm_client import chat_completion
+
+M = TypeVar("M", bound=BaseModel)
+
+MODES = ["json_schema", "json_object", "off"]
+_DEFAULT_MODE = config.LLM_STRUCTURED_OUTPUT if config.LLM_STRUCTURED_OUTPUT in MODES else "json_schema"
+# Output models whose schema (or any response format) the provider rejected, and the mode they fell back to
+_downgraded: dict[str, str] = {}
+
+# Words in a 400 that mark it as a rejection of the requested response format
+FORMAT_ERROR_HINTS = ("response_format", "json_schema", "response_schema", "json_object")
+
+REPAIR_PROMPT = (
+    "You fix JSON so that it matches a JSON schema. Reply with the corrected JSON object only: "
+    "no prose, no code fences. Keep every value the original states and change only what the "
+    "validation errors require; if a required value is missing, infer it from the rest of the object."
+)
+
+
+class StructuredOutputError(Exception):
+    """The model's answer could not be validated, even after repair."""
+
+
+# ── Schemas ─────────────────────────────────────────────────
+
+@lru_cache(maxsize=None)
+def output_model(model: type[BaseModel], exclude: tuple[str, ...] = ()) -> type[BaseModel]:
+    """`model` without the `exclude`d (server-filled) fields; the model itself if none are excluded."""
+    if not exclude:
+        return model
+    fields = {name: (f.annotation, f) for name, f in model.model_fields.items() if name not in exclude}
+    return create_model(model.__name__, **fields)
+
+
+def _inline_refs(node, defs: dict):
+    """Replace `$ref`s with their definitions; some providers reject references."""
+    if isinstance(node, dict):
+        if "$ref" in node:
+            return _inline_refs(defs[node["$ref"].rsplit("/", 1)[-1]], defs)
+        return {k: _inline_refs(v, defs) for k, v in node.items() if k != "$defs"}
+    if isinstance(node, list):
+        return [_inline_refs(v, defs) for v in node]
+    return node
+
+
+@lru_cache(maxsize=None)
+def _schema_text(model: type[BaseModel]) -> str:
+    schema = model.model_json_schema()
+    return json.dumps(_inline_refs(schema, schema.get("$defs", {})))
+
+
+def output_schema(model: type[BaseModel]) -> dict:
+    """Self-contained JSON schema of an output model."""
+    return json.loads(_schema_text(model))
+
+
+def _mode(model: type[BaseModel]) -> str:
+    return _downgraded.get(model.__name__, _DEFAULT_MODE)
+
+
+def _response_format(model: type[BaseModel]) -> dict | None:
+    mode = _mode(model)
+    if mode == "json_schema":
+        return {
+            "type": "json_schema",
+            "json_schema": {"name": model.__name__, "schema": output_schema(model)},
+        }
+    if mode == "json_object":
+        return {"type": "json_object"}
+    return None
+
+
+def _rejects_format(error: openai.BadRequestError) -> bool:
+    """Whether a 400 is about the response format, rather than the prompt or model."""
+    if getattr(error, "param", None) == "response_format":
+        return True
+    text = f"{error.message} {error.body}".lower()
+    return any(hint in text for hint in FORMAT_ERROR_HINTS)
+
+
+# ── Parsing ─────────────────────────────────────────────────
+
+def _json_span(text: str) -> str:
+    """The first balanced {...} in `text` (from its first "{" to the end if it's cut off)."""
+    start = text.find("{")
+    if start < 0:
+        return text
+    depth = 0
+    in_string = escaped = False
+    for i in range(start, len(text)):
+        c = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif c == "\\":
+                escaped = True
+            elif c == '"':
+                in_string = False
+        elif c == '"':
+            in_string = True
+        elif c == "{":
+            depth += 1
+        elif c == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return text[start:]
+
+
+def parse_output(model: type[M], text: str) -> M:
+    """Parse and validate the JSON object in `text`; raises ValidationError (incl. malformed JSON)."""
+    return model.model_validate_json(_json_span(text))
+
+
+def _describe_errors(error: ValidationError, limit: int = 10) -> str:
+    lines = []
+    for err in error.errors(include_url=False)[:limit]:
+        where = ".".join(str(part) for part in err["loc"]) or "(root)"
+        lines.append(f"- {where}: {err['msg']}")
+    if error.error_count() > limit:
+        lines.append(f"- ... and {error.error_count() - limit} more")
+    return "\n".join(lines)
+
+
+# ── Requests ────────────────────────────────────────────────
+
+async def _complete(site: str, output: type[BaseModel], **kwargs) -> str:
+    """One completion in the output's current mode, stepping it down if the provider rejects the format."""
+    while True:
+        response_format = _response_format(output)
+        try:
+            if response_format is None:
+                response = await chat_completion(site=site, **kwargs)
+            else:
+                response = await chat_completion(site=site, response_format=response_format, **kwargs)
+        except openai.BadRequestError as e:
+            if response_format is None or not _rejects_format(e):
+                raise
+            mode = _mode(output)
+            downgraded = MODES[MODES.index(mode) + 1]
+            log_event(
+                "structured_output_downgraded", level=logging.WARNING,
+                site=site, output=output.__name__, mode=mode, to=downgraded, error=str(e),
+            )
+            _downgraded[output.__name__] = downgraded
+            continue
+        return response.choices[0].message.content or ""
+
+
+async def structured_completion(
+    output: type[M],
+    site: str,
+    messages: list[dict],
+    temperature: float,
+) -> M:
+    """
+    Ask for a JSON object matching the `output` model and return it validated.
+
+    Invalid answers are repaired with up to `LLM_REPAIR_ATTEMPTS` short
+    requests; raises StructuredOutputError if none of them validates.
+    """
+    raw = await _complete(site, output, model=config.LLM_MODEL, messages=messages, temperature=temperature)
+    try:
+        result = parse_output(output, raw)
+    except ValidationError as e:
+        error = e
+    else:
+        STRUCTURED_OUTPUTS.inc(site=site, result="ok")
+        return result
+
+    for _ in range(config.LLM_REPAIR_ATTEMPTS):
+        log_event(
+            "structured_output_invalid", level=logging.WARNING,
+            site=site, output=output.__name__, errors=error.error_count(), first_error=error.errors()[0]["msg"],
+        )
+        raw = await _complete(
+            "repair",
+            output,
+            model=config.LLM_MODEL,
+            messages=[
+                {"role": "system", "content": REPAIR_PROMPT},
+                {
+                    "role": "user",
+                    "content": (
+                        f"Schema:\n{_schema_text(output)}\n\n"
+                        f"Output to fix:\n{raw}\n\n"
+                        f"Validation errors:\n{_describe_errors(error)}"
+                    ),
+                },
+            ],
+            temperature=0,
+        )
+        try:
+            result = parse_output(output, raw)
+        except ValidationError as e:
+            error = e
+            continue
+        STRUCTURED_OUTPUTS.inc(site=site, result="repaired")
+        return result
+
+    STRUCTURED_OUTPUTS.inc(site=site, result="failed")
+    raise StructuredOutputError(
+        f"{site} answer did not match {output.__name__} ({error.error_count()} errors, "
+        f"first: {error.errors()[0]['msg']})"
+    ) from error
@@ -0,0 +1,107 @@
+"""
+The same ReAct loop as react_agent.py, driven by native tool (function) calling.
+
+Where the text engine re-sends one ever-growing prompt and regex-parses
+"Action:" lines out of free text, this engine:
+1. Describes tools as JSON schemas (`TOOL_SCHEMAS`) — no format rules to break.
+2. Keeps a normal chat history, appending each turn's assistant/tool
+   messages. Chat completions are stateless, so every request still
+   carries the whole history, but it holds structured calls and results
+   rather than a re-rendered transcript of the scratchpad.
+3. Runs every tool call the model requests in one turn concurrently.
+"""
+
+import asyncio
+import json
+import time
+
+import config
+from metrics import record_agent_run, span
+from .llm_client import chat_completion
+from .tools import TOOLS, TOOL_SCHEMAS
+
+TOOL_AGENT_SYSTEM_PROMPT = """
+You are an intelligent Assistant tasked with answering questions and solving problems.
+Use the provided tools to gather facts; you may call several tools at once.
+When you have enough information, reply with the final answer as plain text (no tool calls).
+"""
+
+
+async def _run_tool(name: str, arguments: str) -> str:
+    """Execute one requested tool call and return its observation text."""
+    if name not in TOOLS:
+        return f"Tool '{name}' not found."
+    try:
+        args = json.loads(arguments or "{}")
+    except json.JSONDecodeError as e:
+        return f"Invalid JSON arguments for '{name}': {e}"
+    try:
+        with span("tool_call", tool=name):
+            # Tools are plain blocking functions; keep them off the event loop
+            return await asyncio.to_thread(TOOLS[name], **args)
+    except Exception as e:
+        return f"Error executing tool: {e}"
+
+
+async def run_tool_agent(goal: str, max_iterations: int = 5) -> tuple[str, dict]:
+    """
+    Runs the tool-calling loop to achieve a specific goal.
+
+    Returns (final_answer, stats) where stats has iterations, tool_calls,
+    prompt/completion tokens and wall_time_ms.
+    """
+    messages = [
+        {"role": "system", "content": TOOL_AGENT_SYSTEM_PROMPT},
+        {"role": "user", "content": goal},
+    ]
+    start = time.perf_counter()
+    stats = {"iterations": 0, "tool_calls": 0, "prompt_tokens": 0, "completion_tokens": 0}
+    answer = "Agent failed to finish within max iterations."
+
+    print("\n" + "="*50)
+    print(f"🤖 STARTING TOOL-CALLING AGENT FOR GOAL: {goal}")
+    print("="*50 + "\n")
+
+    for i in range(max_iterations):
+        # On the last allowed turn, forbid further tool calls so we always get an answer
+        last_turn = i == max_iterations - 1
+        with span("react_iteration", iteration=i + 1, engine="tools"):
+            response = await chat_completion(
+                site="react",
+                model=config.LLM_MODEL,
+                messages=messages,
+                tools=TOOL_SCHEMAS,
+                tool_choice="none" if last_turn else "auto",
+                temperature=0.0,
+            )
+
+        stats["iterations"] += 1
+        if response.usage:
+            stats["prompt_tokens"] += response.usage.prompt_tokens
+            stats["completion_tokens"] += response.usage.completion_tokens
+
+        message = response.choices[0].message
+        if not message.tool_calls:
+            answer = (message.content or "").strip()
+            print(f"🏁 AGENT FINISHED after {i + 1} call(s)!")
+            break
+
+        # Echo the assistant's tool request back, then answer each call by id
+        messages.append({
+            "role": "assistant",
+            "content": message.content,
+            "tool_calls": [call.model_dump() for call in message.tool_calls],
+        })
+        for call in message.tool_calls:
+            print(f"🛠️ Agent requested tool: '{call.function.name}' with arguments: {call.function.arguments}")
+        observations = await asyncio.gather(*(
+            _run_tool(call.function.name, call.function.arguments)
+            for call in message.tool_calls
+        ))
+        stats["tool_calls"] += len(observations)
+        for call, observation in zip(message.tool_calls, observations):
+            messages.append({"role": "tool", "tool_call_id": call.id, "content": observation})
+
+    stats["wall_time_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    record_agent_run("tools", stats)
+    return answer, stats
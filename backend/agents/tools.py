@@ -3,37 +3,33 @@ Tools for the ReAct Agent.
 In LangChain, you'd use the `@tool` decorator. Here, we just define normal Python functions
 and manually describe them to the agent.
 """
-import json
-import os
+from .problem_catalog import get_catalog
+
+# Maximum number of ranked matches returned to the agent per search
+MAX_RESULTS = 5
+
 
 def search_problem_db(query: str) -> str:
     """
-    Searches the mock database of problems for a given difficulty or tag.
-    Returns a string representation of the matching problems.
+    Searches the problem catalog for a difficulty, tag or keywords.
+    Returns a string representation of the best-ranked matching problems.
     """
-    db_path = os.path.join(os.path.dirname(__file__), "..", "data", "problems.json")
-    
     try:
-        with open(db_path, "r", encoding="utf-8") as f:
-            problems = json.load(f)
+        matches = get_catalog().search(query, k=MAX_RESULTS)
     except FileNotFoundError:
         return "Error: Database not found."
-        
+
     query = query.lower().strip()
-    results = []
-    
-    for p in problems:
-        # Simple search across title, difficulty, or tags
-        if query in p["difficulty"].lower() or any(query == tag.lower() for tag in p["tags"]):
-            results.append(
-                f"Title: {p['title']} (Difficulty: {p['difficulty']})\n"
-                f"Description: {p['description']}\n"
-                f"Ideal Solution: {p['ideal_solution']}\n"
-            )
-            
+    results = [
+        f"Title: {p['title']} (Difficulty: {p['difficulty']}, Relevance: {score})\n"
+        f"Description: {p['description']}\n"
+        f"Ideal Solution: {p['ideal_solution']}\n"
+        for score, p in matches
+    ]
+
     if not results:
         return f"No problems found matching query: '{query}'"
-        
+
     return "Found the following problems:\n\n" + "\n---\n".join(results)
 
 # In a real agent framework (like LangChain), the framework uses introspection or schemas 
@@ -46,6 +42,34 @@ TOOLS = {
 TOOL_DESCRIPTIONS = """
 1. search_problem_db(query: str)
    - Use this to find coding problems. 
-   - 'query' should be a difficulty level (e.g., "easy", "medium", "hard") or a topic tag (e.g., "arrays", "graphs", "sorting").
-   - Returns details about matching problems.
+   - 'query' can be a difficulty level (e.g., "easy", "medium", "hard"), a topic tag (e.g., "arrays", "graphs", "sorting"), or a few keywords combining them (e.g., "medium graphs").
+   - Returns details about the best-matching problems, most relevant first.
 """
+
+# The same tools described as JSON schemas for native function calling
+# (used by the tool-calling engine in tool_agent.py instead of TOOL_DESCRIPTIONS).
+TOOL_SCHEMAS = [
+    {
+        "type": "function",
+        "function": {
+            "name": "search_problem_db",
+            "description": (
+                "Search the coding problem catalog. Returns the best-matching problems "
+                "(title, difficulty, description, ideal solution), most relevant first."
+            ),
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "query": {
+                        "type": "string",
+                        "description": (
+                            'A difficulty ("easy", "medium", "hard"), a topic tag '
+                            '("arrays", "graphs", "sorting") or keywords combining them ("medium graphs").'
+                        ),
+                    },
+                },
+                "required": ["query"],
+            },
+        },
+    },
+]
@@ -16,9 +16,114 @@ LLM_BASE_URL: str = os.getenv(
 )
 LLM_MODEL: str = os.getenv("LLM_MODEL", "gemini-1.5-flash")
 
+# Shared client pool: max in-flight LLM requests and HTTP keep-alive tuning
+LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+LLM_MAX_CONNECTIONS: int = int(os.getenv("LLM_MAX_CONNECTIONS", "32"))
+LLM_KEEPALIVE_CONNECTIONS: int = int(os.getenv("LLM_KEEPALIVE_CONNECTIONS", "16"))
+LLM_KEEPALIVE_EXPIRY: float = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "60"))
+LLM_TIMEOUT: float = float(os.getenv("LLM_TIMEOUT", "60"))
+# Call policy (see agents/llm_policy.py): models tried after LLM_MODEL, e.g. "gemini-1.5-flash-8b",
+# consecutive failures that open a model's circuit and seconds until it is retried, and per-site
+# overrides such as "interviewer:deadline=15,hedge=false;evaluator:retries=3"
+LLM_FALLBACK_MODELS: list[str] = [
+    m.strip() for m in os.getenv("LLM_FALLBACK_MODELS", "").split(",") if m.strip()
+]
+LLM_CIRCUIT_FAILURES: int = int(os.getenv("LLM_CIRCUIT_FAILURES", "5"))
+LLM_CIRCUIT_COOLDOWN: float = float(os.getenv("LLM_CIRCUIT_COOLDOWN", "30"))
+LLM_POLICY: str = os.getenv("LLM_POLICY", "")
+# Planner / evaluator JSON answers (see agents/structured.py): "json_schema" (schema-constrained
+# response_format), "json_object" or "off" (prompt only), and repair requests per invalid answer
+LLM_STRUCTURED_OUTPUT: str = os.getenv("LLM_STRUCTURED_OUTPUT", "json_schema").lower()
+LLM_REPAIR_ATTEMPTS: int = int(os.getenv("LLM_REPAIR_ATTEMPTS", "1"))
+
+# Problem-research agent: "tools" (native function calling) or "text" (classic ReAct prompt)
+REACT_ENGINE: str = os.getenv("REACT_ENGINE", "tools")
+
+# Interviewer context window: recent messages kept verbatim, and their token budget
+INTERVIEWER_CONTEXT_MESSAGES: int = int(os.getenv("INTERVIEWER_CONTEXT_MESSAGES", "12"))
+INTERVIEWER_CONTEXT_TOKENS: int = int(os.getenv("INTERVIEWER_CONTEXT_TOKENS", "3000"))
+
 # ── Sandbox settings ────────────────────────────────────────
 SANDBOX_TIMEOUT: int = int(os.getenv("SANDBOX_TIMEOUT", "10"))
 MAX_CODE_LENGTH: int = int(os.getenv("MAX_CODE_LENGTH", "5000"))
+# Hidden tests: per-test time limit, and failures after which the rest are skipped (0 = run all)
+SANDBOX_TEST_TIMEOUT: float = float(os.getenv("SANDBOX_TEST_TIMEOUT", "2"))
+SANDBOX_MAX_FAILURES: int = int(os.getenv("SANDBOX_MAX_FAILURES", "3"))
+# Per-run rlimits: address space (MB), CPU seconds, combined stdout+stderr bytes, and
+# RLIMIT_NPROC (counted per user, so 0 = the run may not fork; not enforced for root)
+SANDBOX_MEMORY_MB: int = int(os.getenv("SANDBOX_MEMORY_MB", "256"))
+SANDBOX_CPU_SECONDS: int = int(os.getenv("SANDBOX_CPU_SECONDS", str(SANDBOX_TIMEOUT)))
+SANDBOX_MAX_OUTPUT_BYTES: int = int(os.getenv("SANDBOX_MAX_OUTPUT_BYTES", str(1024 * 1024)))
+SANDBOX_MAX_PROCESSES: int = int(os.getenv("SANDBOX_MAX_PROCESSES", "0"))
+# Complexity profiler: total seconds spent timing growing inputs in one run
+SANDBOX_PROFILE_BUDGET: float = float(os.getenv("SANDBOX_PROFILE_BUDGET", "5"))
+# "subprocess" spawns a fresh interpreter per run; "pool" forks runs from pre-warmed zygotes
+SANDBOX_MODE: str = os.getenv("SANDBOX_MODE", "subprocess").lower()
+SANDBOX_POOL_SIZE: int = int(os.getenv("SANDBOX_POOL_SIZE", "4"))
+# Admission control: concurrent runs, extra queued runs, and in-flight runs per session
+SANDBOX_MAX_CONCURRENCY: int = int(os.getenv("SANDBOX_MAX_CONCURRENCY", "4"))
+SANDBOX_QUEUE_SIZE: int = int(os.getenv("SANDBOX_QUEUE_SIZE", "16"))
+SANDBOX_MAX_PER_SESSION: int = int(os.getenv("SANDBOX_MAX_PER_SESSION", "1"))
+# Reuse results of identical deterministic runs (LRU, bounded by approximate bytes)
+SANDBOX_CACHE_ENABLED: bool = os.getenv("SANDBOX_CACHE_ENABLED", "true").lower() == "true"
+SANDBOX_CACHE_MAX_BYTES: int = int(os.getenv("SANDBOX_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+
+# ── Evaluation settings ─────────────────────────────────────
+# Score each finished phase in the background so /evaluate only merges results
+INCREMENTAL_EVAL: bool = os.getenv("INCREMENTAL_EVAL", "true").lower() == "true"
+# How long /evaluate waits for in-flight phase scoring before rescoring the gap itself
+PHASE_SCORING_WAIT: float = float(os.getenv("PHASE_SCORING_WAIT", "15"))
+
+# ── Session store settings ──────────────────────────────────
+# "sqlite" (durable, with an in-memory hot tier), "shared" (SQLite read and written
+# directly, for `uvicorn --workers N`) or "memory" (lost on restart)
+SESSION_STORE: str = os.getenv("SESSION_STORE", "sqlite").lower()
+SESSION_DB_PATH: str = os.getenv(
+    "SESSION_DB_PATH",
+    str(Path(__file__).resolve().parent / "data" / "sessions.db"),
+)
+# Seconds before an idle / completed session is evicted from RAM (reloaded on access)
+SESSION_IDLE_TTL: float = float(os.getenv("SESSION_IDLE_TTL", "1800"))
+SESSION_COMPLETED_TTL: float = float(os.getenv("SESSION_COMPLETED_TTL", "60"))
+# Seconds between write-behind flushes to SQLite
+SESSION_FLUSH_INTERVAL: float = float(os.getenv("SESSION_FLUSH_INTERVAL", "1.0"))
+# Seconds a request waits for another one on the same session before a 409, and how
+# long a cross-worker lease lasts if its holder dies ("shared" store only)
+SESSION_LOCK_TIMEOUT: float = float(os.getenv("SESSION_LOCK_TIMEOUT", "30"))
+SESSION_LEASE_TTL: float = float(os.getenv("SESSION_LEASE_TTL", "120"))
+# Seconds a session may spend being prepared (plan + opening question) before it fails;
+# on startup, sessions still "planning" past this are failed (any age, unless "shared")
+SESSION_BOOTSTRAP_TIMEOUT: float = float(os.getenv("SESSION_BOOTSTRAP_TIMEOUT", "300"))
+
+# ── Plan cache settings ─────────────────────────────────────
+PLAN_CACHE_ENABLED: bool = os.getenv("PLAN_CACHE_ENABLED", "true").lower() == "true"
+PLAN_CACHE_MAX_KEYS: int = int(os.getenv("PLAN_CACHE_MAX_KEYS", "256"))
+# Distinct plans kept per (company, role, level, round_type) for variety
+PLAN_CACHE_POOL_SIZE: int = int(os.getenv("PLAN_CACHE_POOL_SIZE", "3"))
+PLAN_CACHE_TTL: float = float(os.getenv("PLAN_CACHE_TTL", str(24 * 3600)))
+# Optional JSON file backing; empty keeps the cache in memory only
+PLAN_CACHE_PATH: str = os.getenv("PLAN_CACHE_PATH", "")
+# Configs to pre-warm at startup, e.g. "Google/SDE/SDE1/DSA,Amazon/SDE/SDE2/DSA"
+PLAN_CACHE_PREWARM: str = os.getenv("PLAN_CACHE_PREWARM", "")
+
+# ── LLM response cache settings ─────────────────────────────
+LLM_CACHE_ENABLED: bool = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+# Call sites whose (deterministic) completions are cached: react, evaluator, summary
+LLM_CACHE_SITES: set[str] = {
+    s.strip() for s in os.getenv("LLM_CACHE_SITES", "react,evaluator").split(",") if s.strip()
+}
+LLM_CACHE_MAX_ENTRIES: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024"))
+LLM_CACHE_TTL: float = float(os.getenv("LLM_CACHE_TTL", str(24 * 3600)))
+# Rows kept in the SQLite backing (oldest dropped first; 0 = no cap beyond the TTL)
+LLM_CACHE_MAX_ROWS: int = int(os.getenv("LLM_CACHE_MAX_ROWS", "20000"))
+# SQLite backing so cached responses survive restarts; empty keeps them in memory only
+LLM_CACHE_PATH: str = os.getenv(
+    "LLM_CACHE_PATH",
+    str(Path(__file__).resolve().parent / "data" / "llm_cache.db"),
+)
+
+# ── Observability settings ──────────────────────────────────
+LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
 
 # ── Testing settings ────────────────────────────────────────
 QUICK_TEST_MODE: bool = os.getenv("QUICK_TEST_MODE", "false").lower() == "true"
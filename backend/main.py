@@ -1,17 +1,51 @@
 """FastAPI application entry point."""
 
+import asyncio
+import time
+from contextlib import asynccontextmanager
 from pathlib import Path
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
-from routers import session, interview, code
+import config
+from agents import plan_cache
+from agents.llm_client import close_client
+from agents.planner import generate_fresh_plan
+from metrics import HTTP_SECONDS, configure_logging
+from routers import session, interview, code, metrics, ws
+from routers.session import cancel_bootstraps, recover_bootstraps
+from sandbox.pool import get_pool, shutdown_pool
+from state import close_store
+from store.base import SessionConflict
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    configure_logging(config.LOG_LEVEL)
+    # Sessions a crashed or killed process left "planning" would otherwise stay there for good
+    recover_bootstraps()
+    # Pre-warm sandbox zygotes so the first "Run" doesn't pay for startup
+    if config.SANDBOX_MODE == "pool":
+        get_pool()
+    # Fill the plan cache for popular configs without delaying startup
+    prewarm_task = asyncio.create_task(plan_cache.prewarm(generate_fresh_plan))
+    yield
+    prewarm_task.cancel()
+    await cancel_bootstraps()
+    # Release pooled LLM connections and sandbox workers, flush sessions on shutdown
+    await close_client()
+    shutdown_pool()
+    close_store()
+
 
 app = FastAPI(
     title="Mock Interview Agent",
     description="Company-specific mock technical interview simulator",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # ── CORS (allow all for dev) ────────────────────────────────
@@ -23,10 +57,40 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ── Request timing ──────────────────────────────────────────
+@app.middleware("http")
+async def time_requests(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Label by route template (not raw path) to keep cardinality bounded
+        route = request.scope.get("route")
+        if route is not None:
+            HTTP_SECONDS.observe(
+                time.perf_counter() - start,
+                method=request.method,
+                route=route.path,
+                status=status,
+            )
+
+
+# ── Session conflicts ───────────────────────────────────────
+@app.exception_handler(SessionConflict)
+async def session_conflict(request: Request, exc: SessionConflict):
+    # Lost a race for the session (still locked, or saved from a stale copy); safe to retry
+    return JSONResponse(status_code=409, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
+
 # ── Routers ─────────────────────────────────────────────────
 app.include_router(session.router)
 app.include_router(interview.router)
 app.include_router(code.router)
+app.include_router(metrics.router)
+app.include_router(ws.router)
 
 # ── Serve frontend static files ─────────────────────────────
 frontend_dir = Path(__file__).resolve().parent.parent / "frontend"
@@ -0,0 +1,290 @@
+"""
+Lightweight metrics and structured logging — no external dependencies.
+
+• `span(stage)` times a block, feeds the stage latency histogram, counts
+  errors and emits one JSON log line tagged with the current session_id.
+• Counters / histograms / callback gauges are rendered in Prometheus text
+  format by `render()` (served at GET /metrics).
+• `bind_session(session_id)` tags everything logged in the current task
+  (and tasks it spawns) with that session.
+"""
+
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator
+
+logger = logging.getLogger("mock_interview")
+
+_session_id: ContextVar[str | None] = ContextVar("session_id", default=None)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelKey = tuple[tuple[str, str], ...]
+
+
+def _label_key(labels: dict) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: LabelKey, extra: tuple[tuple[str, str], ...] = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+class Counter:
+    def __init__(self, name: str, help: str) -> None:
+        self.name, self.help = name, help
+        self._values: dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(key)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.name, self.help, self.buckets = name, help, buckets
+        # label key -> [bucket counts..., sum, count]
+        self._values: dict[LabelKey, list[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._values.items()):
+                for bound, count in zip(self.buckets, series):
+                    lines.append(f"{self.name}_bucket{_format_labels(key, (('le', str(bound)),))} {count}")
+                lines.append(f"{self.name}_bucket{_format_labels(key, (('le', '+Inf'),))} {series[-1]}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {series[-2]}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {series[-1]}")
+        return lines
+
+
+class Gauge:
+    """Sampled at scrape time; `fn` returns a number or {labels-dict-tuple: number}."""
+
+    def __init__(self, name: str, help: str, fn: Callable[[], float | dict]) -> None:
+        self.name, self.help, self.fn = name, help, fn
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        try:
+            value = self.fn()
+        except Exception as e:
+            logger.warning("gauge %s failed: %s", self.name, e)
+            return []
+        if isinstance(value, dict):
+            for labels, v in value.items():
+                if v is not None:
+                    lines.append(f"{self.name}{_format_labels(_label_key(dict(labels)))} {v}")
+        elif value is not None:
+            lines.append(f"{self.name} {value}")
+        return lines
+
+
+_registry: dict[str, Counter | Histogram | Gauge] = {}
+
+
+def counter(name: str, help: str) -> Counter:
+    return _registry.setdefault(name, Counter(name, help))
+
+
+def histogram(name: str, help: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+    return _registry.setdefault(name, Histogram(name, help, buckets))
+
+
+def gauge(name: str, help: str, fn: Callable[[], float | dict]) -> Gauge:
+    _registry[name] = Gauge(name, help, fn)
+    return _registry[name]
+
+
+def render() -> str:
+    """All registered metrics in Prometheus text exposition format."""
+    lines: list[str] = []
+    for metric in _registry.values():
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# ── Core instruments ────────────────────────────────────────
+
+STAGE_SECONDS = histogram(
+    "mock_interview_stage_duration_seconds",
+    "Duration of each pipeline stage (LLM calls, tools, sandbox, store).",
+)
+STAGE_ERRORS = counter(
+    "mock_interview_stage_errors_total",
+    "Stages that raised an exception.",
+)
+AGENT_TOKENS = counter(
+    "mock_interview_agent_tokens_total",
+    "Tokens used by the problem-research agent, by engine and kind (prompt/completion).",
+)
+AGENT_LLM_CALLS = counter(
+    "mock_interview_agent_llm_calls_total",
+    "LLM round trips made by the problem-research agent, by engine.",
+)
+HTTP_SECONDS = histogram(
+    "mock_interview_http_request_duration_seconds",
+    "HTTP request latency by route and status.",
+)
+WS_SECONDS = histogram(
+    "mock_interview_ws_message_duration_seconds",
+    "Interview WebSocket request handling time by message type and status.",
+)
+LLM_CALL_SECONDS = histogram(
+    "mock_interview_llm_call_duration_seconds",
+    "End-to-end LLM call latency by call site, including retries, hedges and fallbacks.",
+)
+LLM_ATTEMPTS = counter(
+    "mock_interview_llm_attempts_total",
+    "LLM attempts by call site, model and outcome (ok / timeout / error / fatal).",
+)
+LLM_POLICY_EVENTS = counter(
+    "mock_interview_llm_policy_events_total",
+    "LLM call-policy paths taken, by call site: retry, hedge, hedge_won, fallback, circuit_open, exhausted.",
+)
+STRUCTURED_OUTPUTS = counter(
+    "mock_interview_structured_outputs_total",
+    "Structured (JSON) LLM answers by call site and result (ok / repaired / failed).",
+)
+LLM_CACHE_LOOKUPS = counter(
+    "mock_interview_llm_cache_lookups_total",
+    "LLM response cache lookups by call site and result (hit / miss).",
+)
+SANDBOX_CPU = histogram(
+    "mock_interview_sandbox_cpu_seconds",
+    "CPU time (user + system) of each sandbox run, by problem.",
+)
+SANDBOX_MEMORY = histogram(
+    "mock_interview_sandbox_peak_memory_megabytes",
+    "Peak resident memory of each sandbox run, by problem.",
+    buckets=(8, 16, 32, 64, 128, 256, 512, 1024),
+)
+SANDBOX_EXITS = counter(
+    "mock_interview_sandbox_runs_total",
+    "Sandbox runs by problem and exit reason (ok, error, timeout, *_limit, ...).",
+)
+
+
+# ── Structured logging & spans ──────────────────────────────
+
+def bind_session(session_id: str | None) -> None:
+    """Tag subsequent logs/spans in this task (and its children) with a session."""
+    _session_id.set(session_id)
+
+
+def current_session() -> str | None:
+    return _session_id.get()
+
+
+def log_event(event: str, level: int = logging.INFO, **fields) -> None:
+    """Emit one JSON log line carrying the bound session_id."""
+    if not logger.isEnabledFor(level):
+        return
+    record = {"event": event, "session_id": fields.pop("session_id", None) or _session_id.get(), **fields}
+    logger.log(level, json.dumps(record, default=str))
+
+
+def observe_stage(stage: str, seconds: float, status: str = "ok", quiet: bool = False, **fields) -> None:
+    """Record an externally timed stage (e.g. one measured in a worker thread)."""
+    STAGE_SECONDS.observe(seconds, stage=stage, status=status)
+    if status != "ok":
+        STAGE_ERRORS.inc(stage=stage)
+    log_event(
+        "span",
+        level=logging.DEBUG if quiet else logging.INFO,
+        stage=stage,
+        status=status,
+        duration_ms=round(seconds * 1000, 1),
+        **fields,
+    )
+
+
+@contextmanager
+def span(stage: str, quiet: bool = False, **fields) -> Iterator[dict]:
+    """
+    Time a block as one pipeline stage.
+
+    The yielded dict can be filled with extra fields (e.g. token counts) that
+    end up on the log line. `quiet` spans log at DEBUG (for hot paths).
+    """
+    extra: dict = {}
+    start = time.perf_counter()
+    status = "ok"
+    try:
+        yield extra
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        observe_stage(stage, time.perf_counter() - start, status=status, quiet=quiet, **fields, **extra)
+
+
+def record_agent_run(engine: str, stats: dict) -> None:
+    """Feed one agent run's stats (iterations, tokens, wall time) into metrics and logs."""
+    AGENT_LLM_CALLS.inc(stats["iterations"], engine=engine)
+    AGENT_TOKENS.inc(stats["prompt_tokens"], engine=engine, kind="prompt")
+    AGENT_TOKENS.inc(stats["completion_tokens"], engine=engine, kind="completion")
+    log_event("agent_run", engine=engine, **stats)
+
+
+def record_sandbox_usage(problem_id: int | None, result: dict) -> None:
+    """Feed one sandbox run's exit reason and measured CPU / memory (when known) into metrics and logs."""
+    problem = str(problem_id) if problem_id is not None else "none"
+    if result["cpu_time_ms"] is not None:
+        SANDBOX_CPU.observe(result["cpu_time_ms"] / 1000, problem=problem)
+    if result["peak_memory_kb"] is not None:
+        SANDBOX_MEMORY.observe(result["peak_memory_kb"] / 1024, problem=problem)
+    SANDBOX_EXITS.inc(problem=problem, exit_reason=result["exit_reason"])
+    log_event(
+        "sandbox_usage",
+        level=logging.DEBUG,
+        problem_id=problem_id,
+        exit_reason=result["exit_reason"],
+        cpu_time_ms=result["cpu_time_ms"],
+        peak_memory_kb=result["peak_memory_kb"],
+        wall_time_ms=result["wall_time_ms"],
+    )
+
+
+def configure_logging(level: str = "INFO") -> None:
+    """Send structured lines to stderr (idempotent)."""
+    if logger.handlers:
+        return
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(level.upper())
+    logger.propagate = False
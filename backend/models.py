@@ -37,6 +37,7 @@ class InterviewPhase(str, Enum):
     CODING = "coding"
     EVALUATING = "evaluating"
     COMPLETED = "completed"
+    FAILED = "failed"
 
 
 # ── Core domain models ──────────────────────────────────────
@@ -55,6 +56,8 @@ class InterviewPlan(BaseModel):
     coding_expectations: str
     ai_policy: str
     question_topic_hint: str
+    # Catalog problem the plan was built around (its hidden tests run on "Run")
+    problem_id: Optional[int] = None
 
 
 class Message(BaseModel):
@@ -63,6 +66,32 @@ class Message(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
 
+class TestResult(BaseModel):
+    index: int
+    status: Literal["passed", "failed", "error", "timeout"]
+    elapsed_ms: float
+    error: Optional[str] = None
+
+
+class ProfilePoint(BaseModel):
+    n: int
+    time_ms: float
+    # None for sizes too slow to trace memory on
+    peak_kb: Optional[float] = None
+    repeats: int = 1
+
+
+class ComplexityProfile(BaseModel):
+    """Measured scaling of one piece of code over growing generated inputs."""
+    time_complexity: Optional[str] = None
+    space_complexity: Optional[str] = None
+    time_exponent: Optional[float] = None
+    points: list[ProfilePoint] = Field(default_factory=list)
+    stopped_early: bool = False
+    reason: Optional[str] = None
+    error: Optional[str] = None
+
+
 class CodeRun(BaseModel):
     code: str
     stdout: str = ""
@@ -71,6 +100,17 @@ class CodeRun(BaseModel):
     failed: int = 0
     total: int = 0
     timed_out: bool = False
+    tests: list[TestResult] = Field(default_factory=list)
+    # Kernel-measured resource usage of the sandbox run (None when nothing ran)
+    exit_reason: str = "ok"
+    cpu_time_ms: Optional[float] = None
+    peak_memory_kb: Optional[int] = None
+    wall_time_ms: Optional[float] = None
+    profile: Optional[ComplexityProfile] = None
+    # Recorded by "Analyze complexity" for code never run against the tests
+    profile_only: bool = False
+    # Session version that last recorded or changed this run (e.g. attached a profile)
+    version: int = 0
 
 
 class ScoreCategory(BaseModel):
@@ -87,6 +127,19 @@ class Scorecard(BaseModel):
     summary: str
 
 
+class PhaseScore(BaseModel):
+    """Rubric scores for one interview phase, produced in the background."""
+    phase: str
+    # Conversation / code-submission slices [start, end) this score covers
+    start: int
+    end: int
+    code_start: int = 0
+    code_end: int = 0
+    # Only the dimensions the phase gave evidence for
+    scores: dict[str, ScoreCategory] = Field(default_factory=dict)
+    notes: str = ""
+
+
 class SessionState(BaseModel):
     session_id: str
     config: InterviewConfig
@@ -96,6 +149,18 @@ class SessionState(BaseModel):
     phase: InterviewPhase = InterviewPhase.PLANNING
     scorecard: Optional[Scorecard] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    # Background bootstrap status: queued → planning → opening_question → ready
+    progress: str = "queued"
+    error: Optional[str] = None
+    # Rolling summary of older turns that no longer fit the interviewer's window
+    context_summary: str = ""
+    summarized_messages: int = 0
+    # Incremental evaluation: per-phase scores and where the next phase starts
+    partial_scores: list[PhaseScore] = Field(default_factory=list)
+    scoring_cursor: int = 0
+    code_scoring_cursor: int = 0
+    # Bumped on every save; clients sync deltas against it (see GET /{id}/sync)
+    version: int = 0
 
 
 # ── Request / Response schemas ───────────────────────────────
@@ -109,7 +174,46 @@ class StartSessionRequest(BaseModel):
 
 class StartSessionResponse(BaseModel):
     session_id: str
-    plan: InterviewPlan
+    phase: InterviewPhase
+    # None while the plan is still being generated in the background
+    plan: Optional[InterviewPlan] = None
+
+
+class SessionStatusResponse(BaseModel):
+    session_id: str
+    phase: InterviewPhase
+    progress: str
+    error: Optional[str] = None
+    plan: Optional[InterviewPlan] = None
+
+
+class CodeRunSummary(BaseModel):
+    """A code run without its source and output, for incremental sync."""
+    index: int
+    passed: int
+    failed: int
+    total: int
+    timed_out: bool
+    exit_reason: str
+    time_complexity: Optional[str] = None
+    profile_only: bool = False
+
+
+class SessionDelta(BaseModel):
+    """
+    What changed since the client's cursors; pass the cursors back on the next
+    sync (`version` as `version_after`). `code_runs` holds new runs plus older
+    ones changed since that version.
+    """
+    session_id: str
+    version: int
+    phase: InterviewPhase
+    progress: str
+    messages: list[Message] = Field(default_factory=list)
+    message_cursor: int
+    code_runs: list[CodeRunSummary] = Field(default_factory=list)
+    code_cursor: int
+    has_scorecard: bool = False
 
 
 class MessageRequest(BaseModel):
@@ -134,6 +238,20 @@ class CodeExecuteResponse(BaseModel):
     failed: int
     total: int
     timed_out: bool
+    tests: list[TestResult] = Field(default_factory=list)
+    # ok | error | timeout | output_limit | cpu_limit | memory_limit | signal | rejected
+    exit_reason: str = "ok"
+    cpu_time_ms: Optional[float] = None
+    peak_memory_kb: Optional[int] = None
+    wall_time_ms: Optional[float] = None
+    # True when served from the sandbox result cache
+    cached: bool = False
+
+
+class CodeProfileResponse(ComplexityProfile):
+    stdout: str = ""
+    stderr: str = ""
+    exit_reason: str = "ok"
 
 
 class EvaluateRequest(BaseModel):
@@ -142,3 +260,11 @@ class EvaluateRequest(BaseModel):
 
 class EvaluateResponse(BaseModel):
     scorecard: Scorecard
+
+
+class SocketRequest(BaseModel):
+    """A client message on the interview WebSocket; `id` is echoed on every reply to it."""
+    type: Literal["message", "execute", "profile", "evaluate", "ping"]
+    id: Optional[str] = None
+    message: str = ""
+    code: str = ""
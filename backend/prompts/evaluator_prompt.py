@@ -20,6 +20,7 @@ Score the candidate on each dimension using a 1–5 scale:
 2. **logical_correctness** — Is their solution logically correct? Does it handle edge cases?
 3. **code_quality** — Is the code clean, readable, well-structured?
 4. **optimization** — Are they aware of time/space complexity? Did they optimize?
+   Where a "Measured scaling" line is present, check their stated complexity against it.
 5. **communication** — Did they explain their thought process clearly?
 
 Scoring guide:
@@ -71,3 +72,59 @@ def build_evaluator_prompt(
         transcript=transcript,
         code_results=code_results,
     )
+
+
+PHASE_EVALUATOR_PROMPT = """\
+You are a senior interview evaluator at **{company}**.
+
+You are scoring ONE phase (**{phase}**) of an ongoing **{round_type}** interview for a
+**{level}** **{role}** candidate. Earlier and later phases are scored separately.
+
+── Transcript of this phase ──
+{transcript}
+
+── Code Execution Results in this phase ──
+{code_results}
+
+── Evaluation Instructions ──
+Score ONLY the dimensions this phase gives real evidence for, on a 1–5 scale
+(1 = Poor / Missing, 3 = Meets expectations, 5 = Exceptional). Omit the rest.
+
+- **problem_understanding** — clarifying questions, grasp of the problem
+- **logical_correctness** — correctness of the approach, handling of edge cases
+- **code_quality** — clean, readable, well-structured code
+- **optimization** — awareness of time/space complexity, optimizing (check claims
+  against any "Measured scaling" line)
+- **communication** — explaining their thought process clearly
+
+── Response Format ──
+You MUST respond with a valid JSON object:
+{{
+  "scores": {{
+    "<dimension>": {{ "score": <1-5>, "max": 5, "feedback": "<1 sentence>" }}
+  }},
+  "notes": "<1 sentence on how the candidate did in this phase>"
+}}
+
+Return ONLY the JSON object.
+"""
+
+
+def build_phase_evaluator_prompt(
+    company: str,
+    role: str,
+    level: str,
+    round_type: str,
+    phase: str,
+    transcript: str,
+    code_results: str,
+) -> str:
+    return PHASE_EVALUATOR_PROMPT.format(
+        company=company,
+        role=role,
+        level=level,
+        round_type=round_type,
+        phase=phase,
+        transcript=transcript,
+        code_results=code_results,
+    )
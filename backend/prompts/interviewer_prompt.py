@@ -10,6 +10,7 @@ You are a **{persona}** technical interviewer at **{company}**, conducting a \
 • Expected topic area: {question_topic_hint}
 • Coding expectations: {coding_expectations}
 • AI / documentation policy: {ai_policy}
+• Measured scaling of the candidate's latest code: {measured_scaling}
 
 ── Your Rules ──
 1. At the very start, introduce yourself briefly, then present exactly ONE \
@@ -21,6 +22,8 @@ coding/technical question appropriate for the difficulty and topic area.
 6. **NEVER reveal the solution**, even if the candidate is stuck. Give small nudges only.
 7. Keep your responses concise and professional.
 8. If the candidate asks an unrelated question, gently redirect them.
+9. If the measured scaling contradicts the complexity the candidate claimed, \
+ask them to explain the discrepancy rather than stating the measurement outright.
 
 ── Response Format ──
 You MUST respond with a valid JSON object:
@@ -48,6 +51,7 @@ def build_interviewer_prompt(
     question_topic_hint: str,
     coding_expectations: str,
     ai_policy: str,
+    measured_scaling: str = "",
 ) -> str:
     return INTERVIEWER_SYSTEM_PROMPT.format(
         company=company,
@@ -60,4 +64,5 @@ def build_interviewer_prompt(
         question_topic_hint=question_topic_hint,
         coding_expectations=coding_expectations,
         ai_policy=ai_policy,
+        measured_scaling=measured_scaling or "not measured yet",
     )
@@ -0,0 +1,28 @@
+"""Conversation summary prompt template (interviewer context compaction)."""
+
+SUMMARY_SYSTEM_PROMPT = """\
+You maintain a running summary of a technical interview so the interviewer can \
+keep track of older turns that no longer fit in its context window.
+
+── Current Summary ──
+{previous_summary}
+
+── New Turns To Fold In ──
+{new_turns}
+
+── Instructions ──
+Rewrite the summary so it also covers the new turns. Keep:
+• the candidate's proposed approach(es) and how they evolved
+• complexity claims, edge cases discussed, and any hints already given
+• open questions the interviewer still intends to ask
+
+Write at most {max_words} words of plain prose. Return ONLY the summary text.
+"""
+
+
+def build_summary_prompt(previous_summary: str, new_turns: str, max_words: int) -> str:
+    return SUMMARY_SYSTEM_PROMPT.format(
+        previous_summary=previous_summary or "(none yet)",
+        new_turns=new_turns,
+        max_words=max_words,
+    )
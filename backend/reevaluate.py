@@ -0,0 +1,257 @@
+"""
+Offline bulk re-evaluation of stored interviews.
+
+Re-scores past transcripts with the current evaluator prompt (via
+`evaluate_interview`), so prompt changes can be checked for calibration
+against the scorecards the sessions already have. Sessions are streamed from
+the SQLite session store or a JSONL export (one `SessionState` per line) and
+evaluated with bounded concurrency. Each result is appended to the output
+JSONL as soon as it is ready, which doubles as the checkpoint: rerunning
+with the same `--out` skips sessions already scored and retries failed ones.
+
+    python reevaluate.py --out data/rescored.jsonl --concurrency 8
+    python reevaluate.py --jsonl sessions.jsonl --out rescored.jsonl --limit 500 --report report.json
+
+Finishes with throughput and how the new score distribution differs from the
+previous scorecards (per-dimension means, total shift, verdict changes).
+An answer the evaluator can't turn into a valid scorecard is recorded as a
+failure (and retried on the next run), never as a placeholder scorecard;
+placeholder scorecards are also left out of the comparison.
+Exits non-zero if any session failed. The LLM response cache is bypassed, so
+every session is scored afresh.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Iterator
+
+import config
+from agents.evaluator import DIMENSIONS, EVALUATION_FAILED, evaluate_interview
+from agents.llm_client import close_client
+from metrics import configure_logging
+from models import InterviewPhase, SessionState
+from store.sqlite import SQLiteStore
+
+
+def _from_jsonl(path: str) -> Iterator[SessionState]:
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                yield SessionState.model_validate_json(line)
+
+
+def _sessions(args: argparse.Namespace) -> Iterator[SessionState]:
+    """Sessions worth re-scoring: ones the candidate spoke in (completed only, unless --all)."""
+    if args.jsonl:
+        source = _from_jsonl(args.jsonl)
+    else:
+        phase = None if args.all else InterviewPhase.COMPLETED.value
+        source = SQLiteStore(args.db).iter_sessions(phase)
+    for session in source:
+        if not args.all and session.phase != InterviewPhase.COMPLETED:
+            continue
+        if any(m.role == "user" for m in session.conversation):
+            yield session
+
+
+def _scored(scorecard: dict | None) -> bool:
+    """Whether a stored scorecard is a real evaluation, not the evaluator's failure placeholder."""
+    return bool(scorecard) and scorecard.get("overall") != EVALUATION_FAILED
+
+
+def _load_checkpoint(path: Path) -> dict[str, dict]:
+    """Successful rows already in the output file, by session_id."""
+    done = {}
+    if path.exists():
+        with path.open() as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # a line cut off by an interrupted run
+                if _scored(row.get("scorecard")):
+                    done[row["session_id"]] = row
+    return done
+
+
+async def _evaluate(session: SessionState) -> dict:
+    start = time.perf_counter()
+    row = {
+        "session_id": session.session_id,
+        "company": session.config.company,
+        "round_type": session.config.round_type.value,
+        "previous": session.scorecard.model_dump() if session.scorecard else None,
+    }
+    try:
+        scorecard = await evaluate_interview(
+            company=session.config.company,
+            role=session.config.role.value,
+            level=session.config.level.value,
+            round_type=session.config.round_type.value,
+            conversation=session.conversation,
+            code_submissions=session.code_submissions,
+            fallback=False,
+        )
+    except Exception as e:
+        row["error"] = f"{type(e).__name__}: {e}"
+    else:
+        row["scorecard"] = scorecard.model_dump()
+    row["elapsed_s"] = round(time.perf_counter() - start, 3)
+    return row
+
+
+async def run(args: argparse.Namespace) -> dict:
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    done = {} if args.fresh else _load_checkpoint(out)
+    if args.fresh and out.exists():
+        out.unlink()
+    print(f"Resuming: {len(done)} sessions already scored in {out}" if done else f"Writing to {out}")
+
+    queue: asyncio.Queue[SessionState | None] = asyncio.Queue(maxsize=args.concurrency * 2)
+    new_rows: list[dict] = []
+    start = time.perf_counter()
+
+    async def feed() -> None:
+        queued = 0
+        for session in _sessions(args):
+            if session.session_id in done:
+                continue
+            if args.limit and queued >= args.limit:
+                break
+            await queue.put(session)
+            queued += 1
+        for _ in range(args.concurrency):
+            await queue.put(None)
+
+    async def work(f) -> None:
+        while (session := await queue.get()) is not None:
+            row = await _evaluate(session)
+            f.write(json.dumps(row) + "\n")
+            f.flush()
+            new_rows.append(row)
+            if len(new_rows) % args.progress_every == 0:
+                rate = len(new_rows) / (time.perf_counter() - start)
+                print(f"  {len(new_rows)} scored ({rate:.2f}/s)", file=sys.stderr)
+
+    try:
+        with out.open("a") as f:
+            await asyncio.gather(feed(), *(work(f) for _ in range(args.concurrency)))
+    finally:
+        await close_client()
+
+    wall = time.perf_counter() - start
+    failed = [r for r in new_rows if "error" in r]
+    latencies = sorted(r["elapsed_s"] for r in new_rows)
+    report = {
+        "scored_this_run": len(new_rows) - len(failed),
+        "failed_this_run": len(failed),
+        "resumed": len(done),
+        "wall_s": round(wall, 2),
+        "throughput_per_s": round(len(new_rows) / wall, 3) if wall > 0 else None,
+        "latency_p50_s": latencies[len(latencies) // 2] if latencies else None,
+        "latency_p95_s": latencies[int(0.95 * (len(latencies) - 1))] if latencies else None,
+        "distribution": compare_scores(list(done.values()) + [r for r in new_rows if "scorecard" in r]),
+        "errors": [{"session_id": r["session_id"], "error": r["error"]} for r in failed[:20]],
+    }
+    return report
+
+
+def _mean(values: list[float]) -> float | None:
+    return round(statistics.fmean(values), 3) if values else None
+
+
+def compare_scores(rows: list[dict]) -> dict:
+    """New vs previous score distribution over rows that have both scorecards (failed evaluations excluded)."""
+    paired = [r for r in rows if _scored(r.get("previous")) and _scored(r.get("scorecard"))]
+    dimensions = {}
+    for dim in DIMENSIONS:
+        both = [r for r in paired if dim in r["previous"]["scores"] and dim in r["scorecard"]["scores"]]
+        old = [r["previous"]["scores"][dim]["score"] for r in both]
+        new = [r["scorecard"]["scores"][dim]["score"] for r in both]
+        dimensions[dim] = {
+            "previous_mean": _mean(old),
+            "new_mean": _mean(new),
+            "mean_shift": _mean([n - o for n, o in zip(new, old)]),
+        }
+
+    old_totals = [r["previous"]["total"] for r in paired]
+    new_totals = [r["scorecard"]["total"] for r in paired]
+    shifts = [n - o for n, o in zip(new_totals, old_totals)]
+    return {
+        "sessions": len(rows),
+        "compared": len(paired),
+        "dimensions": dimensions,
+        "total": {
+            "previous_mean": _mean(old_totals),
+            "new_mean": _mean(new_totals),
+            "mean_shift": _mean(shifts),
+            "mean_abs_shift": _mean([abs(s) for s in shifts]),
+            "previous_stdev": round(statistics.pstdev(old_totals), 3) if old_totals else None,
+            "new_stdev": round(statistics.pstdev(new_totals), 3) if new_totals else None,
+        },
+        "verdicts": {
+            "previous": dict(Counter(r["previous"]["overall"] for r in paired)),
+            "new": dict(Counter(r["scorecard"]["overall"] for r in paired)),
+            "changed": sum(r["previous"]["overall"] != r["scorecard"]["overall"] for r in paired),
+        },
+    }
+
+
+def print_report(report: dict) -> None:
+    print(
+        f"\nScored {report['scored_this_run']} sessions this run "
+        f"({report['failed_this_run']} failed, {report['resumed']} resumed) in {report['wall_s']}s "
+        f"— {report['throughput_per_s']} sessions/s, p50 {report['latency_p50_s']}s, p95 {report['latency_p95_s']}s"
+    )
+    dist = report["distribution"]
+    if not dist["compared"]:
+        print("No previous scorecards to compare against.")
+        return
+    print(f"\nScore distribution vs previous scorecards ({dist['compared']} sessions):")
+    print(f"  {'dimension':<24}{'previous':>10}{'new':>10}{'shift':>10}")
+    rows = [(dim, d) for dim, d in dist["dimensions"].items()] + [("total", dist["total"])]
+    for name, d in rows:
+        shift = f"{d['mean_shift']:+.3f}" if d["mean_shift"] is not None else "-"
+        print(f"  {name:<24}{d['previous_mean']!s:>10}{d['new_mean']!s:>10}{shift:>10}")
+    print(f"  mean |total shift|: {dist['total']['mean_abs_shift']}")
+    verdicts = dist["verdicts"]
+    for label in ("Strong Hire", "Hire", "Lean Hire", "No Hire"):
+        print(f"  {label:<24}{verdicts['previous'].get(label, 0):>10}{verdicts['new'].get(label, 0):>10}")
+    print(f"  verdict changed in {verdicts['changed']} / {dist['compared']} sessions")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--db", default=config.SESSION_DB_PATH, help="SQLite session store (default)")
+    source.add_argument("--jsonl", help="JSONL export with one SessionState per line")
+    parser.add_argument("--out", required=True, help="output JSONL; also the resume checkpoint")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--limit", type=int, default=0, help="score at most this many new sessions")
+    parser.add_argument("--all", action="store_true", help="include sessions that were never evaluated")
+    parser.add_argument("--fresh", action="store_true", help="discard the existing output instead of resuming")
+    parser.add_argument("--report", help="also write the report as JSON here")
+    parser.add_argument("--progress-every", type=int, default=25)
+    args = parser.parse_args()
+
+    configure_logging(config.LOG_LEVEL)
+    # Every run must re-ask the model: a cached scorecard would hide prompt changes and
+    # variance, and a bulk run would flood the server's response cache
+    config.LLM_CACHE_ENABLED = False
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.report:
+        Path(args.report).write_text(json.dumps(report, indent=2))
+    if report["failed_this_run"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
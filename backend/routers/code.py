@@ -2,30 +2,109 @@
 
 from fastapi import APIRouter, HTTPException
 
+import config
+from metrics import bind_session, record_sandbox_usage
 from models import (
     CodeExecuteRequest,
     CodeExecuteResponse,
+    CodeProfileResponse,
     CodeRun,
+    ComplexityProfile,
     InterviewPhase,
+    SessionState,
 )
-from state import get_session, save_session
-from sandbox.executor import execute_code
+from state import get_session, save_session, session_lock
+from agents.phase_scoring import on_phase_change
+from agents.problem_catalog import get_catalog
+from sandbox.pool import get_pool
+from sandbox.executor import precheck
+from sandbox.policy import check_code
+from sandbox.result_cache import get_result_cache, result_cache_key
+from sandbox.scheduler import SandboxBusy, get_scheduler
 
 router = APIRouter(prefix="/api/code", tags=["code"])
 
 
-@router.post("/execute", response_model=CodeExecuteResponse)
-async def run_code(req: CodeExecuteRequest):
-    """Execute user code in the sandbox and return results."""
-    session = get_session(req.session_id)
+def _runnable_session(session_id: str) -> SessionState:
+    """Load a session that can accept code runs, or raise the matching HTTP error."""
+    bind_session(session_id)
+    session = get_session(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
     if session.phase == InterviewPhase.COMPLETED:
         raise HTTPException(status_code=400, detail="Interview is already completed")
 
-    # Execute code (no hidden tests for MVP — user just runs their own code)
-    result = execute_code(code=req.code, test_cases=None)
+    if session.phase in (InterviewPhase.PLANNING, InterviewPhase.FAILED):
+        raise HTTPException(status_code=409, detail="Interview is not ready yet")
+    return session
+
+
+def _touch(session: SessionState, code_run: CodeRun) -> None:
+    """Stamp a run with the version the coming save gives the session, for incremental sync."""
+    code_run.version = session.version + 1
+
+
+def _record_run(session: SessionState, code_run: CodeRun) -> None:
+    """Log a submission, moving the interview into the coding phase if needed."""
+    _touch(session, code_run)
+    session.code_submissions.append(code_run)
+
+    # Update phase to coding if not already
+    if session.phase not in (InterviewPhase.CODING, InterviewPhase.EVALUATING, InterviewPhase.COMPLETED):
+        previous = session.phase
+        session.phase = InterviewPhase.CODING
+        # This run opens the coding phase; score the discussion before it
+        on_phase_change(session, previous, len(session.conversation), len(session.code_submissions) - 1)
+
+
+def _busy(e: SandboxBusy) -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail=f"{e} Retry in {e.retry_after}s.",
+        headers={"Retry-After": str(e.retry_after)},
+    )
+
+
+@router.post("/execute", response_model=CodeExecuteResponse)
+async def run_code(req: CodeExecuteRequest):
+    """Execute user code in the sandbox and return results."""
+    session = _runnable_session(req.session_id)
+
+    # Run the plan's hidden tests when its problem has a suite, else just run the code
+    problem = get_catalog().get(session.plan.problem_id) if session.plan.problem_id else None
+    test_cases = problem.get("tests") if problem else None
+    entry_point = problem.get("entry_point", "solution") if problem else "solution"
+
+    # Syntax errors and policy violations are answered in-process, without a sandbox
+    result = precheck(req.code)
+
+    # Identical deterministic runs are answered from the result cache
+    cache_key = None
+    if result is None and config.SANDBOX_CACHE_ENABLED:
+        if check_code(req.code).nondeterministic:
+            get_result_cache().record_bypass()
+        else:
+            cache_key = result_cache_key(req.code, test_cases, entry_point)
+            result = get_result_cache().get(cache_key)
+
+    # Otherwise execute code off the event loop
+    cached = result is not None and cache_key is not None
+    if result is None:
+        try:
+            result = await get_scheduler().run(
+                req.session_id,
+                req.code,
+                test_cases=test_cases,
+                entry_point=entry_point,
+            )
+        except SandboxBusy as e:
+            raise _busy(e)
+        # Timeouts and executor failures can depend on load, so only completed runs are reused
+        if cache_key and result["completed"]:
+            get_result_cache().put(cache_key, result)
+        if result["exit_reason"] != "rejected":
+            record_sandbox_usage(session.plan.problem_id, result)
 
     # Log the submission
     code_run = CodeRun(
@@ -36,13 +115,82 @@ async def run_code(req: CodeExecuteRequest):
         failed=result["failed"],
         total=result["total"],
         timed_out=result["timed_out"],
+        tests=result["tests"],
+        exit_reason=result["exit_reason"],
+        cpu_time_ms=result["cpu_time_ms"],
+        peak_memory_kb=result["peak_memory_kb"],
+        wall_time_ms=result["wall_time_ms"],
     )
-    session.code_submissions.append(code_run)
+    # The run itself needs no lock; recording it does (re-read: other turns may have landed)
+    async with session_lock(req.session_id):
+        session = _runnable_session(req.session_id)
+        _record_run(session, code_run)
+        save_session(session)
 
-    # Update phase to coding if not already
-    if session.phase not in (InterviewPhase.CODING, InterviewPhase.EVALUATING, InterviewPhase.COMPLETED):
-        session.phase = InterviewPhase.CODING
+    return CodeExecuteResponse(**result, cached=cached)
+
+
+@router.post("/profile", response_model=CodeProfileResponse)
+async def profile_code(req: CodeExecuteRequest):
+    """
+    Measure how the code scales on the problem's generated inputs and infer its
+    time / space complexity. The profile is attached to the matching code run
+    (recorded as a new one if this exact code wasn't run yet), so the
+    interviewer and evaluator can cite it.
+    """
+    session = _runnable_session(req.session_id)
+    problem = get_catalog().get(session.plan.problem_id) if session.plan.problem_id else None
+    if not problem or not problem.get("profile"):
+        raise HTTPException(status_code=400, detail="This problem has no inputs to profile against")
+
+    try:
+        result = await get_scheduler().profile(
+            req.session_id,
+            req.code,
+            problem["profile"],
+            entry_point=problem.get("entry_point", "solution"),
+        )
+    except SandboxBusy as e:
+        raise _busy(e)
+    if result["exit_reason"] != "rejected":
+        record_sandbox_usage(session.plan.problem_id, result)
+
+    profile = ComplexityProfile(**result)
+    async with session_lock(req.session_id):
+        session = _runnable_session(req.session_id)
+        run = next((r for r in reversed(session.code_submissions) if r.code == req.code), None)
+        if run is None:
+            run = CodeRun(
+                code=req.code,
+                stdout=result["stdout"],
+                stderr=result["stderr"],
+                timed_out=result["timed_out"],
+                exit_reason=result["exit_reason"],
+                profile=profile,
+                profile_only=True,
+            )
+            _record_run(session, run)
+        else:
+            run.profile = profile
+            _touch(session, run)
+        save_session(session)
+
+    return CodeProfileResponse(
+        **profile.model_dump(),
+        stdout=result["stdout"],
+        stderr=result["stderr"],
+        exit_reason=result["exit_reason"],
+    )
 
-    save_session(session)
 
-    return CodeExecuteResponse(**result)
+@router.get("/sandbox/stats")
+async def sandbox_stats():
+    """Sandbox sizing metrics: admission queue, result cache, pool size and per-run wall time."""
+    stats = {
+        "mode": config.SANDBOX_MODE,
+        "scheduler": get_scheduler().stats(),
+        "result_cache": get_result_cache().stats(),
+    }
+    if config.SANDBOX_MODE == "pool":
+        stats["pool"] = get_pool().stats()
+    return stats
@@ -1,7 +1,14 @@
 """Interview routes — chat messages and evaluation."""
 
+import json
+from typing import AsyncIterator
+
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+
+import config
 
+from metrics import bind_session
 from models import (
     InterviewPhase,
     Message,
@@ -9,79 +16,210 @@ from models import (
     MessageResponse,
     EvaluateRequest,
     EvaluateResponse,
+    SessionState,
 )
-from state import get_session, save_session
-from agents.interviewer import get_interviewer_reply
+from state import get_session, save_session, session_lock
+from store.base import SessionConflict
+from agents.context import compact_context, context_messages
+from agents.interviewer import get_interviewer_reply, stream_interviewer_reply
 from agents.evaluator import evaluate_interview
+from agents.phase_scoring import finalize_scorecard, on_phase_change, wait_for_phase_scoring
+from sandbox.complexity import describe
 
 router = APIRouter(prefix="/api/interview", tags=["interview"])
 
 
-@router.post("/message", response_model=MessageResponse)
-async def send_message(req: MessageRequest):
-    """Send a user message and get the interviewer's reply."""
-    session = get_session(req.session_id)
+def _get_active_session(session_id: str) -> SessionState:
+    """Look up a session that can still accept chat turns."""
+    bind_session(session_id)
+    session = get_session(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
     if session.phase == InterviewPhase.COMPLETED:
         raise HTTPException(status_code=400, detail="Interview is already completed")
 
-    # Append user message to conversation
-    session.conversation.append(Message(role="user", content=req.message))
+    _require_ready(session)
+    return session
+
+
+def _require_ready(session: SessionState) -> None:
+    """Reject sessions whose background bootstrap hasn't produced a plan."""
+    if session.phase == InterviewPhase.PLANNING:
+        raise HTTPException(status_code=409, detail="Interview is still being prepared")
+    if session.phase == InterviewPhase.FAILED:
+        raise HTTPException(status_code=409, detail=session.error or "Interview setup failed")
+
+
+async def _interviewer_kwargs(session: SessionState) -> dict:
+    """
+    Common interviewer arguments derived from the session config and plan.
+
+    Older turns are folded into the session's rolling summary first, so the
+    prompt stays within the context budget however long the interview runs.
+    """
+    await compact_context(session)
+    plan = session.plan
+    return dict(
+        company=session.config.company,
+        role=session.config.role.value,
+        level=session.config.level.value,
+        round_type=session.config.round_type.value,
+        persona=plan.persona,
+        duration_minutes=plan.duration_minutes,
+        difficulty=plan.difficulty,
+        question_topic_hint=plan.question_topic_hint,
+        coding_expectations=plan.coding_expectations,
+        ai_policy=plan.ai_policy,
+        conversation=context_messages(session),
+        context_summary=session.context_summary,
+        measured_scaling=_latest_scaling(session),
+    )
+
+
+def _latest_scaling(session: SessionState) -> str:
+    """Profiler summary for the most recently profiled code, if any."""
+    profiled = [run for run in session.code_submissions if run.profile is not None]
+    return describe(profiled[-1].profile.model_dump()) if profiled else ""
+
+
+def _sse(event: str, data: dict) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
 
-    # Get interviewer reply
-    try:
-        plan = session.plan
-        result = await get_interviewer_reply(
-            company=session.config.company,
-            role=session.config.role.value,
-            level=session.config.level.value,
-            round_type=session.config.round_type.value,
-            persona=plan.persona,
-            duration_minutes=plan.duration_minutes,
-            difficulty=plan.difficulty,
-            question_topic_hint=plan.question_topic_hint,
-            coding_expectations=plan.coding_expectations,
-            ai_policy=plan.ai_policy,
-            conversation=session.conversation,
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Interviewer error: {e}")
-
-    # Append assistant reply
-    session.conversation.append(Message(role="assistant", content=result["reply"]))
-    session.phase = InterviewPhase(result.get("phase", session.phase.value))
-
-    save_session(session)
+
+@router.post("/message", response_model=MessageResponse)
+async def send_message(req: MessageRequest):
+    """Send a user message and get the interviewer's reply."""
+    async with session_lock(req.session_id):
+        session = _get_active_session(req.session_id)
+
+        # Append user message to conversation
+        session.conversation.append(Message(role="user", content=req.message))
+
+        # Get interviewer reply
+        try:
+            result = await get_interviewer_reply(**await _interviewer_kwargs(session))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Interviewer error: {e}")
+
+        # Append assistant reply
+        previous = session.phase
+        session.conversation.append(Message(role="assistant", content=result["reply"]))
+        session.phase = InterviewPhase(result.get("phase", session.phase.value))
+        # The new reply opens the next phase; score the finished one in the background
+        on_phase_change(session, previous, len(session.conversation) - 1, len(session.code_submissions))
+
+        save_session(session)
 
     return MessageResponse(reply=result["reply"], phase=result["phase"])
 
 
+async def reply_events(session_id: str, message: str) -> AsyncIterator[dict]:
+    """
+    Record a user message and stream the interviewer's reply as event dicts.
+
+    Yields `token` ({"text"}) while the reply is generated, `phase` ({"phase"})
+    once it is known, then `done` ({"reply", "phase"}) or `error` ({"status",
+    "detail"}). The whole turn runs under the session lock. Shared by the SSE
+    route and the WebSocket channel.
+    """
+    try:
+        async with session_lock(session_id):
+            try:
+                session = _get_active_session(session_id)
+            except HTTPException as e:
+                yield {"type": "error", "status": e.status_code, "detail": e.detail}
+                return
+
+            session.conversation.append(Message(role="user", content=message))
+            save_session(session)
+
+            try:
+                async for event in stream_interviewer_reply(**await _interviewer_kwargs(session)):
+                    if event["type"] == "done":
+                        result = event
+                    else:
+                        yield event
+            except Exception as e:
+                yield {"type": "error", "status": 500, "detail": f"Interviewer error: {e}"}
+                return
+
+            # Persist the finished reply once the stream is complete
+            previous = session.phase
+            session.conversation.append(Message(role="assistant", content=result["reply"]))
+            try:
+                session.phase = InterviewPhase(result["phase"])
+            except ValueError:
+                pass
+            on_phase_change(session, previous, len(session.conversation) - 1, len(session.code_submissions))
+            save_session(session)
+    except SessionConflict as e:
+        yield {"type": "error", "status": 409, "detail": str(e)}
+        return
+
+    yield {"type": "done", "reply": result["reply"], "phase": session.phase.value}
+
+
+@router.post("/message/stream")
+async def stream_message(req: MessageRequest):
+    """Send a user message and stream the interviewer's reply as Server-Sent Events (see `reply_events`)."""
+    # Fail fast with a proper status; reply_events re-checks under the lock
+    _get_active_session(req.session_id)
+
+    async def event_stream():
+        bind_session(req.session_id)
+        async for event in reply_events(req.session_id, req.message):
+            yield _sse(event["type"], {k: v for k, v in event.items() if k != "type"})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/evaluate", response_model=EvaluateResponse)
 async def evaluate(req: EvaluateRequest):
     """Trigger end-of-interview evaluation and return scorecard."""
+    bind_session(req.session_id)
     session = get_session(req.session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
-
-    session.phase = InterviewPhase.EVALUATING
-    save_session(session)
-
-    try:
-        scorecard = await evaluate_interview(
-            company=session.config.company,
-            role=session.config.role.value,
-            level=session.config.level.value,
-            round_type=session.config.round_type.value,
-            conversation=session.conversation,
-            code_submissions=session.code_submissions,
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Evaluation error: {e}")
-
-    session.scorecard = scorecard
-    session.phase = InterviewPhase.COMPLETED
-    save_session(session)
+    _require_ready(session)
+
+    # Let background phase scoring record its results first (it needs the lock)
+    if config.INCREMENTAL_EVAL:
+        await wait_for_phase_scoring(req.session_id)
+
+    async with session_lock(req.session_id):
+        session = get_session(req.session_id)
+        # A repeated request (double-click, retry) gets the scorecard already made
+        if session.phase == InterviewPhase.COMPLETED and session.scorecard is not None:
+            return EvaluateResponse(scorecard=session.scorecard)
+
+        final_phase = session.phase
+        session.phase = InterviewPhase.EVALUATING
+        save_session(session)
+
+        try:
+            if config.INCREMENTAL_EVAL:
+                # Phases were scored as the interview went; only the tail is left
+                scorecard = await finalize_scorecard(session, final_phase)
+            else:
+                scorecard = await evaluate_interview(
+                    company=session.config.company,
+                    role=session.config.role.value,
+                    level=session.config.level.value,
+                    round_type=session.config.round_type.value,
+                    conversation=session.conversation,
+                    code_submissions=session.code_submissions,
+                )
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Evaluation error: {e}")
+
+        session.scorecard = scorecard
+        session.phase = InterviewPhase.COMPLETED
+        save_session(session)
 
     return EvaluateResponse(scorecard=scorecard)
@@ -0,0 +1,81 @@
+"""Metrics route — Prometheus scrape endpoint."""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+import config
+import metrics
+from agents.llm_cache import get_llm_cache
+from agents.llm_policy import policy_stats
+from agents.plan_cache import get_plan_cache
+from sandbox.pool import get_pool
+from sandbox.result_cache import get_result_cache
+from sandbox.scheduler import get_scheduler
+from routers.ws import connection_count
+from state import store_stats
+
+router = APIRouter(tags=["metrics"])
+
+
+def _numeric(stats: dict, *keys: str) -> dict:
+    """Pick numeric stats as {(("stat", key),): value} gauge samples."""
+    return {(("stat", k),): stats.get(k) for k in keys}
+
+
+# ── Gauges sampled at scrape time ───────────────────────────
+metrics.gauge(
+    "mock_interview_sandbox_scheduler",
+    "Sandbox admission control: running / queued jobs and lifetime totals.",
+    lambda: _numeric(get_scheduler().stats(), "running", "queued", "completed", "rejected"),
+)
+metrics.gauge(
+    "mock_interview_sandbox_pool",
+    "Pre-forked sandbox workers (pool mode only).",
+    lambda: _numeric(get_pool().stats(), "pool_size", "busy", "idle", "queue_depth", "runs", "failures")
+    if config.SANDBOX_MODE == "pool" else {},
+)
+metrics.gauge(
+    "mock_interview_sandbox_result_cache",
+    "Sandbox result cache size and hit / miss / bypass totals.",
+    lambda: _numeric(get_result_cache().stats(), "entries", "bytes", "hits", "misses", "bypassed", "evictions"),
+)
+metrics.gauge(
+    "mock_interview_session_store",
+    "Session store residency and flush activity.",
+    lambda: _numeric(
+        store_stats(), "resident_sessions", "resident_bytes_approx", "dirty_sessions",
+        "stored_sessions", "lazy_loads", "evictions", "flushes",
+    ),
+)
+metrics.gauge(
+    "mock_interview_plan_cache",
+    "Plan cache occupancy and hit/miss totals.",
+    lambda: _numeric(get_plan_cache().stats(), "keys", "plans", "hits", "misses"),
+)
+metrics.gauge(
+    "mock_interview_llm_cache",
+    "LLM response cache occupancy (memory / SQLite) and lifetime totals.",
+    lambda: _numeric(get_llm_cache().stats(), "entries", "stored_entries", "hits", "disk_hits", "misses", "stores"),
+)
+
+metrics.gauge(
+    "mock_interview_llm_circuit_open",
+    "1 while a model's circuit breaker is open (calls skip to the fallback models).",
+    lambda: {(("model", m),): int(c["open"]) for m, c in policy_stats()["circuits"].items()},
+)
+metrics.gauge(
+    "mock_interview_llm_hedge_delay_seconds",
+    "Current hedge threshold per call site (observed p95 attempt latency).",
+    lambda: {(("site", s),): d for s, d in policy_stats()["hedge_delays"].items()},
+)
+metrics.gauge(
+    "mock_interview_ws_connections",
+    "Open interview WebSocket connections.",
+    connection_count,
+)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def scrape():
+    """All counters, histograms and gauges in Prometheus text format."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
@@ -1,29 +1,70 @@
 """Session routes — create and retrieve interview sessions."""
 
+import asyncio
+import json
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 
+import config
+from metrics import bind_session, log_event
 from models import (
+    CodeRunSummary,
     InterviewConfig,
     InterviewPhase,
     Message,
+    SessionDelta,
     SessionState,
     StartSessionRequest,
+    SessionStatusResponse,
     StartSessionResponse,
 )
-from state import save_session, get_session
+from state import save_session, get_session, iter_sessions, store_stats
+from store.base import SessionConflict
+from agents.plan_cache import get_plan_cache
 from agents.planner import generate_plan
 from agents.interviewer import get_interviewer_reply
 
 router = APIRouter(prefix="/api/session", tags=["session"])
 
 
-@router.post("/start", response_model=StartSessionResponse)
-async def start_session(req: StartSessionRequest):
-    """Create a new interview session, generate a plan, get first question."""
+# Background bootstrap tasks (kept referenced so they aren't garbage-collected)
+_bootstraps: dict[str, asyncio.Task] = {}
+# Per-session "something changed" signals for the events stream
+_updates: dict[str, asyncio.Event] = {}
+
+def _publish(session: SessionState, progress: str) -> None:
+    """Persist a bootstrap step and wake up anyone streaming its events."""
+    session.progress = progress
+    save_session(session)
+    event = _updates.pop(session.session_id, None)
+    if event is not None:
+        event.set()
+
+
+async def _bootstrap(session: SessionState) -> None:
+    """Generate the plan and the opening question, recording progress on the session."""
+    try:
+        await asyncio.wait_for(_run_bootstrap(session), config.SESSION_BOOTSTRAP_TIMEOUT)
+    except asyncio.TimeoutError:
+        session.phase = InterviewPhase.FAILED
+        session.error = f"Interview setup took longer than {config.SESSION_BOOTSTRAP_TIMEOUT:g} seconds"
+        _publish(session, "failed")
+    except asyncio.CancelledError:
+        # Don't leave the session stuck in "planning" across a restart
+        session.phase = InterviewPhase.FAILED
+        session.error = "Interview setup was interrupted by a server shutdown"
+        _publish(session, "failed")
+        raise
+
+
+async def _run_bootstrap(session: SessionState) -> None:
+    req = session.config
+
     # Generate interview plan
+    _publish(session, "planning")
     try:
         plan = await generate_plan(
             company=req.company,
@@ -32,24 +73,13 @@ async def start_session(req: StartSessionRequest):
             round_type=req.round_type.value,
         )
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to generate plan: {e}")
+        session.phase = InterviewPhase.FAILED
+        session.error = f"Failed to generate plan: {e}"
+        _publish(session, "failed")
+        return
 
-    # Create session
-    session_id = str(uuid.uuid4())
-    config = InterviewConfig(
-        company=req.company,
-        role=req.role,
-        level=req.level,
-        round_type=req.round_type,
-    )
-
-    session = SessionState(
-        session_id=session_id,
-        config=config,
-        plan=plan,
-        phase=InterviewPhase.QUESTION,
-        created_at=datetime.utcnow(),
-    )
+    session.plan = plan
+    _publish(session, "opening_question")
 
     # Get the interviewer's first message (question)
     try:
@@ -73,17 +103,107 @@ async def start_session(req: StartSessionRequest):
         )
         session.phase = InterviewPhase(result.get("phase", "question"))
     except Exception as e:
-        # Even if the first message fails, still return the session with the plan
+        # Even if the first message fails, the session is still usable with the plan
         session.conversation.append(
             Message(
                 role="assistant",
                 content="Hello! I'll be your interviewer today. Let me prepare your question...",
             )
         )
+        session.phase = InterviewPhase.QUESTION
+
+    _publish(session, "ready")
+
+
+@router.post("/start", response_model=StartSessionResponse)
+async def start_session(req: StartSessionRequest):
+    """
+    Create a new interview session and return immediately.
+
+    Planning and the opening question run in a background task; follow them
+    via GET /{session_id}/status or the GET /{session_id}/events stream.
+    """
+    session_id = str(uuid.uuid4())
+    bind_session(session_id)
 
+    interview_config = InterviewConfig(
+        company=req.company,
+        role=req.role,
+        level=req.level,
+        round_type=req.round_type,
+    )
+    session = SessionState(
+        session_id=session_id,
+        config=interview_config,
+        phase=InterviewPhase.PLANNING,
+        created_at=datetime.utcnow(),
+    )
     save_session(session)
 
-    return StartSessionResponse(session_id=session_id, plan=plan)
+    task = asyncio.create_task(_bootstrap(session))
+    _bootstraps[session_id] = task
+    task.add_done_callback(lambda _: _bootstraps.pop(session_id, None))
+
+    return StartSessionResponse(session_id=session_id, phase=session.phase)
+
+
+def recover_bootstraps() -> None:
+    """
+    Fail sessions left in "planning" by a process that died mid-bootstrap
+    (called on startup; a clean shutdown fails them in `_bootstrap`).
+
+    With the "shared" store other workers may still be preparing sessions, so
+    only those older than SESSION_BOOTSTRAP_TIMEOUT, which no live bootstrap
+    outlasts, are failed there.
+    """
+    cutoff = datetime.utcnow()
+    if config.SESSION_STORE == "shared":
+        cutoff -= timedelta(seconds=config.SESSION_BOOTSTRAP_TIMEOUT)
+    stranded = [
+        s for s in iter_sessions(InterviewPhase.PLANNING.value)
+        if s.created_at < cutoff and s.session_id not in _bootstraps
+    ]
+    recovered = 0
+    for session in stranded:
+        session.phase = InterviewPhase.FAILED
+        session.error = "Interview setup was interrupted by a server restart; please start a new session"
+        try:
+            _publish(session, "failed")
+        except SessionConflict:
+            continue  # changed since we read it, so someone is still working on it
+        recovered += 1
+    if recovered:
+        log_event("bootstraps_recovered", sessions=recovered)
+
+
+async def cancel_bootstraps() -> None:
+    """Cancel in-flight bootstraps on shutdown."""
+    tasks = list(_bootstraps.values())
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _status(session: SessionState) -> SessionStatusResponse:
+    return SessionStatusResponse(
+        session_id=session.session_id,
+        phase=session.phase,
+        progress=session.progress,
+        error=session.error,
+        plan=session.plan,
+    )
+
+
+@router.get("/plan-cache/stats")
+async def plan_cache_stats():
+    """Plan cache occupancy and hit rate."""
+    return get_plan_cache().stats()
+
+
+@router.get("/store/stats")
+async def session_store_stats():
+    """Resident session count, approximate bytes and backend metrics."""
+    return store_stats()
 
 
 @router.get("/{session_id}")
@@ -93,3 +213,125 @@ async def get_session_state(session_id: str):
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     return session
+
+
+@router.get("/{session_id}/sync", response_model=SessionDelta)
+async def sync_session(
+    session_id: str,
+    request: Request,
+    response: Response,
+    messages_after: int = 0,
+    code_after: int = 0,
+    version_after: int | None = None,
+):
+    """
+    Incremental sync: only the messages and code runs after the client's cursors.
+
+    Conversation and submissions are append-only, so a cursor is just a count.
+    A run can still change after it was sent (a profile attached later), so
+    runs before `code_after` are resent if they changed after `version_after`,
+    the session version of the client's last sync (if omitted, only new runs
+    are sent). The ETag names the state the client reaches after applying
+    this delta; a client already there (matching If-None-Match, cursors at
+    the end, nothing changed) gets an empty 304, so idle polls cost almost
+    nothing.
+    """
+    session = get_session(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    message_count = len(session.conversation)
+    code_count = len(session.code_submissions)
+    messages_after = min(max(messages_after, 0), message_count)
+    code_after = min(max(code_after, 0), code_count)
+    etag = f'W/"{session.version}-{message_count}-{code_count}"'
+    changed = [
+        (i, run) for i, run in enumerate(session.code_submissions)
+        if i >= code_after or (version_after is not None and run.version > version_after)
+    ]
+    caught_up = messages_after == message_count and not changed
+    if caught_up and request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
+    return SessionDelta(
+        session_id=session.session_id,
+        version=session.version,
+        phase=session.phase,
+        progress=session.progress,
+        messages=session.conversation[messages_after:],
+        message_cursor=message_count,
+        code_runs=[
+            CodeRunSummary(
+                index=i,
+                passed=run.passed,
+                failed=run.failed,
+                total=run.total,
+                timed_out=run.timed_out,
+                exit_reason=run.exit_reason,
+                time_complexity=run.profile.time_complexity if run.profile else None,
+                profile_only=run.profile_only,
+            )
+            for i, run in changed
+        ],
+        code_cursor=code_count,
+        has_scorecard=session.scorecard is not None,
+    )
+
+
+@router.get("/{session_id}/status", response_model=SessionStatusResponse)
+async def get_session_status(session_id: str):
+    """Bootstrap progress: phase, current step, error and (once ready) the plan."""
+    session = get_session(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return _status(session)
+
+
+@router.get("/{session_id}/events")
+async def stream_session_events(session_id: str):
+    """
+    Stream bootstrap progress as Server-Sent Events.
+
+    Emits `progress` ({"progress"}) for each step, then a final `ready` or
+    `failed` event carrying the full status, and closes.
+    """
+    if not get_session(session_id):
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    # Other workers' bootstrap updates don't wake this one; poll the shared store instead
+    wait = 0.5 if config.SESSION_STORE == "shared" else 15
+
+    async def event_stream():
+        last = None
+        idle = 0.0
+        while True:
+            # Register before reading so an update between the two isn't missed
+            updated = _updates.setdefault(session_id, asyncio.Event())
+            session = get_session(session_id)
+            if session is None:
+                return
+            if session.progress in ("ready", "failed"):
+                done = _updates.pop(session_id, None)
+                if done is not None:
+                    done.set()  # release any other subscriber right away
+                status = _status(session)
+                yield f"event: {session.progress}\ndata: {status.model_dump_json()}\n\n"
+                return
+            if session.progress != last:
+                last = session.progress
+                yield f"event: progress\ndata: {json.dumps({'progress': last})}\n\n"
+            try:
+                await asyncio.wait_for(updated.wait(), timeout=wait)
+                idle = 0.0
+            except asyncio.TimeoutError:
+                idle += wait
+                if idle >= 15:
+                    idle = 0.0
+                    yield ": keep-alive\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
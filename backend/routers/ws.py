@@ -0,0 +1,162 @@
+"""
+Interview WebSocket — one persistent channel per session for chat, code and evaluation.
+
+Client → server messages (`SocketRequest`), handled in order:
+
+    {"type": "message", "message": str}     chat turn
+    {"type": "execute", "code": str}        run code against the hidden tests
+    {"type": "profile", "code": str}        measure how the code scales
+    {"type": "evaluate"}                    end the interview
+    {"type": "ping"}
+
+Any request may carry an "id", which is echoed on every reply to it.
+Server → client messages:
+
+    hello           {"session_id", "phase", "progress", "version"}, on connect
+    token, phase    streamed reply text and the reply's phase
+    done            {"reply", "phase"}, chat turn finished
+    code_result     CodeExecuteResponse fields
+    profile_result  CodeProfileResponse fields
+    evaluated       {"scorecard"}
+    error           {"status", "detail", "retry_after"}
+    pong
+
+Requests are served by the HTTP routes' own functions, so validation, status
+codes and persistence match the REST API. Phase changes and evaluation
+results are also pushed to the session's other sockets (e.g. a second tab).
+"""
+
+import json
+import logging
+import time
+from typing import AsyncIterator
+
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+from pydantic import ValidationError
+
+from metrics import WS_SECONDS, bind_session, log_event
+from models import CodeExecuteRequest, EvaluateRequest, SocketRequest
+from routers.code import profile_code, run_code
+from routers.interview import evaluate, reply_events
+from state import get_session
+from store.base import SessionConflict
+
+router = APIRouter(tags=["websocket"])
+
+# Open sockets per session, for pushing state changes to every client
+_connections: dict[str, set[WebSocket]] = {}
+
+
+def connection_count() -> int:
+    return sum(len(sockets) for sockets in _connections.values())
+
+
+async def _handle(session_id: str, req: SocketRequest) -> AsyncIterator[dict]:
+    """Serve one request, yielding the messages to send back."""
+    if req.type == "ping":
+        yield {"type": "pong"}
+    elif req.type == "message":
+        async for event in reply_events(session_id, req.message):
+            yield event
+    elif req.type == "execute":
+        result = await run_code(CodeExecuteRequest(session_id=session_id, code=req.code))
+        yield {"type": "code_result", **result.model_dump(mode="json")}
+    elif req.type == "profile":
+        result = await profile_code(CodeExecuteRequest(session_id=session_id, code=req.code))
+        yield {"type": "profile_result", **result.model_dump(mode="json")}
+    elif req.type == "evaluate":
+        result = await evaluate(EvaluateRequest(session_id=session_id))
+        yield {"type": "evaluated", **result.model_dump(mode="json")}
+
+
+def _error(status: int, detail: str, retry_after: str | None = None) -> dict:
+    return {"type": "error", "status": status, "detail": detail, "retry_after": retry_after}
+
+
+async def _broadcast(session_id: str, sender: WebSocket, message: dict) -> None:
+    """Push a message to the session's other sockets, dropping any that fail."""
+    for peer in list(_connections.get(session_id, ())):
+        if peer is sender:
+            continue
+        try:
+            await peer.send_json(message)
+        except Exception:
+            _connections.get(session_id, set()).discard(peer)
+
+
+async def _serve(websocket: WebSocket, session_id: str, raw: str) -> None:
+    """Parse, dispatch and answer one client message."""
+    try:
+        req = SocketRequest.model_validate(json.loads(raw))
+    except (ValueError, ValidationError) as e:
+        await websocket.send_json(_error(422, f"Invalid message: {e}"))
+        return
+
+    session = get_session(session_id)
+    phase_before = session.phase if session else None
+    start = time.perf_counter()
+    status = "ok"
+    try:
+        async for message in _handle(session_id, req):
+            if message["type"] == "error":
+                status = "error"
+            await websocket.send_json({**message, "id": req.id})
+            if message["type"] == "evaluated":
+                await _broadcast(session_id, websocket, message)
+    except HTTPException as e:
+        status = str(e.status_code)
+        retry_after = (e.headers or {}).get("Retry-After")
+        await websocket.send_json({**_error(e.status_code, e.detail, retry_after), "id": req.id})
+    except SessionConflict as e:
+        status = "409"
+        await websocket.send_json({**_error(409, str(e), "1"), "id": req.id})
+    except ValidationError as e:
+        status = "422"
+        await websocket.send_json({**_error(422, str(e)), "id": req.id})
+    except WebSocketDisconnect:
+        status = "disconnected"
+        raise
+    except Exception as e:
+        status = "500"
+        log_event("ws_request_failed", level=logging.WARNING, type=req.type, error=repr(e))
+        await websocket.send_json({**_error(500, f"{type(e).__name__}: {e}"), "id": req.id})
+    finally:
+        WS_SECONDS.observe(time.perf_counter() - start, type=req.type, status=status)
+
+    session = get_session(session_id)
+    if session and session.phase != phase_before:
+        await _broadcast(session_id, websocket, {"type": "phase", "phase": session.phase.value})
+
+
+@router.websocket("/api/ws/{session_id}")
+async def interview_socket(websocket: WebSocket, session_id: str):
+    """Persistent interview channel; see the module docstring for the message protocol."""
+    bind_session(session_id)
+    session = get_session(session_id)
+    if not session:
+        await websocket.close(code=4404, reason="Session not found")
+        return
+
+    await websocket.accept()
+    _connections.setdefault(session_id, set()).add(websocket)
+    try:
+        await websocket.send_json({
+            "type": "hello",
+            "session_id": session_id,
+            "phase": session.phase.value,
+            "progress": session.progress,
+            "version": session.version,
+        })
+        while True:
+            await _serve(websocket, session_id, await websocket.receive_text())
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        # The client went away mid-send, or the socket broke
+        log_event("ws_closed", level=logging.DEBUG, error=repr(e))
+    finally:
+        sockets = _connections.get(session_id)
+        if sockets is not None:
+            sockets.discard(websocket)
+            if not sockets:
+                _connections.pop(session_id, None)
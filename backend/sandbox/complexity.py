@@ -0,0 +1,99 @@
+"""
+Growth-curve fitting for complexity profiler measurements.
+
+Each candidate class f(n) is fitted as y ≈ a + c·f(n) (c ≥ 0) by least
+squares weighted by 1/y², i.e. minimising relative error, since
+measurements span orders of magnitude. The class with the lowest error wins;
+a simpler class is preferred when it fits almost as well, so noise on a
+linear solution doesn't get reported as n log n. The log-log slope is
+reported alongside as a model-free cross-check.
+"""
+
+import math
+from typing import Callable
+
+# Ordered simplest first
+CLASSES: list[tuple[str, Callable[[int], float]]] = [
+    ("O(1)", lambda n: 1.0),
+    ("O(log n)", lambda n: math.log2(n)),
+    ("O(n)", lambda n: float(n)),
+    ("O(n log n)", lambda n: n * math.log2(n)),
+    ("O(n^2)", lambda n: float(n) ** 2),
+    ("O(n^3)", lambda n: float(n) ** 3),
+]
+
+# A simpler class wins if its error is within this factor (plus slack) of the best
+SIMPLER_TOLERANCE = 1.15
+SIMPLER_SLACK = 0.02
+MIN_POINTS = 3
+
+
+def _fit(xs: list[float], ys: list[float], floor: float) -> float:
+    """Relative RMS error of the best weighted fit y ≈ a + c·x with c ≥ 0."""
+    ws = [1 / max(y, floor) ** 2 for y in ys]
+    total = sum(ws)
+    mx = sum(w * x for w, x in zip(ws, xs)) / total
+    my = sum(w * y for w, y in zip(ws, ys)) / total
+    var = sum(w * (x - mx) ** 2 for w, x in zip(ws, xs))
+    c = sum(w * (x - mx) * (y - my) for w, x, y in zip(ws, xs, ys)) / var if var > 0 else 0.0
+    c = max(c, 0.0)
+    a = my - c * mx
+    return math.sqrt(sum(w * (y - a - c * x) ** 2 for w, x, y in zip(ws, xs, ys)) / len(ys))
+
+
+def classify(ns: list[int], ys: list[float], floor: float) -> tuple[str | None, dict[str, float]]:
+    """Return (best-fitting class, {class: relative error}); None with too few points."""
+    if len(ns) < MIN_POINTS:
+        return None, {}
+    errors = {name: round(_fit([f(n) for n in ns], ys, floor), 4) for name, f in CLASSES}
+    cutoff = min(errors.values()) * SIMPLER_TOLERANCE + SIMPLER_SLACK
+    return next(name for name, _ in CLASSES if errors[name] <= cutoff), errors
+
+
+def loglog_slope(ns: list[int], ys: list[float], floor: float) -> float | None:
+    """Slope of log(y) against log(n) — ~1 for linear, ~2 for quadratic growth."""
+    if len(ns) < 2:
+        return None
+    lx = [math.log(n) for n in ns]
+    ly = [math.log(max(y, floor)) for y in ys]
+    mx, my = sum(lx) / len(lx), sum(ly) / len(ly)
+    var = sum((x - mx) ** 2 for x in lx)
+    if var == 0:
+        return None
+    return round(sum((x - mx) * (y - my) for x, y in zip(lx, ly)) / var, 2)
+
+
+def analyze(points: list[dict]) -> dict:
+    """
+    Infer time and space complexity from profiler points ({"n", "time_ms", "peak_kb"}).
+    Space is fitted on the points whose memory was traced (peak_kb not None).
+    """
+    ns = [p["n"] for p in points]
+    times = [p["time_ms"] for p in points]
+    traced = [p for p in points if p.get("peak_kb") is not None]
+    time_class, time_errors = classify(ns, times, floor=1e-3)
+    space_class, _ = classify([p["n"] for p in traced], [p["peak_kb"] for p in traced], floor=1.0)
+    return {
+        "time_complexity": time_class,
+        "space_complexity": space_class,
+        "time_exponent": loglog_slope(ns, times, floor=1e-3),
+        "fit_errors": time_errors,
+    }
+
+
+def describe(profile: dict) -> str:
+    """One-line summary of a profile, for the interviewer and evaluator prompts."""
+    points = profile.get("points") or []
+    if profile.get("error") or not points:
+        return f"not measured ({profile.get('error') or profile.get('reason') or 'no size completed'})"
+    first, last = points[0], points[-1]
+    slope = profile.get("time_exponent")
+    parts = [
+        f"time ~{profile.get('time_complexity') or 'unclear'}"
+        + (f" (log-log slope {slope})" if slope is not None else ""),
+        f"extra memory ~{profile.get('space_complexity') or 'unclear'}",
+        f"n={first['n']}..{last['n']} took {first['time_ms']:.2f} → {last['time_ms']:.2f} ms",
+    ]
+    if profile.get("stopped_early"):
+        parts.append(f"stopped early: {profile.get('reason')}")
+    return "; ".join(parts)
@@ -1,145 +1,391 @@
 """Subprocess-based Python code sandbox with safety limits."""
 
+import hmac
+import json
+import os
+import secrets
+import signal
 import subprocess
-import re
+import time
+from pathlib import Path
+
 import config
+from metrics import observe_stage
+from . import limits
+from .complexity import analyze
+from .harness import SIG_BYTES, signature
+from .policy import check_code
+from .pool import get_pool
+
+_HARNESS_PATH = Path(__file__).resolve().parent / "harness.py"
+_PROFILER_PATH = Path(__file__).resolve().parent / "profiler.py"
+_LIMITS_PATH = Path(__file__).resolve().parent / "limits.py"
+
+
+def _limits() -> dict:
+    """Per-run rlimits and output cap, as understood by `sandbox.limits`."""
+    return {
+        "memory_mb": config.SANDBOX_MEMORY_MB,
+        "cpu_seconds": config.SANDBOX_CPU_SECONDS,
+        "max_processes": config.SANDBOX_MAX_PROCESSES,
+        "max_output": config.SANDBOX_MAX_OUTPUT_BYTES,
+    }
+
+
+def _spawn(
+    command: list[str],
+    stdin_data: str | None = None,
+    result_pipe: bool = False,
+    timeout: float | None = None,
+) -> dict:
+    """
+    Run `command` in a fresh interpreter under the per-run limits (applied by the
+    `limits.py` launcher) and capture output, structured results and resource usage.
+    With `result_pipe`, the write end of a results pipe is appended as the last argument.
+    """
+    lim = _limits()
+    usage_r, usage_w = os.pipe()
+    res_r, res_w = os.pipe() if result_pipe else (None, None)
+    launcher = [
+        "python", str(_LIMITS_PATH), str(usage_w),
+        str(lim["memory_mb"]), str(lim["cpu_seconds"]), str(lim["max_processes"]),
+    ]
+    start = time.monotonic()
+    try:
+        proc = subprocess.Popen(
+            launcher + command + ([str(res_w)] if result_pipe else []),
+            stdin=subprocess.PIPE if stdin_data is not None else subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            pass_fds=(usage_w, res_w) if result_pipe else (usage_w,),
+            start_new_session=True,
+        )
+    finally:
+        for fd in (usage_w, res_w):
+            if fd is not None:
+                os.close(fd)
+
+    if stdin_data is not None:
+        # The harness reads its whole payload before running anything
+        try:
+            proc.stdin.write(stdin_data.encode("utf-8"))
+            proc.stdin.close()
+        except BrokenPipeError:
+            pass
+
+    fds = [proc.stdout.fileno(), proc.stderr.fileno(), usage_r] + ([res_r] if result_pipe else [])
+    try:
+        output, limit = limits.collect(
+            proc.pid, fds, timeout or config.SANDBOX_TIMEOUT,
+            capped=tuple(fds[:2]), max_output=lim["max_output"],
+        )
+    finally:
+        proc.stdout.close()
+        proc.stderr.close()
+        for fd in (usage_r, res_r):
+            if fd is not None:
+                os.close(fd)
+    returncode = proc.wait()
 
+    # A run killed on a limit takes its launcher with it, so there's no usage report
+    try:
+        usage = json.loads(output[usage_r])
+    except json.JSONDecodeError:
+        usage = {"returncode": returncode, "cpu_time_ms": None, "peak_memory_kb": None}
+
+    return {
+        "stdout": output[fds[0]].decode("utf-8", errors="replace"),
+        "stderr": output[fds[1]].decode("utf-8", errors="replace"),
+        "timed_out": limit == "timeout",
+        "limit": limit,
+        "wall_time": time.monotonic() - start,
+        "results": output[res_r].decode("utf-8", errors="replace") if result_pipe else "",
+        **usage,
+    }
+
+
+def _run_subprocess(script: str) -> dict:
+    """Run the script in a brand-new interpreter (the original sandbox mode)."""
+    return _spawn(["python", "-c", script])
+
+
+def _run_harness_subprocess(payload: dict) -> dict:
+    """Run the hidden-test harness in a fresh interpreter, results on a separate pipe."""
+    return _spawn(["python", str(_HARNESS_PATH)], json.dumps(payload), result_pipe=True)
+
+
+def _run_profile_subprocess(payload: dict, timeout: float) -> dict:
+    """Run the complexity profiler in a fresh interpreter, results on a separate pipe."""
+    return _spawn(["python", str(_PROFILER_PATH)], json.dumps(payload), result_pipe=True, timeout=timeout)
 
-# Imports that are blocked for safety
-BLOCKED_IMPORTS = [
-    "os", "sys", "subprocess", "socket", "requests", "urllib",
-    "shutil", "pathlib", "importlib", "ctypes", "signal",
-    "multiprocessing", "threading",
-]
 
+def _run_pooled(script: str) -> dict:
+    """Run the script in a child forked from a pre-warmed zygote."""
+    return get_pool().run({"script": script, "timeout": config.SANDBOX_TIMEOUT, "limits": _limits()})
 
-def _check_dangerous_imports(code: str) -> str | None:
-    """Return a warning message if dangerous imports are detected, else None."""
-    for mod in BLOCKED_IMPORTS:
-        # Match: import os, from os import ..., __import__("os")
-        patterns = [
-            rf"\bimport\s+{mod}\b",
-            rf"\bfrom\s+{mod}\b",
-            rf'__import__\s*\(\s*["\']({mod})["\']',
-        ]
-        for pat in patterns:
-            if re.search(pat, code):
-                return f"Blocked: importing '{mod}' is not allowed in the sandbox."
-    return None
 
+def _run_harness_pooled(payload: dict) -> dict:
+    """Run the hidden-test harness in a child forked from a pre-warmed zygote."""
+    return get_pool().run({"harness": payload, "timeout": config.SANDBOX_TIMEOUT, "limits": _limits()})
 
-def _build_test_runner(user_code: str, test_cases: list[dict]) -> str:
+
+def _run_profile_pooled(payload: dict, timeout: float) -> dict:
+    """Run the complexity profiler in a child forked from a pre-warmed zygote."""
+    return get_pool().run({"profile": payload, "timeout": timeout, "limits": _limits()})
+
+
+def _parse_results(raw: str, key: str, field: str, expected: list) -> tuple[list[dict], dict | None]:
     """
-    Build the full script: user code + hidden assertions.
+    Split a harness / profiler JSON-lines channel into its records and the summary.
+
+    Candidate code can write to the channel as well, so only lines signed with
+    the run's `key` count, each record's `field` must be one of the `expected`
+    values and appear once (so never more records than were asked for), and
+    only the first signed summary is kept.
+    """
+    secret = bytes.fromhex(key)
+    records, summary, seen = [], None, set()
+    for line in raw.splitlines():
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if not isinstance(record, dict):
+            continue
+        sig = record.pop("sig", None)
+        if not isinstance(sig, str) or not hmac.compare_digest(sig, signature(record, secret)):
+            continue
+        if record.get("summary"):
+            summary = summary or record
+            continue
+        value = record.get(field)
+        if value in expected and value not in seen:
+            seen.add(value)
+            records.append(record)
+    return records, summary
+
+
+def _key() -> str:
+    """A fresh secret for signing one run's results."""
+    return secrets.token_hex(SIG_BYTES)
 
-    Each test_case dict should have:
-      - "input": the argument(s) to pass to `solution()`
-      - "expected": the expected return value
+
+def _result(
+    stdout: str = "",
+    stderr: str = "",
+    passed: int = 0,
+    failed: int = 0,
+    total: int = 0,
+    timed_out: bool = False,
+    tests: list[dict] | None = None,
+    exit_reason: str = "ok",
+    usage: dict | None = None,
+    completed: bool = True,
+) -> dict:
+    usage = usage or {}
+    return {
+        # False when the sandbox never finished the run (rejected, or the executor itself failed)
+        "completed": completed,
+        "stdout": stdout,
+        "stderr": stderr,
+        "passed": passed,
+        "failed": failed,
+        "total": total,
+        "timed_out": timed_out,
+        "tests": tests or [],
+        "exit_reason": exit_reason,
+        "cpu_time_ms": usage.get("cpu_time_ms"),
+        "peak_memory_kb": usage.get("peak_memory_kb"),
+        "wall_time_ms": round(usage["wall_time"] * 1000, 1) if "wall_time" in usage else None,
+    }
+
+
+def _exit_reason(result: dict, tests: list[dict], summary: dict | None) -> str:
     """
-    lines = [user_code, "", "# ── Hidden test cases ──", "_passed = 0", "_failed = 0"]
+    Why the run ended: "ok", "error", "timeout", "output_limit", "cpu_limit",
+    "memory_limit" or "signal" (killed by anything else).
+    """
+    if result.get("limit"):
+        return result["limit"]
+    code = result.get("returncode", 0)
+    cpu_ms = result.get("cpu_time_ms") or 0
+    if code == -signal.SIGXCPU or (code == -signal.SIGKILL and cpu_ms >= config.SANDBOX_CPU_SECONDS * 1000):
+        return "cpu_limit"
+    # RLIMIT_AS surfaces as MemoryError, at load time or inside a test
+    errors = [result["stderr"]] + [t.get("error") or "" for t in tests]
+    if any("MemoryError" in e for e in errors):
+        return "memory_limit"
+    if code < 0:
+        return "signal"
+    if code != 0 or (summary is not None and summary["error"]):
+        return "error"
+    return "ok"
 
-    for i, tc in enumerate(test_cases):
-        inp = repr(tc["input"])
-        exp = repr(tc["expected"])
-        lines.append(f"try:")
-        lines.append(f"    _result = solution({inp})")
-        lines.append(f"    assert _result == {exp}, f'Test {i+1}: got {{_result}}, expected {exp}'")
-        lines.append(f"    _passed += 1")
-        lines.append(f"except AssertionError as e:")
-        lines.append(f"    _failed += 1")
-        lines.append(f"    print(f'FAIL: {{e}}')")
-        lines.append(f"except Exception as e:")
-        lines.append(f"    _failed += 1")
-        lines.append(f"    print(f'ERROR in test {i+1}: {{e}}')")
 
-    lines.append(f"print(f'Results: {{_passed}} passed, {{_failed}} failed out of {len(test_cases)}')")
+_LIMIT_NOTES = {
+    "output_limit": f"Output exceeded {config.SANDBOX_MAX_OUTPUT_BYTES} bytes; the run was stopped.",
+    "cpu_limit": f"CPU time limit of {config.SANDBOX_CPU_SECONDS} seconds exceeded.",
+    "memory_limit": f"Memory limit of {config.SANDBOX_MEMORY_MB} MB exceeded.",
+}
 
-    return "\n".join(lines)
+
+def precheck(code: str) -> dict | None:
+    """
+    Vet code in-process before spawning anything: length, syntax and the
+    import / builtin / attribute policy. Returns the final result dict for a
+    rejected run, or None if the code may be executed.
+    """
+    start = time.perf_counter()
+    if len(code) > config.MAX_CODE_LENGTH:
+        error = f"Code exceeds maximum length of {config.MAX_CODE_LENGTH} characters."
+    else:
+        error = check_code(code).error
+    observe_stage("sandbox_precheck", time.perf_counter() - start, status="rejected" if error else "ok", quiet=True)
+    return _result(stderr=error, exit_reason="rejected", completed=False) if error else None
 
 
 def execute_code(
     code: str,
     test_cases: list[dict] | None = None,
+    entry_point: str = "solution",
 ) -> dict:
     """
     Execute Python code in a subprocess sandbox.
 
-    Returns dict with: stdout, stderr, passed, failed, total, timed_out
+    Without `test_cases` the code simply runs as a script. With them, the
+    hidden-test harness loads the code, calls `entry_point` once per test
+    ({"args": [...], "expected": ...}) and reports per-test results.
+
+    Returns dict with: stdout, stderr, passed, failed, total, timed_out, tests,
+    plus the run's exit_reason, cpu_time_ms, peak_memory_kb and wall_time_ms
     """
-    # Check code length
-    if len(code) > config.MAX_CODE_LENGTH:
-        return {
-            "stdout": "",
-            "stderr": f"Code exceeds maximum length of {config.MAX_CODE_LENGTH} characters.",
-            "passed": 0,
-            "failed": 0,
-            "total": 0,
-            "timed_out": False,
-        }
-
-    # Check dangerous imports
-    warning = _check_dangerous_imports(code)
-    if warning:
-        return {
-            "stdout": "",
-            "stderr": warning,
-            "passed": 0,
-            "failed": 0,
-            "total": 0,
-            "timed_out": False,
-        }
-
-    # Build script
-    total = 0
-    if test_cases:
-        total = len(test_cases)
-        script = _build_test_runner(code, test_cases)
-    else:
-        script = code
+    rejected = precheck(code)
+    if rejected is not None:
+        return rejected
+
+    total = len(test_cases) if test_cases else 0
+    key = _key()
+    payload = {
+        "code": code,
+        "entry_point": entry_point,
+        "tests": test_cases or [],
+        "time_limit": config.SANDBOX_TEST_TIMEOUT,
+        "max_failures": config.SANDBOX_MAX_FAILURES,
+        "key": key,
+    }
 
-    # Run in subprocess
+    # Run in a fresh subprocess or on a warm pool worker
     try:
-        result = subprocess.run(
-            ["python", "-c", script],
-            capture_output=True,
-            text=True,
-            timeout=config.SANDBOX_TIMEOUT,
+        if config.SANDBOX_MODE == "pool":
+            result = _run_harness_pooled(payload) if test_cases else _run_pooled(code)
+        else:
+            result = _run_harness_subprocess(payload) if test_cases else _run_subprocess(code)
+    except Exception as e:
+        return _result(stderr=f"Execution error: {str(e)}", total=total, exit_reason="error", completed=False)
+
+    tests, summary = _parse_results(result.get("results", ""), key, "index", list(range(total)))
+    exit_reason = _exit_reason(result, tests, summary)
+
+    if result["timed_out"]:
+        return _result(
+            stderr=f"Code execution timed out after {config.SANDBOX_TIMEOUT} seconds.",
+            total=total,
+            timed_out=True,
+            tests=tests,
+            exit_reason=exit_reason,
+            usage=result,
+            completed=False,
         )
-        stdout = result.stdout.strip()
-        stderr = result.stderr.strip()
-
-        # Parse pass/fail counts from output
-        passed = 0
-        failed = 0
-        if test_cases:
-            # Count FAIL lines
-            failed = stdout.count("FAIL:") + stdout.count("ERROR in test")
-            passed = total - failed
-
-        return {
-            "stdout": stdout,
-            "stderr": stderr,
-            "passed": passed,
-            "failed": failed,
-            "total": total,
-            "timed_out": False,
-        }
-
-    except subprocess.TimeoutExpired:
-        return {
-            "stdout": "",
-            "stderr": f"Code execution timed out after {config.SANDBOX_TIMEOUT} seconds.",
-            "passed": 0,
-            "failed": 0,
-            "total": total,
-            "timed_out": True,
-        }
+
+    stdout = result["stdout"].strip()
+    stderr = result["stderr"].strip()
+    if exit_reason in _LIMIT_NOTES:
+        stderr = "\n".join(filter(None, [stderr, _LIMIT_NOTES[exit_reason]]))
+    if not test_cases:
+        return _result(stdout=stdout, stderr=stderr, exit_reason=exit_reason, usage=result)
+
+    # Counts come from the verified records only, never from candidate output or the summary
+    passed = sum(1 for t in tests if t["status"] == "passed")
+    failed = len(tests) - passed
+    notes = []
+    if summary is None:
+        notes.append("The test harness exited before reporting all results.")
+    elif summary["error"]:
+        notes.append(summary["error"])
+    elif summary["stopped_early"]:
+        notes.append(f"Stopped after {failed} failing tests; {total - len(tests)} not run.")
+    if notes:
+        stderr = "\n".join(filter(None, [stderr, *notes]))
+
+    return _result(
+        stdout=stdout,
+        stderr=stderr,
+        passed=passed,
+        failed=failed,
+        total=total,
+        tests=tests,
+        exit_reason=exit_reason,
+        usage=result,
+    )
+
+
+def profile_code(code: str, profile: dict, entry_point: str = "solution") -> dict:
+    """
+    Measure how the code scales: call `entry_point` on inputs generated from
+    the problem's `profile` spec ({"start", "factor", "steps", "args"}) at
+    geometrically growing sizes, all inside one sandbox run, then fit the
+    growth curve.
+
+    Returns dict with: points, time_complexity, space_complexity,
+    time_exponent, stopped_early, reason, error, stdout, stderr, timed_out,
+    plus the run's exit_reason and resource usage
+    """
+    rejected = precheck(code)
+    if rejected is not None:
+        return {**rejected, "points": [], "error": rejected["stderr"]}
+
+    start, factor = profile.get("start", 100), profile.get("factor", 2)
+    key = _key()
+    payload = {
+        "code": code,
+        "entry_point": entry_point,
+        "sizes": [start * factor ** i for i in range(profile.get("steps", 8))],
+        "args": profile["args"],
+        "seed": profile.get("seed", 0),
+        "time_limit": config.SANDBOX_TEST_TIMEOUT,
+        "budget": config.SANDBOX_PROFILE_BUDGET,
+        "key": key,
+    }
+    # The last size may start just before the budget runs out: one timed and one traced call
+    timeout = config.SANDBOX_PROFILE_BUDGET + 2 * config.SANDBOX_TEST_TIMEOUT + 1
+
+    try:
+        if config.SANDBOX_MODE == "pool":
+            result = _run_profile_pooled(payload, timeout)
+        else:
+            result = _run_profile_subprocess(payload, timeout)
     except Exception as e:
-        return {
-            "stdout": "",
-            "stderr": f"Execution error: {str(e)}",
-            "passed": 0,
-            "failed": 0,
-            "total": total,
-            "timed_out": False,
-        }
+        error = f"Execution error: {str(e)}"
+        return {**_result(stderr=error, exit_reason="error", completed=False), "points": [], "error": error}
+
+    points, summary = _parse_results(result.get("results", ""), key, "n", payload["sizes"])
+    exit_reason = _exit_reason(result, [], summary)
+    stderr = result["stderr"].strip()
+    if exit_reason in _LIMIT_NOTES:
+        stderr = "\n".join(filter(None, [stderr, _LIMIT_NOTES[exit_reason]]))
+
+    return {
+        **_result(
+            stdout=result["stdout"].strip(),
+            stderr=stderr,
+            timed_out=result["timed_out"],
+            exit_reason=exit_reason,
+            usage=result,
+            completed=not result["timed_out"],
+        ),
+        **analyze(points),
+        "points": points,
+        "stopped_early": summary["stopped_early"] if summary else True,
+        "reason": summary["reason"] if summary else f"the run ended early ({exit_reason})",
+        "error": summary["error"] if summary else None,
+    }
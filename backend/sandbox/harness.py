@@ -0,0 +1,211 @@
+"""
+Hidden-test harness — runs candidate code against a problem's test suite.
+
+This is a fixed script: candidate code and test cases arrive as data, never
+pasted into generated source. Run as `python harness.py <result_fd>` with a
+JSON payload on stdin, or called in-process via `run()` by the zygote:
+
+    payload: {"code": str, "entry_point": str,
+              "tests": [{"args": [...], "expected": ..., "compare": str}, ...],
+              "time_limit": float, "max_failures": int, "key": str}
+
+A test's "compare" is "exact" (the default) or "unordered", for answers that
+are a list in any order (e.g. the two indices of Two Sum).
+
+The loading, per-call time limit and result channel helpers are shared with
+`profiler.py`.
+
+Results are written as JSON lines to `result_fd`, a channel separate from
+the candidate's stdout/stderr (which are left untouched):
+
+    {"index": int, "status": "passed" | "failed" | "error" | "timeout",
+     "elapsed_ms": float, "error": str | None, "sig": str}        one per test run
+    {"summary": true, "passed": int, "failed": int, "total": int,
+     "stopped_early": bool, "error": str | None, "sig": str}      always last
+
+Candidate code runs in this same process, so it can find and write to
+`result_fd` too. Every record is therefore signed with the run's secret
+`key` (see `signature`), which is taken out of the payload before the code
+is loaded; the executor drops any line that doesn't verify. Results are
+compared only as plain JSON data, so objects with a rigged `__eq__` never
+pass.
+"""
+
+import builtins
+import json
+import os
+import signal
+import sys
+import traceback
+from contextlib import contextmanager
+# Bound at import: candidate code shares the process and could patch the modules' attributes
+from hashlib import blake2b
+from time import perf_counter
+from typing import Callable
+
+MAX_REPR = 200
+SIG_BYTES = 16
+
+
+class CallTimeout(BaseException):
+    """Raised by SIGALRM when a single call exceeds its limit (uncatchable by `except Exception`)."""
+
+
+_armed = False
+
+
+def _on_alarm(signum, frame) -> None:
+    if _armed:
+        raise CallTimeout()
+
+
+@contextmanager
+def time_limit(seconds: float):
+    """Interrupt the enclosed call with CallTimeout after `seconds` of wall time."""
+    global _armed
+    signal.signal(signal.SIGALRM, _on_alarm)
+    _armed = True
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        _armed = False
+        signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def load(code: str, entry_point: str) -> tuple[Callable | None, str | None]:
+    """Execute the candidate's code and return (entry point, None) or (None, error)."""
+    namespace = {"__name__": "__main__", "__builtins__": builtins}
+    try:
+        exec(compile(code, "<string>", "exec"), namespace)
+    except BaseException as e:
+        # Drop the harness's own frame so the traceback matches `python -c`
+        traceback.print_exception(type(e), e, e.__traceback__.tb_next)
+        return None, f"the code raised {type(e).__name__} while loading."
+
+    fn = namespace.get(entry_point)
+    if not callable(fn):
+        return None, f"define `{entry_point}(...)` to run them."
+    return fn, None
+
+
+def signature(record: dict, key: bytes) -> str:
+    """Keyed hash of a result record (without its "sig"), checked by the executor."""
+    return blake2b(repr(sorted(record.items())).encode(), key=key, digest_size=SIG_BYTES).hexdigest()
+
+
+def channel(result_fd: int, key: str) -> Callable[[dict], None]:
+    """Return `emit(record)`, writing records signed with the hex `key` to `result_fd`."""
+    results = os.fdopen(result_fd, "w", buffering=1)
+    secret = bytes.fromhex(key)
+
+    def emit(record: dict) -> None:
+        results.write(json.dumps({**record, "sig": signature(record, secret)}) + "\n")
+
+    return emit
+
+
+class _Unmatched:
+    """Stand-in for a value that isn't plain JSON data; equal to nothing."""
+
+    def __eq__(self, other):
+        return False
+
+    __hash__ = object.__hash__
+
+
+_PLAIN = (type(None), bool, int, float, str)
+
+
+def _normalize(value):
+    """
+    Compare JSON-decoded expectations against Python results (tuples → lists).
+    Only exact built-in types count: subclasses and other objects could
+    override `__eq__` or `__iter__` to match anything.
+    """
+    if type(value) in (list, tuple):
+        return [_normalize(v) for v in value]
+    if type(value) is dict:
+        return {_normalize(k): _normalize(v) for k, v in value.items()}
+    if type(value) in _PLAIN:
+        return value
+    return _Unmatched()
+
+
+def _matches(got, expected, compare: str) -> bool:
+    got, expected = _normalize(got), _normalize(expected)
+    if compare != "unordered":
+        return got == expected
+    if type(got) is not list or type(expected) is not list:
+        return False
+    try:
+        return sorted(got) == sorted(expected)
+    except TypeError:  # unorderable mix, or a value that isn't plain data
+        return False
+
+
+def _short(value) -> str:
+    text = repr(value)
+    return text if len(text) <= MAX_REPR else text[:MAX_REPR] + "..."
+
+
+def _run_test(fn, test: dict, limit: float) -> tuple[str, str | None]:
+    """Run one test under its own time limit; return (status, error)."""
+    args = test["args"] if "args" in test else [test["input"]]
+    try:
+        with time_limit(limit):
+            got = fn(*args)
+        if _matches(got, test["expected"], test.get("compare", "exact")):
+            return "passed", None
+        return "failed", f"expected {_short(test['expected'])}, got {_short(got)}"
+    except CallTimeout:
+        return "timeout", f"exceeded {limit}s"
+    except BaseException as e:
+        return "error", f"{type(e).__name__}: {e}"
+
+
+def run(payload: dict, result_fd: int) -> None:
+    """Load the candidate code, run every test and report on `result_fd`."""
+    # The key must be gone from the payload before any candidate code runs
+    emit = channel(result_fd, payload.pop("key"))
+    tests = payload["tests"]
+    entry_point = payload.get("entry_point", "solution")
+    max_failures = int(payload.get("max_failures", 0))
+    summary = {"summary": True, "passed": 0, "failed": 0, "total": len(tests), "stopped_early": False, "error": None}
+
+    fn, error = load(payload["code"], entry_point)
+    if fn is None:
+        summary["error"] = f"Hidden tests not run: {error}"
+        emit(summary)
+        return
+
+    limit = float(payload.get("time_limit", 2.0))
+    for index, test in enumerate(tests):
+        start = perf_counter()
+        status, error = _run_test(fn, test, limit)
+        emit({
+            "index": index,
+            "status": status,
+            "elapsed_ms": round((perf_counter() - start) * 1000, 3),
+            "error": error,
+        })
+        summary["passed" if status == "passed" else "failed"] += 1
+        if max_failures and summary["failed"] >= max_failures and index < len(tests) - 1:
+            summary["stopped_early"] = True
+            break
+
+    sys.stdout.flush()
+    emit(summary)
+
+
+def main() -> None:
+    payload = json.loads(sys.stdin.read())
+    # The candidate must not see (or block on) the harness's stdin
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.close(devnull)
+    run(payload, int(sys.argv[1]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Per-run resource limits and accounting for sandbox children.
+
+Shared by both sandbox modes and free of app imports, so the zygote can load
+it as a plain module. Limits are rlimits set in the child before candidate
+code runs; accounting comes from the kernel via `os.wait4`:
+
+    limits:  {"memory_mb": int, "cpu_seconds": int, "max_processes": int, "max_output": int}
+
+Subprocess mode can't set rlimits with `preexec_fn` (unsafe while the
+scheduler's threads are running), so it launches the interpreter through
+this file instead:
+
+    python limits.py <usage_fd> <memory_mb> <cpu_seconds> <max_processes> <command...>
+
+The launcher forks the limited child itself, since a process forked straight
+from the server would report the server's RSS as its own peak, and writes
+the child's usage (see `reap`) to `usage_fd` as JSON.
+"""
+
+import json
+import os
+import resource
+import selectors
+import signal
+import sys
+import time
+
+
+def apply(memory_mb: int = 0, cpu_seconds: int = 0, max_processes: int = -1, **_) -> None:
+    """Set the child's rlimits (call in the child, before any candidate code runs)."""
+    resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+    if memory_mb > 0:
+        size = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (size, size))
+    if cpu_seconds > 0:
+        # SIGXCPU at the soft limit, SIGKILL one second later if it's ignored
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 1))
+    if max_processes >= 0:
+        resource.setrlimit(resource.RLIMIT_NPROC, (max_processes, max_processes))
+
+
+def collect(
+    pid: int,
+    fds: list[int],
+    timeout: float,
+    capped: tuple[int, ...] = (),
+    max_output: int = 0,
+) -> tuple[dict[int, bytes], str | None]:
+    """
+    Read the child's pipes until EOF, the deadline, or `max_output` bytes on the
+    `capped` fds. On a limit the child's process group is killed and the limit
+    ("timeout" / "output_limit") is returned alongside what was read.
+    """
+    chunks = {fd: [] for fd in fds}
+    deadline = time.monotonic() + timeout
+    output = 0
+    limit = None
+
+    with selectors.DefaultSelector() as sel:
+        for fd in fds:
+            sel.register(fd, selectors.EVENT_READ)
+        while sel.get_map() and limit is None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                limit = "timeout"
+                break
+            for key, _ in sel.select(remaining):
+                data = os.read(key.fd, 65536)
+                if not data:
+                    sel.unregister(key.fd)
+                    continue
+                if key.fd in capped and max_output:
+                    data = data[:max(0, max_output - output)]
+                    output += len(data)
+                    if output >= max_output:
+                        limit = "output_limit"
+                chunks[key.fd].append(data)
+
+    if limit is not None:
+        try:
+            os.killpg(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+    return {fd: b"".join(parts) for fd, parts in chunks.items()}, limit
+
+
+def wait(pid: int, deadline: float) -> str | None:
+    """
+    Wait (without reaping) until the child exits or the monotonic `deadline`
+    passes. A child that closed its pipes early is only stopped here: on the
+    deadline its process group is killed and "timeout" is returned.
+    """
+    pause = 0.005
+    while time.monotonic() < deadline:
+        if os.waitid(os.P_PID, pid, os.WEXITED | os.WNOHANG | os.WNOWAIT) is not None:
+            return None
+        time.sleep(min(pause, max(0.0, deadline - time.monotonic())))
+        pause = min(pause * 2, 0.05)
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+    return "timeout"
+
+
+def reap(pid: int) -> dict:
+    """Wait for the child and return its exit code plus kernel-measured CPU time and peak RSS."""
+    _, status, usage = os.wait4(pid, 0)
+    return {
+        "returncode": os.waitstatus_to_exitcode(status),
+        "cpu_time_ms": round((usage.ru_utime + usage.ru_stime) * 1000, 1),
+        "peak_memory_kb": usage.ru_maxrss,  # kilobytes on Linux
+    }
+
+
+def _launch(usage_fd: int, memory_mb: int, cpu_seconds: int, max_processes: int, command: list[str]) -> None:
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os.close(usage_fd)
+            apply(memory_mb, cpu_seconds, max_processes)
+            os.execvp(command[0], command)
+        finally:
+            os._exit(127)
+    usage = reap(pid)
+    with os.fdopen(usage_fd, "w") as out:
+        out.write(json.dumps(usage))
+
+
+if __name__ == "__main__":
+    usage_fd, memory_mb, cpu_seconds, max_processes = (int(v) for v in sys.argv[1:5])
+    _launch(usage_fd, memory_mb, cpu_seconds, max_processes, sys.argv[5:])
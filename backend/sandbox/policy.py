@@ -0,0 +1,228 @@
+"""
+In-process pre-check of candidate code, done before any sandbox is spawned.
+
+The source is parsed once with `ast` and walked once against the rule tables
+below: blocked imports, blocked builtins, blocked (introspection) attributes,
+and strings naming any of those (`vars(m)["__import__"]`,
+`getattr(x, "__self__")`, `"{0.__self__}"`), including strings concatenated
+from constants. `getattr` and friends may only be called directly, with a
+literal name. The same walk notes whether the code is nondeterministic by
+design, for the result cache. Syntax errors are reported immediately, in the
+same format Python itself would print.
+"""
+
+import ast
+import re
+import traceback
+from functools import lru_cache
+from typing import NamedTuple
+
+# ── Rule tables ─────────────────────────────────────────────
+
+# Modules that reach the OS, the network or the interpreter's internals
+BLOCKED_MODULES = frozenset({
+    "os", "sys", "subprocess", "socket", "requests", "urllib",
+    "shutil", "pathlib", "importlib", "ctypes", "signal",
+    "multiprocessing", "threading",
+    "builtins", "posix", "nt", "_thread", "pty", "gc", "inspect", "marshal",
+    # File access without the (blocked) open builtin
+    "io", "_io", "codecs", "fileinput",
+    # traceback walks and captures frames; the sandbox's own modules decide the reported results
+    "traceback", "__main__", "harness", "profiler", "zygote", "limits",
+})
+
+# Builtins that load code, touch files or expose namespaces
+BLOCKED_NAMES = frozenset({
+    "__import__", "__builtins__", "eval", "exec", "compile", "open", "breakpoint",
+    "globals", "locals", "vars", "dir",
+})
+
+# Attributes used to climb from any object back to builtins / frames / modules
+BLOCKED_ATTRIBUTES = frozenset({
+    "__subclasses__", "__globals__", "__builtins__", "__code__", "__closure__",
+    "__bases__", "__base__", "__mro__", "__loader__", "__spec__", "__getattribute__",
+    # A builtin's __self__ is the builtins module; __dict__ exposes any namespace
+    "__self__", "__dict__", "__import__",
+    "f_globals", "f_locals", "f_back", "f_builtins", "gi_frame", "cr_frame", "tb_frame",
+    # operator's getattr under other names, taking the attribute name at runtime
+    "attrgetter", "methodcaller",
+})
+
+# Words in a string that can only be meant for a namespace, getattr or format-field lookup
+BLOCKED_LOOKUPS = BLOCKED_ATTRIBUTES | {name for name in BLOCKED_NAMES if name.startswith("__")}
+
+# Dynamic attribute access, allowed only with a literal (and so vetted) attribute name
+ATTRIBUTE_BUILTINS = frozenset({"getattr", "setattr", "delattr", "hasattr"})
+
+# Sources of run-to-run variation (results of such code are not cached)
+NONDETERMINISTIC_MODULES = frozenset({"random", "time", "datetime", "secrets", "uuid"})
+NONDETERMINISTIC_NAMES = frozenset({"id", "hash"})
+
+
+class PolicyResult(NamedTuple):
+    error: str | None           # syntax error or policy violation, ready for stderr
+    nondeterministic: bool
+
+
+def _root(module: str | None) -> str:
+    return (module or "").split(".")[0]
+
+
+# Per-node-type checks: each returns (violation message or None, nondeterministic)
+
+def _check_import(node: ast.Import) -> tuple[str | None, bool]:
+    roots = [_root(alias.name) for alias in node.names]
+    for root in roots:
+        if root in BLOCKED_MODULES:
+            return f"importing '{root}' is not allowed in the sandbox.", False
+    return None, any(root in NONDETERMINISTIC_MODULES for root in roots)
+
+
+def _check_import_from(node: ast.ImportFrom) -> tuple[str | None, bool]:
+    root = _root(node.module) if node.level == 0 else ""
+    if root in BLOCKED_MODULES:
+        return f"importing '{root}' is not allowed in the sandbox.", False
+    for alias in node.names:
+        if alias.name in BLOCKED_ATTRIBUTES:
+            return f"importing '{alias.name}' is not allowed in the sandbox.", False
+    return None, root in NONDETERMINISTIC_MODULES
+
+
+def _check_name(node: ast.Name) -> tuple[str | None, bool]:
+    if node.id in BLOCKED_NAMES:
+        return f"'{node.id}' is not allowed in the sandbox.", False
+    return None, node.id in NONDETERMINISTIC_NAMES
+
+
+def _check_attribute(node: ast.Attribute) -> tuple[str | None, bool]:
+    if node.attr in BLOCKED_ATTRIBUTES:
+        return f"accessing '.{node.attr}' is not allowed in the sandbox.", False
+    return None, False
+
+
+def _check_call(node: ast.Call) -> tuple[str | None, bool]:
+    func = node.func
+    if isinstance(func, ast.Name) and func.id in ATTRIBUTE_BUILTINS and len(node.args) > 1:
+        # A computed name could spell any blocked attribute; literal ones are vetted as constants
+        if not (isinstance(node.args[1], ast.Constant) and isinstance(node.args[1].value, str)):
+            return f"'{func.id}' with a computed attribute name is not allowed in the sandbox.", False
+    return None, False
+
+
+_WORD = re.compile(r"\w+")
+
+
+def _blocked_word(text: str) -> str | None:
+    # Covers plain lookups (ns["__import__"]) as well as dotted and format-field paths ("{0.__self__}")
+    return next((word for word in _WORD.findall(text) if word in BLOCKED_LOOKUPS), None)
+
+
+def _check_constant(node: ast.Constant) -> tuple[str | None, bool]:
+    word = _blocked_word(node.value) if isinstance(node.value, str) else None
+    if word:
+        return f"'{word}' is not allowed in the sandbox.", False
+    return None, False
+
+
+def _folded(node: ast.AST) -> str | None:
+    """The string a `+` chain or f-string of string constants evaluates to, else None."""
+    if isinstance(node, ast.Constant):
+        return node.value if isinstance(node.value, str) else None
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
+        left, right = _folded(node.left), _folded(node.right)
+        return None if left is None or right is None else left + right
+    if isinstance(node, ast.FormattedValue) and node.conversion == -1 and node.format_spec is None:
+        return _folded(node.value)
+    if isinstance(node, ast.JoinedStr):
+        parts = [_folded(value) for value in node.values]
+        return None if None in parts else "".join(parts)
+    return None
+
+
+def _check_concatenation(node: ast.BinOp | ast.JoinedStr) -> tuple[str | None, bool]:
+    # "__se" + "lf__" spells a blocked name that no single constant contains
+    word = _blocked_word(_folded(node) or "")
+    if word:
+        return f"'{word}' is not allowed in the sandbox.", False
+    return None, False
+
+
+_CHECKS = {
+    ast.Import: _check_import,
+    ast.ImportFrom: _check_import_from,
+    ast.Name: _check_name,
+    ast.Attribute: _check_attribute,
+    ast.Call: _check_call,
+    ast.Constant: _check_constant,
+    ast.BinOp: _check_concatenation,
+    ast.JoinedStr: _check_concatenation,
+}
+
+
+@lru_cache(maxsize=256)
+def check_code(code: str) -> PolicyResult:
+    """Parse and vet `code` in one pass. Cached, since "Run" often repeats identical code."""
+    try:
+        tree = ast.parse(code, filename="<string>")
+    except (SyntaxError, ValueError) as e:
+        return PolicyResult("".join(traceback.format_exception_only(type(e), e)).rstrip(), False)
+
+    nondeterministic = False
+    callees = set()  # ast.walk reaches every call before its callee
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call):
+            callees.add(id(node.func))
+        elif isinstance(node, ast.Name) and node.id in ATTRIBUTE_BUILTINS and id(node) not in callees:
+            # An alias (g = getattr) would take computed names past _check_call
+            return PolicyResult(f"Blocked (line {node.lineno}): '{node.id}' may only be called directly.", False)
+        check = _CHECKS.get(type(node))
+        if check is None:
+            continue
+        message, varies = check(node)
+        if message:
+            return PolicyResult(f"Blocked (line {node.lineno}): {message}", False)
+        nondeterministic = nondeterministic or varies
+
+    # Some errors ('return' outside function, bad nonlocal, ...) only surface at compile time
+    try:
+        compile(tree, "<string>", "exec")
+    except SyntaxError as e:
+        return PolicyResult("".join(traceback.format_exception_only(type(e), e)).rstrip(), False)
+
+    return PolicyResult(None, nondeterministic)
+
+
+# ── Regression payloads ─────────────────────────────────────
+
+# Escapes that got past earlier versions of this check. `python sandbox/policy.py`
+# confirms each is still rejected.
+KNOWN_ESCAPES = (
+    'print(print.__self__.__import__("os").getcwd())',
+    'vars(print.__self__)["__import__"]("os")',
+    'b = print.__self__\nprint(b.__dict__["open"]("/etc/passwd").read())',
+    'print(getattr(print, "__self__").__import__("os"))',
+    'print(getattr(print, "__se" + "lf__"))',
+    'ns = dir()\nprint(locals()["__builtins__"])',
+    '__import__("os").system("id")',
+    'print(().__class__.__bases__[0].__subclasses__())',
+    'import io\nprint(io.open("/etc/hostname").read())',
+    'from _io import open as o\nprint(o("/etc/hostname").read())',
+    'import codecs\nprint(codecs.open("/etc/hostname").read())',
+    'import fileinput\nprint(list(fileinput.input("/etc/hostname")))',
+    'import io\nio.open(5, "w", closefd=False).write(\'{"summary": true}\\n\')',
+    'import operator\nb = operator.attrgetter("__se" + "lf__")(print)\n'
+    'm = operator.methodcaller("__imp" + "ort__", "o" + "s")(b)\nprint(m.getcwd())',
+    'from operator import attrgetter as a\nprint(a("__self__")(print))',
+    'g = getattr\nprint(g(print, "__se" + "lf__"))',
+    'name = "__se" + "lf__"\nprint(name)',
+    'print(f"{\'__se\'}lf__")',
+    'print("{0.__self__}".format(print))',
+)
+
+
+if __name__ == "__main__":
+    missed = [code for code in KNOWN_ESCAPES if check_code(code).error is None]
+    for code in missed:
+        print(f"NOT BLOCKED: {code!r}")
+    print(f"{len(KNOWN_ESCAPES) - len(missed)}/{len(KNOWN_ESCAPES)} known escapes blocked")
+    raise SystemExit(1 if missed else 0)
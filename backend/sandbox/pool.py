@@ -0,0 +1,161 @@
+"""Pool of pre-warmed sandbox zygotes — avoids interpreter startup per run."""
+
+import json
+import queue
+import selectors
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+import config
+
+_ZYGOTE_PATH = Path(__file__).resolve().parent / "zygote.py"
+
+# Extra seconds to wait for a zygote's reply beyond the run timeout before
+# declaring the zygote itself wedged and replacing it.
+_RESPONSE_GRACE = 5.0
+
+
+class _Zygote:
+    """One long-lived zygote process, serving a single run at a time."""
+
+    def __init__(self) -> None:
+        self.proc = subprocess.Popen(
+            [sys.executable, "-u", str(_ZYGOTE_PATH)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
+        )
+
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def run(self, request: dict) -> dict:
+        self.proc.stdin.write(json.dumps(request) + "\n")
+        self.proc.stdin.flush()
+
+        with selectors.DefaultSelector() as sel:
+            sel.register(self.proc.stdout, selectors.EVENT_READ)
+            if not sel.select(request["timeout"] + _RESPONSE_GRACE):
+                raise TimeoutError("sandbox zygote did not respond")
+
+        line = self.proc.stdout.readline()
+        if not line:
+            raise RuntimeError("sandbox zygote exited unexpectedly")
+        return json.loads(line)
+
+    def kill(self) -> None:
+        if self.alive():
+            self.proc.kill()
+        self.proc.wait()
+
+
+class SandboxPool:
+    """
+    Fixed-size pool of zygotes. `run` blocks until a zygote is free, so the
+    number of concurrent sandbox runs never exceeds the pool size.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._idle: queue.Queue[_Zygote] = queue.Queue()
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self._busy = 0
+        self._runs = 0
+        self._failures = 0
+        self._wall_times: deque[float] = deque(maxlen=1000)
+        for _ in range(size):
+            self._idle.put(_Zygote())
+
+    def run(self, request: dict) -> dict:
+        """
+        Execute a zygote request ({"script"}, {"harness"} or {"profile"} plus "timeout")
+        on a free zygote and return its result dict.
+        """
+        with self._lock:
+            self._waiting += 1
+        zygote = self._idle.get()
+        with self._lock:
+            self._waiting -= 1
+            self._busy += 1
+
+        start = time.monotonic()
+        try:
+            if not zygote.alive():
+                zygote = _Zygote()
+            return zygote.run(request)
+        except Exception:
+            # A wedged or crashed zygote is replaced rather than reused
+            with self._lock:
+                self._failures += 1
+            zygote.kill()
+            zygote = _Zygote()
+            raise
+        finally:
+            elapsed = time.monotonic() - start
+            with self._lock:
+                self._busy -= 1
+                self._runs += 1
+                self._wall_times.append(elapsed)
+            self._idle.put(zygote)
+
+    def stats(self) -> dict:
+        """Pool sizing metrics: size, utilisation, queue depth and run wall times."""
+        with self._lock:
+            times = sorted(self._wall_times)
+            runs, failures = self._runs, self._failures
+            busy, waiting = self._busy, self._waiting
+
+        def pct(p: float) -> float | None:
+            if not times:
+                return None
+            return round(times[min(len(times) - 1, int(p * len(times)))] * 1000, 1)
+
+        return {
+            "pool_size": self.size,
+            "busy": busy,
+            "idle": self.size - busy,
+            "queue_depth": waiting,
+            "runs": runs,
+            "failures": failures,
+            "wall_time_ms": {
+                "last": round(self._wall_times[-1] * 1000, 1) if self._wall_times else None,
+                "p50": pct(0.50),
+                "p95": pct(0.95),
+                "max": round(times[-1] * 1000, 1) if times else None,
+            },
+        }
+
+    def shutdown(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().kill()
+            except queue.Empty:
+                break
+
+
+_pool: SandboxPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> SandboxPool:
+    """Return the process-wide pool, starting its zygotes on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = SandboxPool(config.SANDBOX_POOL_SIZE)
+        return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+        _pool = None
@@ -0,0 +1,182 @@
+"""
+Complexity profiler — times candidate code over a geometric series of input sizes.
+
+Like `harness.py` this is a fixed script: inputs are generated here from a
+declarative spec (the problem's "profile" entry in `data/problems.json`),
+never from code. Run as `python profiler.py <result_fd>` with a JSON payload
+on stdin, or called in-process via `run()` by the zygote:
+
+    payload: {"code": str, "entry_point": str, "sizes": [int, ...],
+              "args": [<generator spec>, ...], "seed": int,
+              "time_limit": float, "budget": float, "key": str}
+
+Generator specs, each producing one positional argument for size n:
+
+    {"kind": "int_list", "low": int, "high": int, "sorted": bool}   n random ints
+    {"kind": "range", "shuffle": bool}                              0..n-1, in order unless shuffled
+    {"kind": "int", "scale": int, "offset": int}                    scale * n + offset
+    {"kind": "string", "alphabet": str, "length": int}              `length` (default n) chars
+    {"kind": "intervals", "max_length": int}                        n [start, end] pairs
+    {"kind": "grid", "density": float, "cells": [on, off]}          ~n cells, square
+    {"kind": "cache_ops", "key_scale": int, "get_ratio": float}     n ["get", k] / ["put", k, v] ops, k < key_scale * n
+
+Specs should describe worst-case inputs (e.g. the answer at the very end),
+since early exits on lucky data would hide the growth rate. Every input is
+generated before the candidate code is loaded, so the code can't tamper with
+the generator. All sizes run in this one process. Each size is timed with the garbage collector paused
+(best of a few repeats, each on a fresh copy of the input) and then run once
+more under `tracemalloc` for its peak allocation. Tracing slows Python code
+down by an order of magnitude or more, so once a size's traced run would not
+fit the per-call limit (or times out), memory is no longer traced and larger
+sizes are only timed; space complexity is fitted on the traced sizes.
+Results are JSON lines on `result_fd`, signed with the run's `key` like the
+harness's:
+
+    {"n": int, "time_ms": float, "peak_kb": float | None, "repeats": int, "sig": str}    one per size
+    {"summary": true, "error": str | None, "stopped_early": bool, "reason": str | None, "sig": str}
+"""
+
+import gc
+import json
+import math
+import os
+import pickle
+import random
+import sys
+# Bound at import: candidate code shares the process and could patch the modules' attributes
+from pickle import loads as unpickle
+from time import monotonic, perf_counter
+from tracemalloc import get_traced_memory, start as start_tracing, stop as stop_tracing
+
+from harness import CallTimeout, channel, load, time_limit
+
+# Repeat fast calls until this much time is spent (or MAX_REPEATS), keeping the best
+MIN_SAMPLE_SECONDS = 0.05
+MAX_REPEATS = 5
+# Conservative slowdown of a call under tracemalloc, to skip traced runs that can't fit the limit
+TRACE_SLOWDOWN = 40
+
+
+def _generate(spec: dict, n: int, rng: random.Random):
+    kind = spec["kind"]
+    if kind == "int_list":
+        values = [rng.randint(spec.get("low", 0), spec.get("high", n)) for _ in range(n)]
+        return sorted(values) if spec.get("sorted") else values
+    if kind == "range":
+        values = list(range(n))
+        if spec.get("shuffle"):
+            rng.shuffle(values)
+        return values
+    if kind == "int":
+        return spec.get("scale", 0) * n + spec.get("offset", 0)
+    if kind == "string":
+        alphabet = spec.get("alphabet", "abcdefghijklmnopqrstuvwxyz")
+        return "".join(rng.choice(alphabet) for _ in range(spec.get("length", n)))
+    if kind == "intervals":
+        starts = [rng.randint(0, 10 * n) for _ in range(n)]
+        return [[s, s + rng.randint(0, spec.get("max_length", 10))] for s in starts]
+    if kind == "grid":
+        side = max(1, math.isqrt(n))
+        on, off = spec.get("cells", ["1", "0"])
+        density = spec.get("density", 0.5)
+        return [[on if rng.random() < density else off for _ in range(side)] for _ in range(side)]
+    if kind == "cache_ops":
+        keys = max(1, spec.get("key_scale", 2) * n)
+        get_ratio = spec.get("get_ratio", 0.5)
+        return [
+            ["get", rng.randrange(keys)] if rng.random() < get_ratio else ["put", rng.randrange(keys), rng.randrange(n + 1)]
+            for _ in range(n)
+        ]
+    raise ValueError(f"unknown generator kind {kind!r}")
+
+
+def _time(fn, blob: bytes, limit: float) -> tuple[float, int]:
+    """Return (best seconds, repeats) for one input size."""
+    best = math.inf
+    spent = 0.0
+    repeats = 0
+    while repeats < MAX_REPEATS and (repeats == 0 or spent < MIN_SAMPLE_SECONDS):
+        args = unpickle(blob)  # fresh copy: solutions may mutate their input
+        gc.disable()
+        try:
+            with time_limit(limit):
+                start = perf_counter()
+                fn(*args)
+                elapsed = perf_counter() - start
+        finally:
+            gc.enable()
+        best = min(best, elapsed)
+        spent += elapsed
+        repeats += 1
+    return best, repeats
+
+
+def _trace(fn, blob: bytes, limit: float) -> float:
+    """Return the peak traced allocation (KB) of one call."""
+    args = unpickle(blob)
+    start_tracing()
+    try:
+        with time_limit(limit):
+            fn(*args)
+        _, peak = get_traced_memory()
+    finally:
+        stop_tracing()
+    return peak / 1024
+
+
+def run(payload: dict, result_fd: int) -> None:
+    """Load the candidate code, profile it over every size that fits the budget, report on `result_fd`."""
+    # The key must be gone from the payload before any candidate code runs
+    emit = channel(result_fd, payload.pop("key"))
+    rng = random.Random(payload.get("seed", 0))
+    inputs = [(n, pickle.dumps([_generate(spec, n, rng) for spec in payload["args"]])) for n in payload["sizes"]]
+
+    summary = {"summary": True, "error": None, "stopped_early": False, "reason": None}
+    fn, error = load(payload["code"], payload.get("entry_point", "solution"))
+    if fn is None:
+        summary["error"] = f"Scaling not measured: {error}"
+        emit(summary)
+        return
+
+    limit = float(payload.get("time_limit", 2.0))
+    deadline = monotonic() + float(payload.get("budget", 5.0))
+    tracing = True
+    for n, blob in inputs:
+        remaining = deadline - monotonic()
+        if remaining <= 0:
+            summary["stopped_early"], summary["reason"] = True, "time budget used up"
+            break
+        peak_kb = None
+        try:
+            seconds, repeats = _time(fn, blob, min(limit, remaining))
+            tracing = tracing and seconds * TRACE_SLOWDOWN <= limit
+            if tracing:
+                try:
+                    peak_kb = round(_trace(fn, blob, limit), 1)
+                except CallTimeout:
+                    tracing = False  # only the traced run was too slow; the timing stands
+        except CallTimeout:
+            summary["stopped_early"] = True
+            summary["reason"] = f"n={n} exceeded the {limit}s limit" if remaining > limit else "time budget used up"
+            break
+        except BaseException as e:
+            # Sizes measured so far still count (e.g. deep recursion failing only at large n)
+            summary["stopped_early"], summary["reason"] = True, f"n={n} raised {type(e).__name__}: {e}"
+            break
+        emit({"n": n, "time_ms": round(seconds * 1000, 4), "peak_kb": peak_kb, "repeats": repeats})
+
+    sys.stdout.flush()
+    emit(summary)
+
+
+def main() -> None:
+    payload = json.loads(sys.stdin.read())
+    # The candidate must not see (or block on) the profiler's stdin
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.close(devnull)
+    run(payload, int(sys.argv[1]))
+
+
+if __name__ == "__main__":
+    main()
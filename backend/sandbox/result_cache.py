@@ -0,0 +1,107 @@
+"""
+Content-addressed cache of sandbox results.
+
+Identical runs — same code, same hidden tests, same sandbox limits — produce
+the same result, so "Run" on unchanged code is answered from memory instead
+of spawning another sandbox. Entries are evicted least-recently-used once
+the cache exceeds its byte budget. Code the policy pre-check flags as
+nondeterministic by design (randomness, clocks, object identity) is never
+cached.
+"""
+
+import copy
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+import config
+
+
+def result_cache_key(code: str, test_cases: list[dict] | None, entry_point: str) -> str:
+    """Hash of everything that determines a run's result."""
+    material = json.dumps(
+        {
+            "code": code,
+            "tests": test_cases or [],
+            "entry_point": entry_point,
+            "limits": [
+                config.SANDBOX_TIMEOUT,
+                config.SANDBOX_TEST_TIMEOUT,
+                config.SANDBOX_MAX_FAILURES,
+                config.SANDBOX_MEMORY_MB,
+                config.SANDBOX_CPU_SECONDS,
+                config.SANDBOX_MAX_OUTPUT_BYTES,
+                config.MAX_CODE_LENGTH,
+            ],
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[dict, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> dict | None:
+        """Return a copy of the cached result, refreshing its recency."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(entry[0])
+
+    def put(self, key: str, result: dict) -> None:
+        size = len(json.dumps(result))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (copy.deepcopy(result), size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+
+    def record_bypass(self) -> None:
+        with self._lock:
+            self.bypassed += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "bypassed": self.bypassed,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            }
+
+
+_cache: ResultCache | None = None
+
+
+def get_result_cache() -> ResultCache:
+    """Return the process-wide result cache."""
+    global _cache
+    if _cache is None:
+        _cache = ResultCache(config.SANDBOX_CACHE_MAX_BYTES)
+    return _cache
@@ -0,0 +1,160 @@
+"""Admission-controlled async front end for sandbox runs.
+
+`execute_code` blocks for up to `SANDBOX_TIMEOUT` seconds (`profile_code` for
+its profiling budget), so neither may be called on the event loop. The
+scheduler runs them on a bounded thread pool and rejects work up front
+(rather than queueing without limit) when either the global queue or a
+single session's allowance is full.
+"""
+
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Callable
+
+import config
+from metrics import observe_stage
+from .executor import execute_code, profile_code
+
+
+class SandboxBusy(Exception):
+    """Raised when a run cannot be admitted; carries a retry hint in seconds."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class SandboxScheduler:
+    """Bounded job queue with a global concurrency limit and a per-session limit."""
+
+    def __init__(self, max_concurrency: int, max_queue: int, max_per_session: int) -> None:
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_per_session = max_per_session
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="sandbox"
+        )
+        self._lock = threading.Lock()
+        self._running = 0
+        self._queued = 0
+        self._per_session: dict[str, int] = {}
+        self._rejected = 0
+        self._completed = 0
+        self._run_times: deque[float] = deque(maxlen=200)
+        self._wait_times: deque[float] = deque(maxlen=200)
+
+    def _retry_after(self) -> int:
+        """Estimate seconds until a slot frees up, from recent run times."""
+        avg = sum(self._run_times) / len(self._run_times) if self._run_times else 1.0
+        backlog = (self._queued + 1) / self.max_concurrency
+        return max(1, math.ceil(avg * backlog))
+
+    def _admit(self, session_id: str) -> None:
+        with self._lock:
+            if self._per_session.get(session_id, 0) >= self.max_per_session:
+                self._rejected += 1
+                raise SandboxBusy(
+                    "A previous run for this session is still in progress.",
+                    self._retry_after(),
+                )
+            if self._running + self._queued >= self.max_concurrency + self.max_queue:
+                self._rejected += 1
+                raise SandboxBusy("Sandbox is busy.", self._retry_after())
+
+            self._queued += 1
+            self._per_session[session_id] = self._per_session.get(session_id, 0) + 1
+
+    def _release_session(self, session_id: str) -> None:
+        remaining = self._per_session.get(session_id, 1) - 1
+        if remaining:
+            self._per_session[session_id] = remaining
+        else:
+            self._per_session.pop(session_id, None)
+
+    def _job(self, session_id: str, enqueued: float, stage: str, work: Callable[[], dict]) -> dict:
+        """Worker-thread body: account for the queue wait, then do the sandbox work."""
+        started = time.monotonic()
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self._wait_times.append(started - enqueued)
+        observe_stage("sandbox_queue_wait", started - enqueued, session_id=session_id)
+        status = "error"
+        try:
+            result = work()
+            status = "timeout" if result["timed_out"] else "ok"
+            return result
+        finally:
+            elapsed = time.monotonic() - started
+            observe_stage(stage, elapsed, status=status, session_id=session_id)
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+                self._run_times.append(elapsed)
+                self._release_session(session_id)
+
+    def _on_done(self, session_id: str, future: Future) -> None:
+        # A job cancelled while still queued never ran `_job`, so release it here
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+                self._release_session(session_id)
+
+    async def run(
+        self,
+        session_id: str,
+        code: str,
+        test_cases: list[dict] | None = None,
+        entry_point: str = "solution",
+    ) -> dict:
+        """Admit, queue and execute one run off the event loop; raises SandboxBusy if full."""
+        work = partial(execute_code, code=code, test_cases=test_cases, entry_point=entry_point)
+        return await self._submit(session_id, "sandbox_run", work)
+
+    async def profile(self, session_id: str, code: str, profile: dict, entry_point: str = "solution") -> dict:
+        """Admit and run the complexity profiler like any other run (same queue and limits)."""
+        work = partial(profile_code, code=code, profile=profile, entry_point=entry_point)
+        return await self._submit(session_id, "sandbox_profile", work)
+
+    async def _submit(self, session_id: str, stage: str, work: Callable[[], dict]) -> dict:
+        self._admit(session_id)
+        future = self._executor.submit(self._job, session_id, time.monotonic(), stage, work)
+        future.add_done_callback(lambda f: self._on_done(session_id, f))
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> dict:
+        def avg_ms(values: deque[float]) -> float | None:
+            return round(sum(values) / len(values) * 1000, 1) if values else None
+
+        with self._lock:
+            return {
+                "max_concurrency": self.max_concurrency,
+                "max_queue": self.max_queue,
+                "max_per_session": self.max_per_session,
+                "running": self._running,
+                "queued": self._queued,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_queue_wait_ms": avg_ms(self._wait_times),
+                "avg_run_ms": avg_ms(self._run_times),
+            }
+
+
+_scheduler: SandboxScheduler | None = None
+
+
+def get_scheduler() -> SandboxScheduler:
+    """Return the process-wide scheduler."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = SandboxScheduler(
+            max_concurrency=config.SANDBOX_MAX_CONCURRENCY,
+            max_queue=config.SANDBOX_QUEUE_SIZE,
+            max_per_session=config.SANDBOX_MAX_PER_SESSION,
+        )
+    return _scheduler
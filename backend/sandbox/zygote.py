@@ -0,0 +1,143 @@
+"""
+Sandbox zygote — a pre-warmed interpreter that forks a clean child per run.
+
+Started once by `sandbox.pool.SandboxPool` as `python -u zygote.py`. It imports
+the modules candidate code commonly uses, then serves requests over a
+newline-delimited JSON protocol on stdin/stdout:
+
+    request:  {"script": str, "timeout": float, "limits": <limits>}
+          or  {"harness": <harness payload>, "timeout": float, "limits": <limits>}
+          or  {"profile": <profiler payload>, "timeout": float, "limits": <limits>}
+    response: {"stdout": str, "stderr": str, "returncode": int,
+               "timed_out": bool, "limit": str | None, "wall_time": float,
+               "cpu_time_ms": float, "peak_memory_kb": int, "results": str}
+
+`limits` are the per-run rlimits and output cap described in `limits.py`.
+
+A "harness" request runs hidden tests through the preloaded `harness` module,
+and a "profile" request measures scaling through `profiler`; their structured
+results come back in "results" (JSON lines), separate from the candidate's
+stdout.
+
+Each request is executed in a freshly forked child, so every run starts from
+the same pristine, already-initialised interpreter state without paying for
+interpreter startup.
+"""
+
+import builtins
+import json
+import os
+import sys
+import time
+import traceback
+
+import harness
+import limits
+import profiler
+
+# Warm the modules typical interview solutions import so children get them for free
+PRELOAD_MODULES = (
+    "collections", "heapq", "itertools", "functools", "math", "bisect",
+    "re", "string", "typing", "dataclasses", "json", "operator", "random",
+)
+
+for _name in PRELOAD_MODULES:
+    __import__(_name)
+
+
+def _run_child(request: dict, out_w: int, err_w: int, devnull: int, res_w: int | None) -> None:
+    """Executed in the forked child: run the request with redirected stdio, never return."""
+    code = 0
+    try:
+        os.setsid()
+        limits.apply(**request.get("limits", {}))
+        os.dup2(devnull, 0)
+        os.dup2(out_w, 1)
+        os.dup2(err_w, 2)
+        for fd in (out_w, err_w, devnull):
+            os.close(fd)
+        if "harness" in request:
+            harness.run(request["harness"], res_w)
+        elif "profile" in request:
+            profiler.run(request["profile"], res_w)
+        else:
+            exec(compile(request["script"], "<string>", "exec"), {"__name__": "__main__", "__builtins__": builtins})
+    except SystemExit as e:
+        if e.code is None:
+            code = 0
+        elif isinstance(e.code, int):
+            code = e.code
+        else:
+            print(e.code, file=sys.stderr)
+            code = 1
+    except BaseException as e:
+        # Drop the zygote's own frame so the traceback matches `python -c`
+        traceback.print_exception(type(e), e, e.__traceback__.tb_next)
+        code = 1
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(code)
+
+
+def run_request(request: dict) -> dict:
+    """Fork a child to run a script, harness or profile request and return its captured result."""
+    out_r, out_w = os.pipe()
+    err_r, err_w = os.pipe()
+    res_r, res_w = os.pipe() if "harness" in request or "profile" in request else (None, None)
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    read_fds = [fd for fd in (out_r, err_r, res_r) if fd is not None]
+    write_fds = [fd for fd in (out_w, err_w, res_w, devnull) if fd is not None]
+
+    start = time.monotonic()
+    deadline = start + float(request["timeout"])
+    sys.stdout.flush()
+    sys.stderr.flush()
+    pid = os.fork()
+    if pid == 0:
+        for fd in read_fds:
+            os.close(fd)
+        _run_child(request, out_w, err_w, devnull, res_w)
+
+    for fd in write_fds:
+        os.close(fd)
+    try:
+        output, limit = limits.collect(
+            pid, read_fds, deadline - time.monotonic(),
+            capped=(out_r, err_r), max_output=request.get("limits", {}).get("max_output", 0),
+        )
+    finally:
+        for fd in read_fds:
+            os.close(fd)
+    # The pipes can close long before the child exits (it may close its own stdout/stderr)
+    if limit is None:
+        limit = limits.wait(pid, deadline)
+    usage = limits.reap(pid)
+
+    return {
+        "stdout": output[out_r].decode("utf-8", errors="replace"),
+        "stderr": output[err_r].decode("utf-8", errors="replace"),
+        "timed_out": limit == "timeout",
+        "limit": limit,
+        "wall_time": time.monotonic() - start,
+        **usage,
+        "results": output[res_r].decode("utf-8", errors="replace") if res_r is not None else "",
+    }
+
+
+def main() -> None:
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        # The raw line holds the run's result key; the forked child shares this stack
+        del line
+        result = run_request(request)
+        sys.stdout.write(json.dumps(result) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,126 @@
-"""In-memory session store — no database needed for MVP."""
+"""Session store facade — routes call `save_session` / `get_session` only.
 
+The backend is chosen by `SESSION_STORE`:
+  • "memory" — a plain dict, lost on restart (the original MVP behaviour)
+  • "sqlite" — SQLite in WAL mode behind a write-behind in-memory hot tier
+  • "shared" — SQLite read and written directly with optimistic versioning,
+    so several worker processes can serve the same sessions
+
+Routes that change a session do get → mutate → save inside `session_lock`.
+"""
+
+import asyncio
+import time
+import uuid
+import weakref
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Iterator
+
+import config
+from metrics import span
 from models import SessionState
+from store.base import SessionConflict, SessionStore
+from store.memory import MemoryStore
+from store.shared import SharedStore
+from store.sqlite import SQLiteStore
+from store.tiered import TieredStore
+
+_store: SessionStore | None = None
+# One lock per session in use; entries vanish once no request holds a reference
+_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
 
-# Singleton session store keyed by session_id
-sessions: dict[str, SessionState] = {}
+
+def get_store() -> SessionStore:
+    """Return the process-wide session store, creating it on first use."""
+    global _store
+    if _store is None:
+        if config.SESSION_STORE == "sqlite":
+            _store = TieredStore(
+                SQLiteStore(config.SESSION_DB_PATH),
+                idle_ttl=config.SESSION_IDLE_TTL,
+                completed_ttl=config.SESSION_COMPLETED_TTL,
+                flush_interval=config.SESSION_FLUSH_INTERVAL,
+            )
+        elif config.SESSION_STORE == "shared":
+            _store = SharedStore(config.SESSION_DB_PATH)
+        else:
+            _store = MemoryStore()
+    return _store
 
 
 def save_session(session: SessionState) -> None:
-    """Insert or update a session."""
-    sessions[session.session_id] = session
+    """Insert or update a session, bumping its version (SessionConflict if saved from a stale copy)."""
+    session.version += 1
+    with span("store_put", quiet=True, session_id=session.session_id):
+        try:
+            get_store().put(session)
+        except SessionConflict:
+            session.version -= 1
+            raise
 
 
 def get_session(session_id: str) -> SessionState | None:
     """Retrieve a session by ID, or None if not found."""
-    return sessions.get(session_id)
+    with span("store_get", quiet=True, session_id=session_id):
+        return get_store().get(session_id)
+
+
+def iter_sessions(phase: str | None = None) -> Iterator[SessionState]:
+    """Stream stored sessions (optionally only those in `phase`), oldest first."""
+    return get_store().iter_sessions(phase)
+
+
+@asynccontextmanager
+async def session_lock(session_id: str) -> AsyncIterator[None]:
+    """
+    Serialize changes to one session, so overlapping requests (a double-click,
+    a retry) apply their turns one after another instead of interleaving.
+
+    An asyncio lock orders requests within this worker; the store's lease
+    extends that across workers. Re-read the session inside the block.
+    Raises SessionConflict if it stays busy for SESSION_LOCK_TIMEOUT seconds.
+    """
+    lock = _locks.get(session_id)
+    if lock is None:
+        lock = _locks[session_id] = asyncio.Lock()
+    busy = SessionConflict("Another request for this session is still in progress; retry shortly")
+    deadline = time.monotonic() + config.SESSION_LOCK_TIMEOUT
+
+    with span("session_lock_wait", quiet=True, session_id=session_id):
+        try:
+            await asyncio.wait_for(lock.acquire(), timeout=config.SESSION_LOCK_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise busy from None
+        owner = uuid.uuid4().hex
+        store = get_store()
+        delay = 0.02
+        try:
+            while not store.acquire(session_id, owner, config.SESSION_LEASE_TTL):
+                if time.monotonic() >= deadline:
+                    raise busy
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 0.5)
+        except BaseException:
+            lock.release()
+            raise
+
+    try:
+        yield
+    finally:
+        try:
+            store.release(session_id, owner)
+        finally:
+            lock.release()
+
+
+def store_stats() -> dict:
+    """Resident session count, approximate bytes and backend metrics."""
+    return get_store().stats()
+
+
+def close_store() -> None:
+    """Flush pending writes (called on application shutdown)."""
+    global _store
+    if _store is not None:
+        _store.close()
+    _store = None
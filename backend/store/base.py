@@ -0,0 +1,43 @@
+"""Session store interface shared by all backends."""
+
+from abc import ABC, abstractmethod
+from typing import Iterator
+
+from models import SessionState
+
+
+class SessionConflict(Exception):
+    """A request lost a race for a session: it stayed locked too long, or was saved from a stale copy."""
+
+
+class SessionStore(ABC):
+    """Persists `SessionState` objects keyed by session_id."""
+
+    @abstractmethod
+    def get(self, session_id: str) -> SessionState | None:
+        """Return the session, or None if it does not exist."""
+
+    @abstractmethod
+    def put(self, session: SessionState) -> None:
+        """Insert or update a session."""
+
+    @abstractmethod
+    def iter_sessions(self, phase: str | None = None) -> Iterator[SessionState]:
+        """Yield every stored session (optionally only those in `phase`), oldest first."""
+
+    def acquire(self, session_id: str, owner: str, ttl: float) -> bool:
+        """
+        Take a cross-process lease on a session for `ttl` seconds; False if
+        someone else holds it. Single-process backends need no lease.
+        """
+        return True
+
+    def release(self, session_id: str, owner: str) -> None:
+        """Give up a lease taken with `acquire`."""
+
+    def stats(self) -> dict:
+        """Backend-specific occupancy metrics."""
+        return {}
+
+    def close(self) -> None:
+        """Flush pending writes and release resources."""
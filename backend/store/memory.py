@@ -0,0 +1,24 @@
+"""Plain in-memory store — sessions live until the process exits."""
+
+from typing import Iterator
+
+from models import SessionState
+from .base import SessionStore
+
+
+class MemoryStore(SessionStore):
+    def __init__(self) -> None:
+        self._sessions: dict[str, SessionState] = {}
+
+    def get(self, session_id: str) -> SessionState | None:
+        return self._sessions.get(session_id)
+
+    def put(self, session: SessionState) -> None:
+        self._sessions[session.session_id] = session
+
+    def iter_sessions(self, phase: str | None = None) -> Iterator[SessionState]:
+        sessions = sorted(self._sessions.values(), key=lambda s: s.created_at)
+        return (s for s in sessions if phase is None or s.phase.value == phase)
+
+    def stats(self) -> dict:
+        return {"backend": "memory", "resident_sessions": len(self._sessions)}
@@ -0,0 +1,69 @@
+"""
+Shared SQLite store — lets several API workers (`uvicorn --workers N`) serve the same sessions.
+
+There is no in-memory tier: every `get` reads the database, so a turn saved
+by one worker is what the next request sees, whichever worker serves it.
+Writes are optimistic: `put` only lands if the stored session still has the
+version this copy was loaded at, so a stale copy can never overwrite newer
+turns. Mutations are also serialized across workers with short-lived leases
+(see `state.session_lock`).
+"""
+
+import time
+
+from models import SessionState
+from .base import SessionConflict
+from .sqlite import SQLiteStore
+
+_LEASES = """
+CREATE TABLE IF NOT EXISTS leases (
+    session_id TEXT PRIMARY KEY,
+    owner      TEXT NOT NULL,
+    expires_at REAL NOT NULL
+)
+"""
+
+
+class SharedStore(SQLiteStore):
+    def __init__(self, path: str) -> None:
+        super().__init__(path)
+        with self._lock:
+            self._conn.execute(_LEASES)
+            self._conn.execute("DELETE FROM leases WHERE expires_at < ?", (time.time(),))
+
+    def put(self, session: SessionState) -> None:
+        """Write the session if nobody saved it since it was loaded (`save_session` has bumped its version)."""
+        expected = session.version - 1
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO sessions (session_id, phase, updated_at, data) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(session_id) DO UPDATE SET "
+                "phase = excluded.phase, updated_at = excluded.updated_at, data = excluded.data "
+                "WHERE json_extract(sessions.data, '$.version') = ?",
+                (session.session_id, session.phase.value, time.time(), session.model_dump_json(), expected),
+            )
+        if cursor.rowcount == 0:
+            raise SessionConflict(f"Session {session.session_id} was changed by another request; retry")
+
+    def acquire(self, session_id: str, owner: str, ttl: float) -> bool:
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO leases (session_id, owner, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(session_id) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+                "WHERE leases.expires_at < ? OR leases.owner = excluded.owner",
+                (session_id, owner, now + ttl, now),
+            )
+        return cursor.rowcount == 1
+
+    def release(self, session_id: str, owner: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM leases WHERE session_id = ? AND owner = ?", (session_id, owner))
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        with self._lock:
+            held = self._conn.execute(
+                "SELECT COUNT(*) FROM leases WHERE expires_at >= ?", (time.time(),)
+            ).fetchone()[0]
+        return {**stats, "backend": "shared", "held_leases": held}
@@ -0,0 +1,92 @@
+"""SQLite session store (WAL mode) — sessions survive restarts."""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterator
+
+from models import SessionState
+from .base import SessionStore
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    phase      TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    data       TEXT NOT NULL
+)
+"""
+
+
+class SQLiteStore(SessionStore):
+    """Stores each session as one JSON row."""
+
+    def __init__(self, path: str) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+
+    def get(self, session_id: str) -> SessionState | None:
+        data = self.get_serialized(session_id)
+        return SessionState.model_validate_json(data) if data else None
+
+    def get_serialized(self, session_id: str) -> str | None:
+        """Return the stored JSON for a session without parsing it."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, session: SessionState) -> None:
+        self.put_serialized([(session.session_id, session.phase.value, session.model_dump_json())])
+
+    def put_serialized(self, rows: list[tuple[str, str, str]]) -> None:
+        """Upsert pre-serialized (session_id, phase, json) rows in one transaction."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO sessions (session_id, phase, updated_at, data) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(session_id) DO UPDATE SET "
+                    "phase = excluded.phase, updated_at = excluded.updated_at, data = excluded.data",
+                    [(sid, phase, now, data) for sid, phase, data in rows],
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def iter_sessions(self, phase: str | None = None, batch_size: int = 200) -> Iterator[SessionState]:
+        """
+        Stream sessions in batches (keyset pagination on rowid), so a large
+        database is never loaded at once and other writers aren't blocked.
+        """
+        last = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT rowid, data FROM sessions WHERE rowid > ? AND (? IS NULL OR phase = ?) "
+                    "ORDER BY rowid LIMIT ?",
+                    (last, phase, phase, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            for rowid, data in rows:
+                yield SessionState.model_validate_json(data)
+            last = rows[-1][0]
+
+    def stats(self) -> dict:
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+        return {"backend": "sqlite", "path": self.path, "stored_sessions": count}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
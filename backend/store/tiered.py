@@ -0,0 +1,140 @@
+"""
+Write-behind hot tier in front of a durable store.
+
+Active sessions are served from RAM. `put` only serializes the session and
+marks it dirty; a background thread batches dirty sessions to the backend
+every `flush_interval` seconds and evicts sessions that have been idle (or
+completed) for longer than their TTL. Evicted sessions are reloaded lazily
+from the backend on the next `get`.
+"""
+
+import logging
+import threading
+import time
+from typing import Iterator
+
+from metrics import log_event, span
+from models import InterviewPhase, SessionState
+from .base import SessionStore
+from .sqlite import SQLiteStore
+
+
+class TieredStore(SessionStore):
+    def __init__(
+        self,
+        backend: SQLiteStore,
+        idle_ttl: float,
+        completed_ttl: float,
+        flush_interval: float,
+    ) -> None:
+        self.backend = backend
+        self.idle_ttl = idle_ttl
+        self.completed_ttl = completed_ttl
+        self.flush_interval = flush_interval
+
+        self._lock = threading.Lock()
+        self._hot: dict[str, SessionState] = {}
+        self._last_access: dict[str, float] = {}
+        self._sizes: dict[str, int] = {}
+        self._dirty: dict[str, tuple[str, str]] = {}  # session_id -> (phase, json)
+        self._loads = 0
+        self._evictions = 0
+        self._flushes = 0
+
+        self._stop = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, name="session-flusher", daemon=True)
+        self._flusher.start()
+
+    def get(self, session_id: str) -> SessionState | None:
+        with self._lock:
+            session = self._hot.get(session_id)
+            if session is not None:
+                self._last_access[session_id] = time.monotonic()
+                return session
+
+        with span("store_load", quiet=True, session_id=session_id):
+            data = self.backend.get_serialized(session_id)
+            if data is None:
+                return None
+            session = SessionState.model_validate_json(data)
+
+        with self._lock:
+            # Another caller may have loaded it meanwhile; keep a single instance
+            if session_id not in self._hot:
+                self._hot[session_id] = session
+                self._sizes[session_id] = len(data)
+                self._loads += 1
+            self._last_access[session_id] = time.monotonic()
+            return self._hot[session_id]
+
+    def put(self, session: SessionState) -> None:
+        data = session.model_dump_json()
+        with self._lock:
+            self._hot[session.session_id] = session
+            self._last_access[session.session_id] = time.monotonic()
+            self._sizes[session.session_id] = len(data)
+            self._dirty[session.session_id] = (session.phase.value, data)
+
+    def iter_sessions(self, phase: str | None = None) -> Iterator[SessionState]:
+        """Flush pending writes, then stream from the backend."""
+        self.flush()
+        return self.backend.iter_sessions(phase)
+
+    # ── Background flush & eviction ─────────────────────────
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+                self._evict_idle()
+            except Exception as e:
+                log_event("session_flush_failed", level=logging.WARNING, error=str(e))
+
+    def flush(self) -> None:
+        """Write all dirty sessions to the backend in one batch."""
+        with self._lock:
+            dirty, self._dirty = self._dirty, {}
+        if not dirty:
+            return
+        try:
+            with span("store_flush", quiet=True, sessions=len(dirty)):
+                self.backend.put_serialized([(sid, phase, data) for sid, (phase, data) in dirty.items()])
+        except Exception:
+            # Put them back (unless re-dirtied since) so the next flush retries
+            with self._lock:
+                for sid, row in dirty.items():
+                    self._dirty.setdefault(sid, row)
+            raise
+        with self._lock:
+            self._flushes += 1
+
+    def _evict_idle(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            for sid, session in list(self._hot.items()):
+                if sid in self._dirty:
+                    continue  # never drop unflushed changes
+                ttl = self.completed_ttl if session.phase == InterviewPhase.COMPLETED else self.idle_ttl
+                if now - self._last_access[sid] > ttl:
+                    del self._hot[sid]
+                    del self._last_access[sid]
+                    self._sizes.pop(sid, None)
+                    self._evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = {
+                "resident_sessions": len(self._hot),
+                "resident_bytes_approx": sum(self._sizes.values()),
+                "dirty_sessions": len(self._dirty),
+                "lazy_loads": self._loads,
+                "evictions": self._evictions,
+                "flushes": self._flushes,
+            }
+        return {**self.backend.stats(), **stats}
+
+    def close(self) -> None:
+        self._stop.set()
+        self._flusher.join()
+        self.flush()
+        self.backend.close()
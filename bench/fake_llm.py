@@ -0,0 +1,221 @@
+"""
+Local OpenAI-compatible stand-in for load testing.
+
+Serves `POST /v1/chat/completions` (streaming and non-streaming) with canned
+planner / ReAct / interviewer / (phase) evaluator / summarizer / JSON-repair
+outputs, chosen by sniffing the system prompt. Latency is drawn from a log-normal distribution
+and generated tokens are paced at a configurable rate, so the backend sees
+realistic, jittery upstream timings without touching a real provider.
+
+    python bench/fake_llm.py --port 9999 --median-ms 400 --sigma 0.5 --tokens-per-sec 80
+
+`--malformed-rate` makes that fraction of plans and scorecards invalid (cut
+off mid-object, prose in front) to exercise the structured-output repair path.
+
+Then start the backend with LLM_BASE_URL=http://127.0.0.1:9999/v1.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+SETTINGS = {"median_ms": 400.0, "sigma": 0.5, "tokens_per_sec": 80.0, "error_rate": 0.0, "malformed_rate": 0.0}
+
+app = FastAPI(title="Fake LLM")
+
+PHASES = ["clarification", "complexity", "edge_cases", "coding"]
+
+SCORE_KEYS = [
+    "problem_understanding", "logical_correctness", "code_quality", "optimization", "communication",
+]
+
+
+# ── Canned outputs ──────────────────────────────────────────
+
+def _planner() -> str:
+    return json.dumps({
+        "duration_minutes": 45,
+        "difficulty": "Medium",
+        "persona": "analytical",
+        "coding_expectations": "Clean, working Python with sensible names.",
+        "ai_policy": "No AI tools; language docs allowed.",
+        "question_topic_hint": "Merge Intervals — sort by start and merge overlaps.",
+    })
+
+
+def _react(messages: list[dict]) -> str:
+    if "Observation:" in messages[-1]["content"].split("Question:")[-1]:
+        return "Thought: I now know the final answer\nFinal Answer: Merge Intervals (Medium) — sort then merge."
+    return "Thought: I should search the problem database.\nAction: search_problem_db\nAction Input: medium arrays\n"
+
+
+def _interviewer(messages: list[dict]) -> str:
+    turns = sum(1 for m in messages if m["role"] == "user")
+    phase = "question" if turns <= 1 else PHASES[min(turns - 2, len(PHASES) - 1)]
+    reply = (
+        "Thanks, that makes sense. Could you walk me through the time and space "
+        "complexity of that approach, and which edge cases you would test first?"
+    )
+    return json.dumps({"reply": reply, "phase": phase})
+
+
+def _evaluator() -> str:
+    scores = {k: {"score": random.randint(2, 5), "max": 5, "feedback": "Solid reasoning."} for k in SCORE_KEYS}
+    total = sum(s["score"] for s in scores.values())
+    overall = "Strong Hire" if total >= 20 else "Hire" if total >= 15 else "Lean Hire" if total >= 10 else "No Hire"
+    return json.dumps({
+        "overall": overall, "scores": scores, "total": total, "max_total": 25,
+        "summary": "The candidate communicated clearly and reached a working solution.",
+    })
+
+
+def _phase_evaluator() -> str:
+    keys = random.sample(SCORE_KEYS, 2)
+    return json.dumps({
+        "scores": {k: {"score": random.randint(2, 5), "max": 5, "feedback": "Reasonable."} for k in keys},
+        "notes": "Handled this phase competently.",
+    })
+
+
+def _repair(text: str) -> str:
+    if "InterviewPlan" in text:
+        return _planner()
+    if "PhaseScore" in text:
+        return _phase_evaluator()
+    return _evaluator()
+
+
+def _maybe_malformed(content: str) -> str:
+    """Cut the object off mid-way and put prose before it, `malformed_rate` of the time."""
+    if random.random() >= SETTINGS["malformed_rate"]:
+        return content
+    return f"Sure! Here it is:\n```json\n{content[:len(content) // 2]}"
+
+
+def _choose(body: dict) -> dict:
+    """Return {"content": ...} or {"tool_calls": [...]} for the request."""
+    messages = body["messages"]
+    text = json.dumps(messages)
+
+    if body.get("tools"):
+        if body.get("tool_choice") == "none" or any(m.get("role") == "tool" for m in messages):
+            return {"content": "Merge Intervals (Medium) — sort by start, then merge overlaps."}
+        name = body["tools"][0]["function"]["name"]
+        return {"tool_calls": [{
+            "id": f"call_{uuid.uuid4().hex[:8]}",
+            "type": "function",
+            "function": {"name": name, "arguments": json.dumps({"query": "medium arrays"})},
+        }]}
+    if "You fix JSON" in text:
+        return {"content": _repair(text)}
+    if "Action Input" in text:
+        return {"content": _react(messages)}
+    if "interview planning expert" in text:
+        return {"content": _maybe_malformed(_planner())}
+    if "scoring ONE phase" in text:
+        return {"content": _maybe_malformed(_phase_evaluator())}
+    if "interview evaluator" in text:
+        return {"content": _maybe_malformed(_evaluator())}
+    if "technical interviewer" in text:
+        return {"content": _interviewer(messages)}
+    if "running summary" in text:
+        return {"content": "The candidate proposed sorting then merging and discussed O(n log n) time."}
+    return {"content": "OK"}
+
+
+# ── Endpoint ────────────────────────────────────────────────
+
+def _tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def _latency() -> float:
+    return random.lognormvariate(0, SETTINGS["sigma"]) * SETTINGS["median_ms"] / 1000
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    if random.random() < SETTINGS["error_rate"]:
+        return JSONResponse({"error": {"message": "injected failure"}}, status_code=500)
+
+    out = _choose(body)
+    content = out.get("content") or ""
+    prompt_tokens = _tokens(json.dumps(body["messages"]))
+    completion_tokens = _tokens(content) if content else 10
+    created = int(time.time())
+    completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+
+    await asyncio.sleep(_latency())
+
+    if body.get("stream"):
+        async def events():
+            step = 16  # characters per chunk (~4 tokens)
+            delay = 4 / SETTINGS["tokens_per_sec"]
+            for i in range(0, len(content), step):
+                chunk = {
+                    "id": completion_id, "object": "chat.completion.chunk", "created": created,
+                    "model": body["model"],
+                    "choices": [{"index": 0, "delta": {"content": content[i:i + step]}, "finish_reason": None}],
+                }
+                yield f"data: {json.dumps(chunk)}\n\n"
+                await asyncio.sleep(delay)
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    await asyncio.sleep(completion_tokens / SETTINGS["tokens_per_sec"])
+    message = {"role": "assistant", "content": out.get("content")}
+    if "tool_calls" in out:
+        message["tool_calls"] = out["tool_calls"]
+    return {
+        "id": completion_id,
+        "object": "chat.completion",
+        "created": created,
+        "model": body["model"],
+        "choices": [{
+            "index": 0,
+            "message": message,
+            "finish_reason": "tool_calls" if "tool_calls" in out else "stop",
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9999)
+    parser.add_argument("--median-ms", type=float, default=SETTINGS["median_ms"],
+                        help="median time-to-first-token in milliseconds")
+    parser.add_argument("--sigma", type=float, default=SETTINGS["sigma"],
+                        help="log-normal sigma of the latency distribution (0 = constant)")
+    parser.add_argument("--tokens-per-sec", type=float, default=SETTINGS["tokens_per_sec"],
+                        help="generation speed after the first token")
+    parser.add_argument("--error-rate", type=float, default=SETTINGS["error_rate"],
+                        help="fraction of requests answered with HTTP 500")
+    parser.add_argument("--malformed-rate", type=float, default=SETTINGS["malformed_rate"],
+                        help="fraction of plans / scorecards returned invalid")
+    args = parser.parse_args()
+
+    SETTINGS.update(
+        median_ms=args.median_ms, sigma=args.sigma,
+        tokens_per_sec=args.tokens_per_sec, error_rate=args.error_rate,
+        malformed_rate=args.malformed_rate,
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""
+Concurrent end-to-end load driver for the interview API.
+
+Simulates N full interviews (start session → wait until ready → chat turns →
+code runs → evaluate) with bounded concurrency and reports p50/p95/p99 latency,
+throughput and error rate per endpoint. Results are saved as JSON so a later
+run can be compared against them.
+
+Against an already running backend (pointed at a fake or real LLM):
+
+    python bench/loadtest.py --base-url http://127.0.0.1:8000 --interviews 50 --concurrency 10
+
+Fully self-contained (spawns bench/fake_llm.py and a backend on spare ports):
+
+    python bench/loadtest.py --spawn --interviews 50 --concurrency 10 --baseline bench/baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+
+CONFIGS = [
+    {"company": "Google", "role": "SDE", "level": "SDE1", "round_type": "DSA"},
+    {"company": "Amazon", "role": "SDE", "level": "SDE2", "round_type": "DSA"},
+    {"company": "JPMorgan", "role": "Data Analyst", "level": "Intern", "round_type": "SQL"},
+]
+
+CANDIDATE_MESSAGES = [
+    "Can I assume the input fits in memory and intervals are unsorted?",
+    "I'd sort by start time and then merge overlapping intervals in one pass.",
+    "Sorting dominates, so O(n log n) time and O(n) extra space for the output.",
+    "Edge cases: empty input, a single interval, fully nested intervals, touching endpoints.",
+]
+
+CANDIDATE_CODE = """\
+def solution(intervals):
+    intervals.sort(key=lambda x: x[0])
+    merged = []
+    for start, end in intervals:
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+print(solution([[1, 3], [2, 6], [8, 10], [15, 18]]))
+"""
+
+
+class Recorder:
+    """Collects per-endpoint latencies and outcomes."""
+
+    def __init__(self) -> None:
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.rejected: dict[str, int] = defaultdict(int)
+
+    async def call(self, name: str, coro) -> httpx.Response | None:
+        start = time.perf_counter()
+        try:
+            res = await coro
+        except httpx.HTTPError:
+            self.errors[name] += 1
+            self.latencies[name].append(time.perf_counter() - start)
+            return None
+        self.latencies[name].append(time.perf_counter() - start)
+        if res.status_code == 429:
+            self.rejected[name] += 1
+        elif res.status_code >= 400:
+            self.errors[name] += 1
+        return res
+
+    def report(self, wall_time: float) -> dict:
+        endpoints = {}
+        for name, samples in sorted(self.latencies.items()):
+            ordered = sorted(samples)
+            endpoints[name] = {
+                "requests": len(ordered),
+                "errors": self.errors[name],
+                "rejected_429": self.rejected[name],
+                "error_rate": round(self.errors[name] / len(ordered), 4),
+                "throughput_rps": round(len(ordered) / wall_time, 2),
+                "p50_ms": _percentile(ordered, 0.50),
+                "p95_ms": _percentile(ordered, 0.95),
+                "p99_ms": _percentile(ordered, 0.99),
+            }
+        total = sum(len(v) for v in self.latencies.values())
+        return {
+            "wall_time_s": round(wall_time, 2),
+            "total_requests": total,
+            "throughput_rps": round(total / wall_time, 2),
+            "error_rate": round(sum(self.errors.values()) / total, 4) if total else 0.0,
+            "endpoints": endpoints,
+        }
+
+
+def _percentile(ordered: list[float], p: float) -> float:
+    if not ordered:
+        return 0.0
+    return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000, 1)
+
+
+async def _stream_message(client: httpx.AsyncClient, session_id: str, message: str) -> httpx.Response:
+    """POST to the streaming endpoint and drain the whole event stream."""
+    async with client.stream(
+        "POST", "/api/interview/message/stream",
+        json={"session_id": session_id, "message": message},
+    ) as res:
+        await res.aread()
+        return res
+
+
+async def run_interview(client: httpx.AsyncClient, rec: Recorder, args) -> None:
+    res = await rec.call("session_start", client.post("/api/session/start", json=random.choice(CONFIGS)))
+    if res is None or res.status_code != 200:
+        return
+    session_id = res.json()["session_id"]
+
+    # Planning runs in the background; poll until the opening question is ready
+    start = time.perf_counter()
+    while True:
+        status = await rec.call("session_status", client.get(f"/api/session/{session_id}/status"))
+        if status is None or status.status_code != 200 or status.json()["phase"] == "failed":
+            rec.errors["session_ready"] += 1
+            rec.latencies["session_ready"].append(time.perf_counter() - start)
+            return
+        if status.json()["progress"] == "ready":
+            rec.latencies["session_ready"].append(time.perf_counter() - start)
+            break
+        await asyncio.sleep(args.poll_interval)
+
+    for i in range(args.turns):
+        message = CANDIDATE_MESSAGES[i % len(CANDIDATE_MESSAGES)]
+        if args.stream:
+            await rec.call("interview_message_stream", _stream_message(client, session_id, message))
+        else:
+            await rec.call("interview_message", client.post(
+                "/api/interview/message", json={"session_id": session_id, "message": message},
+            ))
+        await asyncio.sleep(args.think_time)
+
+    for _ in range(args.code_runs):
+        await rec.call("code_execute", client.post(
+            "/api/code/execute", json={"session_id": session_id, "code": CANDIDATE_CODE},
+        ))
+
+    await rec.call("interview_evaluate", client.post(
+        "/api/interview/evaluate", json={"session_id": session_id},
+    ))
+
+
+async def run_load(args) -> dict:
+    rec = Recorder()
+    sem = asyncio.Semaphore(args.concurrency)
+    limits = httpx.Limits(max_connections=args.concurrency * 2)
+
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        async def bounded() -> None:
+            async with sem:
+                await run_interview(client, rec, args)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(bounded() for _ in range(args.interviews)))
+        wall_time = time.perf_counter() - start
+
+    report = rec.report(wall_time)
+    report["params"] = {
+        k: getattr(args, k)
+        for k in ("interviews", "concurrency", "turns", "code_runs", "stream", "think_time")
+    }
+    return report
+
+
+# ── Baseline comparison ─────────────────────────────────────
+
+def compare(report: dict, baseline: dict, threshold: float) -> list[str]:
+    """Return human-readable regressions (p95 or error-rate worse than threshold)."""
+    regressions = []
+    for name, cur in report["endpoints"].items():
+        old = baseline.get("endpoints", {}).get(name)
+        if not old:
+            continue
+        if old["p95_ms"] and cur["p95_ms"] > old["p95_ms"] * (1 + threshold):
+            regressions.append(f"{name}: p95 {old['p95_ms']}ms → {cur['p95_ms']}ms")
+        if cur["error_rate"] > old["error_rate"] + 0.01:
+            regressions.append(f"{name}: error rate {old['error_rate']:.2%} → {cur['error_rate']:.2%}")
+    if report["throughput_rps"] < baseline.get("throughput_rps", 0) * (1 - threshold):
+        regressions.append(f"throughput {baseline['throughput_rps']} → {report['throughput_rps']} req/s")
+    return regressions
+
+
+def print_report(report: dict) -> None:
+    print(f"\n{report['total_requests']} requests in {report['wall_time_s']}s "
+          f"({report['throughput_rps']} req/s, error rate {report['error_rate']:.2%})\n")
+    print(f"{'endpoint':<28}{'reqs':>6}{'err':>5}{'429':>5}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, e in report["endpoints"].items():
+        print(f"{name:<28}{e['requests']:>6}{e['errors']:>5}{e['rejected_429']:>5}"
+              f"{e['p50_ms']:>10}{e['p95_ms']:>10}{e['p99_ms']:>10}")
+
+
+# ── Self-contained mode ─────────────────────────────────────
+
+def _wait_ready(url: str, timeout: float = 30.0) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up within {timeout}s")
+
+
+def spawn_stack(args) -> list[subprocess.Popen]:
+    """Start the fake LLM and a backend wired to it."""
+    fake = subprocess.Popen([
+        sys.executable, str(ROOT / "bench" / "fake_llm.py"), "--port", str(args.fake_port),
+        "--median-ms", str(args.llm_median_ms), "--sigma", str(args.llm_sigma),
+        "--tokens-per-sec", str(args.llm_tokens_per_sec),
+    ])
+    env = {
+        **os.environ,
+        "LLM_BASE_URL": f"http://127.0.0.1:{args.fake_port}/v1",
+        "LLM_API_KEY": "fake",
+        "SESSION_STORE": os.environ.get("SESSION_STORE", "memory"),
+    }
+    backend = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(args.app_port), "--log-level", "warning"],
+        cwd=ROOT / "backend", env=env, stdout=subprocess.DEVNULL,
+    )
+    args.base_url = f"http://127.0.0.1:{args.app_port}"
+    _wait_ready(f"http://127.0.0.1:{args.fake_port}/docs")
+    _wait_ready(f"{args.base_url}/docs")
+    return [fake, backend]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--interviews", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--turns", type=int, default=4, help="chat turns per interview")
+    parser.add_argument("--code-runs", type=int, default=2, help="sandbox runs per interview")
+    parser.add_argument("--stream", action="store_true", help="use the streaming message endpoint")
+    parser.add_argument("--think-time", type=float, default=0.0, help="seconds between chat turns")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--poll-interval", type=float, default=0.2, help="seconds between session status polls")
+    parser.add_argument("--out", default=str(ROOT / "bench" / "results" / "latest.json"))
+    parser.add_argument("--baseline", help="previous results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative regression")
+    parser.add_argument("--spawn", action="store_true", help="start fake LLM + backend automatically")
+    parser.add_argument("--fake-port", type=int, default=9999)
+    parser.add_argument("--app-port", type=int, default=8077)
+    parser.add_argument("--llm-median-ms", type=float, default=400.0)
+    parser.add_argument("--llm-sigma", type=float, default=0.5)
+    parser.add_argument("--llm-tokens-per-sec", type=float, default=80.0)
+    args = parser.parse_args()
+
+    procs = spawn_stack(args) if args.spawn else []
+    try:
+        report = asyncio.run(run_load(args))
+    finally:
+        for proc in procs:
+            proc.terminate()
+            proc.wait()
+
+    print_report(report)
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2))
+    print(f"\nSaved results to {out}")
+
+    if args.baseline:
+        regressions = compare(report, json.loads(Path(args.baseline).read_text()), args.threshold)
+        if regressions:
+            print("\nREGRESSIONS vs baseline:")
+            for line in regressions:
+                print(f"  • {line}")
+            sys.exit(1)
+        print("\nNo regressions vs baseline.")
+
+
+if __name__ == "__main__":
+    main()
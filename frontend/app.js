@@ -41,6 +41,15 @@ let state = {
     phase: 'planning',
     timerInterval: null,
     elapsedSeconds: 0,
+    // Incremental sync: cursors into the session's messages / code runs, and the last ETag
+    messageCursor: 0,
+    codeCursor: 0,
+    syncVersion: 0,
+    syncTag: null,
+    syncInterval: null,
+    sending: false,
+    // Interview WebSocket, once open (HTTP routes are used otherwise)
+    socket: null,
 };
 
 // ── DOM Refs ────────────────────────────────────────────────
@@ -113,7 +122,7 @@ $('#config-form').addEventListener('submit', async (e) => {
         state.sessionId = data.session_id;
         state.plan = data.plan;
 
-        enterInterviewView(company);
+        enterInterviewView(company, data.phase);
     } catch (err) {
         showError(err.message);
     } finally {
@@ -125,14 +134,79 @@ $('#config-form').addEventListener('submit', async (e) => {
 // INTERVIEW VIEW
 // ══════════════════════════════════════════════════════════════
 
-function enterInterviewView(company) {
+function enterInterviewView(company, phase) {
     showView('interview');
 
     // Set header
     $('#company-badge').textContent = company;
-    updatePhase('question');
+    $('#chat-messages').innerHTML = '';
+
+    if (phase === 'planning') {
+        // Plan + opening question are still being generated server-side
+        updatePhase('planning');
+        setChatEnabled(false);
+        waitForSession();
+        return;
+    }
+    onSessionReady();
+}
+
+function onSessionReady() {
+    updatePhase(state.phase === 'planning' ? 'question' : state.phase);
+    setChatEnabled(true);
+    renderPlanBanner();
+
+    // Load the conversation so far, then keep it in sync with small deltas
+    syncSession();
+    startSync();
+    connectSocket();
+
+    // Start timer
+    state.elapsedSeconds = 0;
+    startTimer();
+}
+
+function setChatEnabled(enabled) {
+    $('#chat-input').disabled = !enabled;
+    $('#send-btn').disabled = !enabled;
+    $('#run-code-btn').disabled = !enabled;
+    $('#profile-code-btn').disabled = !enabled;
+}
+
+// Follow the background bootstrap until the session is ready (or failed)
+async function waitForSession() {
+    const progressLabels = {
+        queued: '⏳ Getting things ready...',
+        planning: '🔎 Researching a problem and planning your interview...',
+        opening_question: '🎯 Your interviewer is preparing the first question...',
+    };
+    const statusEl = addMessage('assistant', progressLabels.queued);
 
-    // Show plan banner
+    try {
+        const res = await fetch(`${API}/api/session/${state.sessionId}/events`);
+        if (!res.ok) throw new Error('Lost track of the session');
+
+        let finished = false;
+        await readEventStream(res, (event, data) => {
+            if (event === 'progress') {
+                statusEl.textContent = progressLabels[data.progress] || data.progress;
+            } else if (event === 'ready') {
+                finished = true;
+                state.plan = data.plan;
+                state.phase = data.phase;
+                onSessionReady();
+            } else if (event === 'failed') {
+                throw new Error(data.error || 'Failed to start session');
+            }
+        });
+        if (!finished) throw new Error('Connection closed before the interview was ready');
+    } catch (err) {
+        showError(err.message);
+        showView('config');
+    }
+}
+
+function renderPlanBanner() {
     if (state.plan) {
         const details = $('#plan-details');
         details.innerHTML = `
@@ -144,13 +218,6 @@ function enterInterviewView(company) {
         `;
         $('#plan-banner').style.display = '';
     }
-
-    // Load initial conversation
-    loadConversation();
-
-    // Start timer
-    state.elapsedSeconds = 0;
-    startTimer();
 }
 
 function capitalize(s) {
@@ -182,6 +249,7 @@ function updatePhase(phase) {
     state.phase = phase;
     const badge = $('#phase-badge');
     const labels = {
+        planning: 'Preparing...',
         question: 'Question',
         clarification: 'Clarification',
         complexity: 'Complexity',
@@ -193,23 +261,129 @@ function updatePhase(phase) {
     badge.textContent = labels[phase] || phase;
 }
 
-// ── Chat ────────────────────────────────────────────────────
-async function loadConversation() {
-    try {
-        const res = await fetch(`${API}/api/session/${state.sessionId}`);
-        const session = await res.json();
+// ── Interview socket ────────────────────────────────────────
+// One WebSocket per session carries chat turns, code runs and evaluation.
+// Replies echo the request id; messages without a pending id are server pushes.
+const SOCKET_FINAL = new Set(['done', 'code_result', 'profile_result', 'evaluated', 'error', 'pong']);
+const pendingRequests = new Map();
+let socketSeq = 0;
+
+function connectSocket() {
+    if (!('WebSocket' in window)) return;
+    const base = (API || location.origin).replace(/^http/, 'ws');
+    const socket = new WebSocket(`${base}/api/ws/${state.sessionId}`);
+    socket.onopen = () => { state.socket = socket; };
+    socket.onmessage = (e) => onSocketMessage(JSON.parse(e.data));
+    socket.onclose = () => {
+        if (state.socket === socket) state.socket = null;
+        // Fail anything still waiting; the next action falls back to HTTP
+        for (const pending of pendingRequests.values()) pending.reject(new Error('Connection lost'));
+        pendingRequests.clear();
+    };
+}
+
+function closeSocket() {
+    if (state.socket) state.socket.close();
+    state.socket = null;
+}
+
+function socketReady() {
+    return state.socket !== null && state.socket.readyState === WebSocket.OPEN;
+}
+
+// Send a typed request; resolves with its final message, passing intermediate ones to onEvent
+function socketRequest(payload, onEvent = null) {
+    return new Promise((resolve, reject) => {
+        const id = String(++socketSeq);
+        pendingRequests.set(id, { onEvent, resolve, reject });
+        state.socket.send(JSON.stringify({ ...payload, id }));
+    });
+}
+
+function onSocketMessage(msg) {
+    const pending = msg.id ? pendingRequests.get(msg.id) : null;
+    if (!pending) {
+        // Pushed by the server, e.g. another tab moved the interview on
+        if (msg.type === 'phase' && state.phase !== 'evaluating') updatePhase(msg.phase);
+        else if (msg.type === 'evaluated') {
+            stopTimer();
+            stopSync();
+            showScorecard(msg.scorecard);
+        }
+        return;
+    }
+    if (!SOCKET_FINAL.has(msg.type)) {
+        if (pending.onEvent) pending.onEvent(msg.type, msg);
+        return;
+    }
+    pendingRequests.delete(msg.id);
+    if (msg.type === 'error') pending.reject(requestError(msg.detail, msg.status, msg.retry_after));
+    else pending.resolve(msg);
+}
+
+function requestError(detail, status, retryAfter) {
+    const err = new Error(detail);
+    err.status = status;
+    err.retryAfter = retryAfter;
+    return err;
+}
+
+// POST JSON over HTTP (the fallback when the socket isn't open)
+async function postJSON(path, body, fallbackError) {
+    const res = await fetch(`${API}${path}`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(body),
+    });
+    if (!res.ok) {
+        const err = await res.json().catch(() => ({}));
+        throw requestError(err.detail || fallbackError, res.status, res.headers.get('Retry-After'));
+    }
+    return res.json();
+}
 
-        const container = $('#chat-messages');
-        container.innerHTML = '';
+// ── Chat ────────────────────────────────────────────────────
+const SYNC_INTERVAL_MS = 4000;
 
-        for (const msg of session.conversation) {
+// Fetch only what changed since our cursors; a 304 means nothing did
+async function syncSession() {
+    if (!state.sessionId || state.sending) return;
+    const sessionId = state.sessionId;
+    try {
+        const params = `messages_after=${state.messageCursor}&code_after=${state.codeCursor}`
+            + `&version_after=${state.syncVersion}`;
+        const headers = state.syncTag ? { 'If-None-Match': state.syncTag } : {};
+        const res = await fetch(`${API}/api/session/${sessionId}/sync?${params}`, { headers });
+        if (res.status === 304 || !res.ok) return;
+        // Drop stale deltas: a send started, or a new interview began, while this was in flight
+        if (state.sending || state.sessionId !== sessionId) return;
+        const delta = await res.json();
+
+        // The first sync replaces the "getting ready" placeholder
+        if (state.messageCursor === 0) $('#chat-messages').innerHTML = '';
+        for (const msg of delta.messages) {
             addMessage(msg.role, msg.content);
         }
+        state.messageCursor = delta.message_cursor;
+        state.codeCursor = delta.code_cursor;
+        state.syncVersion = delta.version;
+        state.syncTag = res.headers.get('ETag');
+        if (delta.phase !== state.phase && state.phase !== 'evaluating') updatePhase(delta.phase);
     } catch (err) {
-        console.error('Failed to load conversation:', err);
+        console.error('Failed to sync session:', err);
     }
 }
 
+function startSync() {
+    stopSync();
+    state.syncInterval = setInterval(syncSession, SYNC_INTERVAL_MS);
+}
+
+function stopSync() {
+    if (state.syncInterval) clearInterval(state.syncInterval);
+    state.syncInterval = null;
+}
+
 function addMessage(role, content) {
     const container = $('#chat-messages');
     const div = document.createElement('div');
@@ -226,6 +400,34 @@ function addMessage(role, content) {
 
     container.appendChild(div);
     container.scrollTop = container.scrollHeight;
+    return text;
+}
+
+// Parse a Server-Sent Events response body, calling onEvent(event, data) per event
+async function readEventStream(res, onEvent) {
+    const reader = res.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const raw = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+
+            let event = 'message';
+            let data = '';
+            for (const line of raw.split('\n')) {
+                if (line.startsWith('event:')) event = line.slice(6).trim();
+                else if (line.startsWith('data:')) data += line.slice(5).trim();
+            }
+            if (data) onEvent(event, JSON.parse(data));
+        }
+    }
 }
 
 // Send message
@@ -245,27 +447,53 @@ async function sendMessage() {
     const btn = $('#send-btn');
     setLoading(btn, true);
     input.value = '';
+    state.sending = true;
 
     addMessage('user', message);
 
+    let replyEl = null;
+    const container = $('#chat-messages');
+    // Render the reply incrementally as tokens arrive
+    const onReplyEvent = (event, data) => {
+        if (event === 'token') {
+            replyEl.textContent += data.text;
+            container.scrollTop = container.scrollHeight;
+        } else if (event === 'phase') {
+            updatePhase(data.phase);
+        } else if (event === 'done') {
+            replyEl.textContent = data.reply;
+            updatePhase(data.phase);
+            // Both messages are already on screen; skip them in the next delta
+            state.messageCursor += 2;
+        } else if (event === 'error') {
+            throw new Error(data.detail);
+        }
+    };
+
     try {
-        const res = await fetch(`${API}/api/interview/message`, {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ session_id: state.sessionId, message }),
-        });
+        if (socketReady()) {
+            replyEl = addMessage('assistant', '');
+            onReplyEvent('done', await socketRequest({ type: 'message', message }, onReplyEvent));
+        } else {
+            const res = await fetch(`${API}/api/interview/message/stream`, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ session_id: state.sessionId, message }),
+            });
 
-        if (!res.ok) {
-            const err = await res.json();
-            throw new Error(err.detail || 'Failed to send message');
-        }
+            if (!res.ok) {
+                const err = await res.json();
+                throw new Error(err.detail || 'Failed to send message');
+            }
 
-        const data = await res.json();
-        addMessage('assistant', data.reply);
-        updatePhase(data.phase);
+            replyEl = addMessage('assistant', '');
+            await readEventStream(res, onReplyEvent);
+        }
     } catch (err) {
-        addMessage('assistant', `⚠️ Error: ${err.message}`);
+        if (replyEl) replyEl.textContent = `⚠️ Error: ${err.message}`;
+        else addMessage('assistant', `⚠️ Error: ${err.message}`);
     } finally {
+        state.sending = false;
         setLoading(btn, false);
         input.focus();
     }
@@ -273,6 +501,7 @@ async function sendMessage() {
 
 // ── Code execution ──────────────────────────────────────────
 $('#run-code-btn').addEventListener('click', runCode);
+$('#profile-code-btn').addEventListener('click', profileCode);
 
 // Handle Tab key in code editor
 $('#code-editor').addEventListener('keydown', (e) => {
@@ -297,37 +526,86 @@ async function runCode() {
     output.className = 'code-output';
 
     try {
-        const res = await fetch(`${API}/api/code/execute`, {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ session_id: state.sessionId, code }),
-        });
-
-        if (!res.ok) {
-            const err = await res.json();
-            throw new Error(err.detail || 'Execution failed');
-        }
-
-        const data = await res.json();
+        const data = socketReady()
+            ? await socketRequest({ type: 'execute', code })
+            : await postJSON('/api/code/execute', { session_id: state.sessionId, code }, 'Execution failed');
 
         if (data.timed_out) {
             output.textContent = '⏱️ Code timed out!';
             output.className = 'code-output error';
         } else if (data.stderr) {
-            output.textContent = data.stderr;
+            output.textContent = [data.stdout, data.stderr, formatTests(data), formatUsage(data)].filter(Boolean).join('\n\n');
             output.className = 'code-output error';
         } else {
-            output.textContent = data.stdout || '(No output)';
-            output.className = 'code-output success';
+            output.textContent = [data.stdout || '(No output)', formatTests(data), formatUsage(data)].filter(Boolean).join('\n\n');
+            output.className = data.failed ? 'code-output error' : 'code-output success';
         }
     } catch (err) {
-        output.textContent = `Error: ${err.message}`;
+        // A saturated sandbox answers 429 — surface the server's retry hint instead of waiting
+        output.textContent = err.status === 429
+            ? `⏳ Sandbox busy, try again in ${err.retryAfter || '1'}s.`
+            : `Error: ${err.message}`;
         output.className = 'code-output error';
     } finally {
         setLoading(btn, false);
     }
 }
 
+// Summarise hidden-test results, one line per test that ran
+function formatTests(data) {
+    if (!data.total) return '';
+    const icons = { passed: '✅', failed: '❌', error: '💥', timeout: '⏱️' };
+    const lines = data.tests.map(t =>
+        `${icons[t.status] || '•'} Test ${t.index + 1} (${t.elapsed_ms.toFixed(1)} ms)${t.error ? ': ' + t.error : ''}`
+    );
+    return [`Hidden tests: ${data.passed}/${data.total} passed`, ...lines].join('\n');
+}
+
+async function profileCode() {
+    const code = $('#code-editor').value;
+    if (!code.trim()) return;
+
+    const btn = $('#profile-code-btn');
+    const output = $('#code-output');
+    setLoading(btn, true);
+    output.textContent = 'Profiling on growing inputs...';
+    output.className = 'code-output';
+
+    try {
+        const data = socketReady()
+            ? await socketRequest({ type: 'profile', code })
+            : await postJSON('/api/code/profile', { session_id: state.sessionId, code }, 'Profiling failed');
+        output.textContent = [data.stderr, formatProfile(data)].filter(Boolean).join('\n\n');
+        output.className = data.error ? 'code-output error' : 'code-output success';
+    } catch (err) {
+        output.textContent = err.status === 429
+            ? `⏳ Sandbox busy, try again in ${err.retryAfter || '1'}s.`
+            : `Error: ${err.message}`;
+        output.className = 'code-output error';
+    } finally {
+        setLoading(btn, false);
+    }
+}
+
+function formatProfile(data) {
+    if (data.error) return data.error;
+    const lines = data.points.map(p =>
+        `n = ${String(p.n).padStart(7)}   ${p.time_ms.toFixed(3).padStart(10)} ms   ${(p.peak_kb != null ? `${p.peak_kb.toFixed(1)} KB` : 'not traced').padStart(12)}`
+    );
+    const slope = data.time_exponent != null ? ` (log-log slope ${data.time_exponent})` : '';
+    return [
+        `Time: ~${data.time_complexity || 'unclear'}${slope}   Extra memory: ~${data.space_complexity || 'unclear'}`,
+        ...lines,
+        data.stopped_early ? `Stopped early: ${data.reason}` : '',
+    ].filter(Boolean).join('\n');
+}
+
+function formatUsage(data) {
+    if (data.cpu_time_ms == null) return '';
+    const memory = data.peak_memory_kb != null ? ` · ${(data.peak_memory_kb / 1024).toFixed(1)} MB peak` : '';
+    return `⚙️ ${data.cpu_time_ms.toFixed(1)} ms CPU${memory}${data.cached ? ' (cached)' : ''}`;
+}
+
 // ── End Interview ───────────────────────────────────────────
 $('#end-interview-btn').addEventListener('click', async () => {
 
@@ -336,23 +614,16 @@ $('#end-interview-btn').addEventListener('click', async () => {
     btn.textContent = 'Evaluating...';
     updatePhase('evaluating');
     stopTimer();
+    stopSync();
 
     try {
-        const res = await fetch(`${API}/api/interview/evaluate`, {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ session_id: state.sessionId }),
-        });
-
-        if (!res.ok) {
-            const err = await res.json();
-            throw new Error(err.detail || 'Evaluation failed');
-        }
-
-        const data = await res.json();
+        const data = socketReady()
+            ? await socketRequest({ type: 'evaluate' })
+            : await postJSON('/api/interview/evaluate', { session_id: state.sessionId }, 'Evaluation failed');
         showScorecard(data.scorecard);
     } catch (err) {
         showError(`Evaluation error: ${err.message}`);
+        startSync();
         btn.disabled = false;
         btn.textContent = 'End Interview';
     }
@@ -423,7 +694,12 @@ function formatTime(seconds) {
 
 // ── New Interview ───────────────────────────────────────────
 $('#new-interview-btn').addEventListener('click', () => {
-    state = { sessionId: null, plan: null, phase: 'planning', timerInterval: null, elapsedSeconds: 0 };
+    stopSync();
+    closeSocket();
+    state = {
+        sessionId: null, plan: null, phase: 'planning', timerInterval: null, elapsedSeconds: 0,
+        messageCursor: 0, codeCursor: 0, syncVersion: 0, syncTag: null, syncInterval: null, sending: false, socket: null,
+    };
     $('#chat-messages').innerHTML = '';
     $('#code-editor').value = '';
     $('#code-output').textContent = 'Run your code to see output here...';